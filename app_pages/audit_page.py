@@ -3,10 +3,10 @@
 # ===============================================================
 
 import streamlit as st
-from utils.parser import parse_config
 from audit_engine import run_security_audit
-from topology_engine import generate_topology_mermaid
+from main import generate_topology_mermaid
 from exports.exporter import export_all_formats
+from utils.ir import ParsedConfig
 
 
 def audit_page():
@@ -18,22 +18,14 @@ def audit_page():
     )
 
     if uploaded:
-        raw_text = uploaded.read().decode()
-
-        # Parse config
-        parsed = parse_config(raw_text)
-
-        # Extract raw content safely
-        if isinstance(parsed, dict):
-            raw_content = parsed.get("raw", raw_text)
-        else:
-            raw_content = raw_text
+        # parsed once, shared by the audit and the topology
+        config = ParsedConfig.from_bytes(uploaded.read(), filename=uploaded.name)
 
         # Run audit
-        audit_result = run_security_audit(parsed)
+        audit_result = run_security_audit(config)
 
-        # Topology
-        topology = generate_topology_mermaid(parsed)
+        # Topology (parsed devices come from the parse cache on reruns)
+        topology = generate_topology_mermaid(config)
 
         # Exports
         exports = export_all_formats(audit_result, topology)
@@ -1,6 +1,12 @@
 import streamlit as st
-from utils.parser import parse_config
-from topology_engine import generate_topology_mermaid
+from auth_engine import current_user
+from main import generate_topology_mermaid
+from topology_store import org_topology
+from utils.topology_aggregate import FLAT_RENDER_LIMIT, GROUP_BY, aggregate, render_aggregate
+from utils.topology_query import articulation_points, blast_radius, connected_components, shortest_path
+
+# devices per exported file
+EXPORT_PAGE_SIZE = 500
 
 # ===============================================================
 #  PROFESSIONAL TOPOLOGY WORKSPACE
@@ -74,8 +80,8 @@ def topology_page():
             if not config_text.strip():
                 st.warning("Please paste configuration first.")
             else:
-                parsed = parse_config(config_text)
-                topology = generate_topology_mermaid(parsed["raw"])
+                # rendered once per config, so re-clicking is cheap
+                topology = generate_topology_mermaid(config_text)
 
                 st.markdown("<div class='mermaid-box'>", unsafe_allow_html=True)
                 st.markdown(f"""
@@ -89,3 +95,123 @@ def topology_page():
 
         st.markdown("</div>", unsafe_allow_html=True)
 
+    # =========================
+    # FLEET TOPOLOGY (all uploads of the org)
+    # =========================
+    user = current_user()
+    if not user:
+        return
+
+    st.markdown("<div class='panel'>", unsafe_allow_html=True)
+    st.markdown("<div class='section-title'>🌍 Fleet Topology</div>",
+                unsafe_allow_html=True)
+
+    # kept up to date by every upload; reading it parses nothing
+    graph = org_topology(user.org_id)
+    stats = graph.stats()
+    st.caption(f"{stats['devices']} device(s), {stats['nodes']} node(s), {stats['edges']} link(s)")
+
+    if stats["devices"]:
+        # large fleets open as a summary graph; drill down from there
+        views = ["flat", *GROUP_BY]
+        c1, c2, c3 = st.columns([1, 2, 1])
+        view = c1.selectbox(
+            "View",
+            views,
+            index=1 if stats["nodes"] > FLAT_RENDER_LIMIT else 0,
+            help="Collapse the graph into one node per group",
+        )
+        focus = c2.text_input("Drill down to a device or subnet", "").strip()
+        hops = c3.slider("Hops", 1, 4, 1)
+
+        topology = None
+        if focus:
+            names = graph.neighborhood(focus, hops, limit=FLAT_RENDER_LIMIT)
+            if names:
+                st.caption(f"{len(names)} node(s) within {hops} hop(s) of {focus}")
+                topology = graph.subgraph(names).to_mermaid()
+            else:
+                st.warning(f"{focus} is not in the fleet topology.")
+        elif view == "flat":
+            if stats["nodes"] > FLAT_RENDER_LIMIT:
+                st.caption("Large graph: a grouped view renders much faster.")
+            # serialized once per graph version, not on every rerun
+            topology = graph.render().body
+        else:
+            agg = aggregate(graph, view)
+            groups = sorted(agg.groups, key=lambda g: -agg.groups[g]["devices"])
+            group = st.selectbox("Open group", ["(summary)", *groups])
+            if group == "(summary)":
+                topology = render_aggregate(graph, view).body
+            else:
+                sub = agg.subgraph(graph, group)
+                if len(sub) > FLAT_RENDER_LIMIT:
+                    st.caption(f"{len(sub)} nodes in {group}: showing it grouped by site.")
+                    topology = aggregate(sub, "site").to_mermaid()
+                else:
+                    topology = sub.to_mermaid()
+
+        if topology:
+            st.markdown("<div class='mermaid-box'>", unsafe_allow_html=True)
+            st.markdown(f"""
+            ```mermaid
+            {topology}
+            ```
+            """)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        # path / failure questions, answered on the in-memory graph
+        with st.expander("🔎 Query the fleet graph"):
+            c1, c2 = st.columns(2)
+            src = c1.text_input("From", "", key="query_src").strip()
+            dst = c2.text_input("To", "", key="query_dst").strip()
+            if src and dst:
+                try:
+                    path = shortest_path(graph, src, dst)
+                except KeyError as e:
+                    st.warning(f"{e.args[0]} is not in the fleet topology.")
+                else:
+                    if path:
+                        st.code(" → ".join(path), language="text")
+                    else:
+                        st.info(f"{src} and {dst} are not connected.")
+
+            failed = st.text_input("What loses connectivity if this node fails?", "", key="query_failed").strip()
+            if failed:
+                try:
+                    radius = blast_radius(graph, failed, src or None)
+                except KeyError as e:
+                    st.warning(f"{e.args[0]} is not in the fleet topology.")
+                else:
+                    lost = radius["lost_devices"]
+                    st.caption(f"{len(lost)} device(s), {len(radius['lost'])} node(s) cut off")
+                    if lost:
+                        st.code("\n".join(lost), language="text")
+
+            points, bridges = articulation_points(graph)
+            st.caption(
+                f"{len(connected_components(graph))} component(s), "
+                f"{len(points)} single point(s) of failure, {len(bridges)} bridge link(s)"
+            )
+
+        # paged exports: a few hundred devices (and their links) per file
+        pages = graph.page_count(EXPORT_PAGE_SIZE)
+        c1, c2, c3 = st.columns([1, 1, 1])
+        page = c1.number_input("Export page", 1, pages, 1, help=f"{EXPORT_PAGE_SIZE} devices per page") - 1
+        part = graph.page(page, EXPORT_PAGE_SIZE)
+        c2.download_button(
+            "⬇ JSON adjacency",
+            part.render("json").body,
+            file_name=f"topology-{page + 1}-of-{pages}.json",
+            mime="application/json",
+        )
+        c3.download_button(
+            "⬇ GraphML",
+            part.render("graphml").body,
+            file_name=f"topology-{page + 1}-of-{pages}.graphml",
+            mime="application/graphml+xml",
+        )
+    else:
+        st.info("Upload configurations to build the fleet topology.")
+
+    st.markdown("</div>", unsafe_allow_html=True)
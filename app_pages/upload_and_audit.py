@@ -3,7 +3,23 @@
 # ============================================================
 
 import streamlit as st
+from audit_store import audit_upload
+from auth_engine import current_user
 from main import run_security_audit, generate_topology_mermaid, export_all_formats
+from upload_engine import ingest_upload
+from utils.ir import ParsedConfig
+from utils.spool import SPOOL_THRESHOLD, MappedConfig
+
+
+def _release_spools(keep=None):
+    """
+    Close the spool files of earlier large uploads (all but `keep`) and
+    return the remaining {file key: MappedConfig} of this session.
+    """
+    spools = st.session_state.setdefault("spooled_uploads", {})
+    for key in [k for k in spools if k != keep]:
+        spools.pop(key).close()
+    return spools
 
 
 def upload_and_audit_page():
@@ -25,30 +41,92 @@ NetDoc AI will automatically:
     )
 
     if not uploaded:
+        _release_spools()
         st.info("Drag & drop a configuration file above to begin.")
         return
 
+    file_key = getattr(uploaded, "file_id", None) or (uploaded.name, uploaded.size)
+    spools = _release_spools(keep=file_key)
+
     # --------------------------------------------------------
-    # READ FILE
+    # LARGE FILES (show-tech dumps): spool to disk, parse via mmap
     # --------------------------------------------------------
-    try:
-        config_text = uploaded.read().decode("utf-8", errors="ignore")
-    except Exception as e:
-        st.error(f"Error reading file: {e}")
-        return
+    if (getattr(uploaded, "size", 0) or 0) > SPOOL_THRESHOLD:
+        # spooled once per uploaded file and kept for reruns (the ZIP
+        # export reads it); closed when another file is uploaded
+        config = spools.get(file_key)
+        if config is None:
+            try:
+                config = spools[file_key] = MappedConfig.from_upload(uploaded, filename=uploaded.name)
+            except OSError as e:
+                st.error(f"Error reading file: {e}")
+                return
+        user = None
+        audit = delta = None
+        st.caption(
+            f"Large file ({config.size / 1024 / 1024:.0f} MB): parsed from disk "
+            "and not stored as an upload."
+        )
+    else:
+        # --------------------------------------------------------
+        # READ FILE
+        # --------------------------------------------------------
+        try:
+            config_text = uploaded.read().decode("utf-8", errors="ignore")
+        except Exception as e:
+            st.error(f"Error reading file: {e}")
+            return
+
+        # --------------------------------------------------------
+        # STORE UPLOAD (re-parses only stanzas changed since last time)
+        # --------------------------------------------------------
+        user = current_user()
+        devices = None
+        audit = delta = None
+        if user:
+            # once per uploaded file, not on every rerun (button clicks etc.)
+            ingested = st.session_state.setdefault("ingested_uploads", {})
+            if (user.id, file_key) not in ingested:
+                ingested[user.id, file_key] = ingest_upload(user.org_id, user.id, uploaded.name, config_text)
+            upload, devices, changed = ingested[user.id, file_key]
+            st.caption(f"Saved upload #{upload.id} — {len(changed)} stanza(s) changed since the previous upload.")
+            # re-checks only the changed stanzas against the device's last
+            # report; kept per upload so reruns neither store a duplicate
+            # report nor diff against it (which would blank the delta)
+            audited = st.session_state.setdefault("audited_uploads", {})
+            if upload.id not in audited:
+                audited[upload.id] = audit_upload(upload, user.id)
+            _, audit, delta, _ = audited[upload.id]
+
+        # parsed once (or reused from the ingest above) and shared by the
+        # audit, topology and export below
+        config = ParsedConfig(config_text, filename=uploaded.name, devices=devices)
 
     # --------------------------------------------------------
     # SECURITY AUDIT
     # --------------------------------------------------------
     st.subheader("🔍 Audit Result")
 
-    audit = run_security_audit(config_text)
+    # logged-in users' uploads were audited (and stored) above; anything
+    # else is served from the audit cache when the config is unchanged
+    if audit is None:
+        audit = run_security_audit(config)
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Line Count", audit.get("line_count"))
     col2.metric("Risk Score (0–100)", audit.get("risk_score"))
     col3.metric("Enable Secret Used?", "Yes" if audit.get("contains_enable_secret") else "No")
 
+    if delta and (delta["new"] or delta["resolved"]):
+        st.caption(
+            f"Since the previous upload: {len(delta['new'])} new, "
+            f"{len(delta['resolved'])} resolved, {len(delta['unchanged'])} unchanged finding(s)."
+        )
+        for f in delta["new"]:
+            st.warning(f"New: {f['title']}" + (f" ({f['stanza']})" if f["stanza"] else ""))
+        for f in delta["resolved"]:
+            st.success(f"Resolved: {f['title']}" + (f" ({f['stanza']})" if f["stanza"] else ""))
+
     with st.expander("Show full audit JSON"):
         st.json(audit)
 
@@ -57,7 +135,7 @@ NetDoc AI will automatically:
     # --------------------------------------------------------
     st.subheader("🗺️ Topology Diagram")
 
-    topology = generate_topology_mermaid(config_text)
+    topology = generate_topology_mermaid(config)
 
     st.markdown("Copy/paste this Mermaid diagram anywhere:")
     st.code(topology, language="mermaid")
@@ -68,7 +146,7 @@ NetDoc AI will automatically:
     st.subheader("📦 Export Results")
 
     if st.button("Generate ZIP Bundle"):
-        zip_bytes = export_all_formats(config_text, audit, topology)
+        zip_bytes = export_all_formats(config, audit, topology)
         st.download_button(
             label="Download results.zip",
             data=zip_bytes,
@@ -2,18 +2,33 @@
 #  NetDoc AI — Audit Engine
 # ===============================================================
 
+from rule_engine import load_rule_pack
+from utils.ir import as_parsed
+
+# the netdoc-core rule pack, reported under these keys
+AUDIT_PACK = "netdoc-core"
+AUDIT_KEYS = (
+    "contains_enable_secret",
+    "contains_telnet",
+    "contains_http",
+    "contains_https",
+)
+
+
 def run_security_audit(parsed):
-    if isinstance(parsed, str):
-        raw = parsed
-    else:
-        raw = parsed.get("raw", "")
-
-    audit = {
-        "line_count": raw.count("\n"),
-        "contains_enable_secret": "enable secret" in raw.lower(),
-        "contains_telnet": "telnet" in raw.lower(),
-        "contains_http": "ip http server" in raw.lower(),
-        "contains_https": "ip http secure-server" in raw.lower(),
-    }
+    # raw text, a ParsedConfig, a MappedConfig, or a {"raw": ...} dict
+    cfg = as_parsed(parsed)
+    pack = load_rule_pack(AUDIT_PACK)
+
+    newlines = 0
+    found = set()
+    for text in cfg.lower_blocks():
+        newlines += text.count("\n")
+        pack.matcher.scan(text, found)
+
+    checks = pack.result(found).checks
+
+    audit = {"line_count": newlines}
+    audit.update((key, checks[key]) for key in AUDIT_KEYS)
 
     return audit
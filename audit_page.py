@@ -3,9 +3,10 @@
 # ===============================================================
 
 import streamlit as st
-from utils.parser import parse_config
 from audit_engine import run_security_audit
-from main import generate_topology_mermaid, export_all_formats
+from main import generate_topology_mermaid
+from exports.exporter import export_all_formats
+from utils.ir import ParsedConfig
 
 
 def audit_page():
@@ -17,16 +18,13 @@ def audit_page():
     )
 
     if uploaded:
-        config_text = uploaded.read().decode()
-
         # -------------------------------------------------------
-        # FIX: parse_config now returns pure string
+        # Parse once; audit and topology share the same object
         # -------------------------------------------------------
-        parsed = parse_config(config_text)   # returns string
-        raw = parsed                         # the actual config text
+        config = ParsedConfig.from_bytes(uploaded.read(), filename=uploaded.name)
 
-        audit_result = run_security_audit(raw)
-        topology = generate_topology_mermaid(raw)
+        audit_result = run_security_audit(config)
+        topology = generate_topology_mermaid(config)
         exports = export_all_formats(audit_result, topology)
 
         # ---------------- DISPLAY AUDIT -----------------------
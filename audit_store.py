@@ -0,0 +1,147 @@
+# ===============================================================
+#  NetDoc AI — Audit Store (AuditReport-backed audits)
+# ===============================================================
+
+import json
+import time
+
+from database import AuditReport, SessionLocal, Upload
+from main import AUDIT_PACK, audit_from_result, audit_version
+from rule_engine import RuleSnapshot, load_rule_pack
+from utils.audit_cache import AUDIT_CACHE
+from utils.ir import ParsedConfig
+
+
+def fleet_audits(org_id, version):
+    """
+    {hostname: audit} for the latest upload of every device in an org
+    that has a stored audit under `version` (see compliance_engine).
+    """
+    db = SessionLocal()
+    try:
+        latest = {}
+        uploads = (
+            db.query(Upload.hostname, Upload.content_sha256)
+            .filter(Upload.org_id == org_id, Upload.hostname.isnot(None))
+            .order_by(Upload.id.desc())
+        )
+        for hostname, digest in uploads:
+            latest.setdefault(hostname, digest)
+
+        reports = {}
+        digests = list(set(latest.values()))
+        for n in range(0, len(digests), 500):
+            rows = (
+                db.query(AuditReport.config_sha256, AuditReport.audit_json)
+                .filter(AuditReport.config_sha256.in_(digests[n:n + 500]))
+                .filter(AuditReport.rule_version == version)
+            )
+            for digest, audit_json in rows:
+                reports[digest] = audit_json
+    finally:
+        db.close()
+
+    audits = {}
+    for hostname, digest in latest.items():
+        if digest in reports:
+            audits[hostname] = json.loads(reports[digest])
+    return audits
+
+
+# ---------------------------------------------------------------
+# INCREMENTAL AUDIT (per upload)
+# ---------------------------------------------------------------
+def _same_device(q, upload):
+    q = q.join(Upload, AuditReport.upload_id == Upload.id).filter(Upload.org_id == upload.org_id)
+    if upload.hostname:
+        return q.filter(Upload.hostname == upload.hostname)
+    return q.filter(Upload.filename == upload.filename)
+
+
+def audit_upload(upload, user_id=None):
+    """
+    Audit a stored upload against the latest report of the same device
+    under the current rules: only stanzas whose hash changed are
+    re-checked, findings of the others are carried forward. An upload
+    that already has a report is not audited again.
+
+    Returns (report, audit, delta, changed_stanza_keys); `delta` lists
+    the new, resolved and unchanged findings since the previous report.
+    """
+    version = audit_version()
+    pack = load_rule_pack(AUDIT_PACK)
+    db = SessionLocal()
+
+    base = db.query(AuditReport).filter(AuditReport.rule_version == version)
+    current = base.filter(AuditReport.upload_id == upload.id).order_by(AuditReport.id.desc()).first()
+    previous = (
+        _same_device(base, upload)
+        .filter(AuditReport.upload_id != upload.id)
+        .order_by(AuditReport.id.desc())
+        .first()
+    )
+    before = RuleSnapshot.from_json(previous.stanza_hits) if previous is not None else None
+
+    if current is not None:
+        snapshot = RuleSnapshot.from_json(current.stanza_hits)
+        if snapshot is not None:
+            db.close()
+            return current, json.loads(current.audit_json), pack.delta(before, snapshot), []
+
+    if before is not None and previous.config_sha256 == upload.content_sha256:
+        # identical config: copy the previous report
+        audit, snapshot, changed = json.loads(previous.audit_json), before, []
+    else:
+        result, snapshot, changed = pack.evaluate_incremental(upload.content, before)
+        audit = audit_from_result(ParsedConfig(upload.content).line_count, result)
+
+    report = AuditReport(
+        org_id=upload.org_id,
+        user_id=user_id if user_id is not None else upload.user_id,
+        audit_json=json.dumps(audit),
+        config_sha256=upload.content_sha256,
+        rule_version=version,
+        upload_id=upload.id,
+        stanza_hits=snapshot.to_json(),
+    )
+    db.add(report)
+    db.commit()
+    db.refresh(report)
+    db.close()
+
+    AUDIT_CACHE.put(upload.content_sha256, version, audit)
+    return report, audit, pack.delta(before, snapshot), changed
+
+
+def audit_fleet(org_id):
+    """
+    Nightly audit of an org: the latest upload of every device, each
+    audited incrementally (devices whose upload already has a report
+    under the current rules cost one query). Returns a summary with the
+    finding delta of every device that was re-audited.
+    """
+    t0 = time.perf_counter()
+    db = SessionLocal()
+    latest = {}
+    for upload_id, hostname in (
+        db.query(Upload.id, Upload.hostname)
+        .filter(Upload.org_id == org_id, Upload.hostname.isnot(None))
+        .order_by(Upload.id.desc())
+    ):
+        latest.setdefault(hostname, upload_id)
+
+    summary = {"devices": len(latest), "audited": 0, "unchanged": 0, "changed_stanzas": 0, "deltas": {}}
+    for hostname, upload_id in latest.items():
+        upload = db.get(Upload, upload_id)
+        _, _, delta, changed = audit_upload(upload)
+        db.expunge(upload)  # don't keep every config in the session
+        if not changed:
+            summary["unchanged"] += 1
+            continue
+        summary["audited"] += 1
+        summary["changed_stanzas"] += len(changed)
+        summary["deltas"][hostname] = delta
+    db.close()
+
+    summary["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    return summary
@@ -2,9 +2,16 @@
 # NetDoc AI — Audit Router API
 # ====================================================================
 
-from fastapi import APIRouter
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, File, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from services.audit_engine import run_security_audit
+from services.batch_audit import run_batch, spool
+from services.ir import ParsedConfig
+from services.rule_engine import rule_stats
 
 router = APIRouter()
 
@@ -14,6 +21,33 @@ class ConfigBody(BaseModel):
 
 
 @router.post("/")
-def audit_config(data: ConfigBody):
-    result = run_security_audit(data.config)
+def audit_config(data: ConfigBody, profile: bool = False):
+    # ?profile=true adds per-rule timings under audit["_profile"]
+    result = run_security_audit(ParsedConfig(data.config), profile=profile)
     return {"audit": result}
+
+
+@router.get("/profile")
+def audit_profile(pack: Optional[str] = None, limit: int = 20):
+    """Most expensive rules over every profiled audit since startup."""
+    return {"rules": rule_stats(limit, pack)}
+
+
+@router.post("/batch")
+def audit_batch(files: List[UploadFile] = File(...)):
+    """
+    Audit a fleet in one request: any number of config files and/or
+    zip / tar archives of configs. Responds with NDJSON, one line per
+    device in completion order, then a summary line.
+    """
+    sources = [(f.filename or f"upload-{i}", spool(f.file)) for i, f in enumerate(files)]
+
+    def stream():
+        try:
+            for result in run_batch(sources):
+                yield json.dumps(result) + "\n"
+        finally:
+            for _, fileobj in sources:
+                fileobj.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
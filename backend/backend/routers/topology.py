@@ -2,10 +2,25 @@
 # NetDoc AI — Topology Router API
 # ====================================================================
 
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Response, UploadFile
 from pydantic import BaseModel
 
-from services.topology_engine import generate_topology
+from utils.auth_utils import get_current_user
+
+from services.ir import ParsedConfig
+from services.parser import iter_config_lines, parse_config
+from services.parse_cache import PARSE_CACHE
+from services.topology_engine import TOPOLOGY_RENDERS, mermaid_from_parsed, render_topology
+from services.topology_graph import MEDIA_TYPES, TopologyGraph, add_to_fleet, etag_matches, get_fleet
+from services.topology_query import (
+    articulation_points,
+    blast_radius,
+    connected_components,
+    k_hop,
+    shortest_path,
+)
 
 router = APIRouter()
 
@@ -14,7 +29,140 @@ class ConfigBody(BaseModel):
     config: str
 
 
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def _fleet(user, name: str) -> TopologyGraph:
+    graph = get_fleet(user["workspace_id"], name)
+    if graph is None:
+        raise HTTPException(status_code=404, detail=f"Unknown fleet: {name}")
+    return graph
+
+
 @router.post("/")
-def topology(data: ConfigBody):
-    topo = generate_topology(data.config)
-    return {"topology": topo}
+def topology(
+    data: ConfigBody,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+):
+    rendered = render_topology(data.config)
+    if etag_matches(if_none_match, rendered.etag):
+        return _not_modified(rendered.etag)
+    response.headers["ETag"] = rendered.etag
+    return {"topology": rendered.body}
+
+
+@router.post("/upload")
+def topology_upload(file: UploadFile = File(...)):
+    # stream the spooled upload line by line instead of reading it whole
+    parsed = parse_config(iter_config_lines(file.file))
+    return {"topology": mermaid_from_parsed(parsed)}
+
+
+# -------------------------------
+# FLEETS (in-memory graphs of the caller's workspace)
+# -------------------------------
+@router.post("/fleet/{name}")
+def fleet_add(name: str, data: ConfigBody, user=Depends(get_current_user)):
+    """Add a device to one of the workspace's fleet graphs (or replace its links)."""
+    graph = add_to_fleet(user["workspace_id"], name, ParsedConfig(data.config).parsed)
+    return {"fleet": name, **graph.stats()}
+
+
+@router.post("/fleet/{name}/upload")
+def fleet_add_upload(name: str, file: UploadFile = File(...), user=Depends(get_current_user)):
+    graph = add_to_fleet(user["workspace_id"], name, parse_config(iter_config_lines(file.file)))
+    return {"fleet": name, **graph.stats()}
+
+
+@router.get("/fleet/{name}")
+def fleet_topology(
+    name: str,
+    format: str = "mermaid",
+    if_none_match: Optional[str] = Header(None),
+    user=Depends(get_current_user),
+):
+    """
+    A fleet's whole graph as mermaid / json / graphml. Serialized once
+    per graph version; polling an unchanged graph with If-None-Match
+    gets a 304 without rendering anything.
+    """
+    graph = _fleet(user, name)
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
+
+    rendered = graph.render(format)
+    if etag_matches(if_none_match, rendered.etag):
+        return _not_modified(rendered.etag)
+    return Response(rendered.body, media_type=rendered.media_type, headers={"ETag": rendered.etag})
+
+
+# -------------------------------
+# GRAPH QUERIES (in-memory, per workspace fleet)
+# -------------------------------
+@router.get("/fleet/{name}/path")
+def fleet_path(name: str, src: str, dst: str, user=Depends(get_current_user)):
+    """Fewest-hop path between two nodes; `path` is null when they are not connected."""
+    graph = _fleet(user, name)
+    try:
+        path = shortest_path(graph, src, dst)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown node: {e.args[0]}")
+    return {"src": src, "dst": dst, "path": path, "hops": len(path) - 1 if path else None}
+
+
+@router.get("/fleet/{name}/neighborhood")
+def fleet_neighborhood(name: str, node: str, k: int = 1, limit: int = 1000, user=Depends(get_current_user)):
+    """Nodes within `k` hops of `node` with their hop count, nearest first."""
+    graph = _fleet(user, name)
+    if k < 0 or limit < 1:
+        raise HTTPException(status_code=400, detail="k must be >= 0 and limit >= 1")
+    try:
+        hops = k_hop(graph, node, k, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown node: {e.args[0]}")
+    return {"node": node, "k": k, "nodes": hops}
+
+
+@router.get("/fleet/{name}/critical")
+def fleet_critical(name: str, user=Depends(get_current_user)):
+    """Articulation points and bridges: single nodes / links whose loss splits the graph."""
+    graph = _fleet(user, name)
+    points, bridges = articulation_points(graph)
+    kinds = graph.nodes()
+    return {
+        "articulation_points": [{"node": n, "kind": kinds[n]} for n in points],
+        "bridges": [list(b) for b in bridges],
+    }
+
+
+@router.get("/fleet/{name}/blast-radius")
+def fleet_blast_radius(name: str, node: str, root: Optional[str] = None, user=Depends(get_current_user)):
+    """
+    What loses connectivity if `node` dies: everything cut off from
+    `root` (default: the largest part of what remains).
+    """
+    graph = _fleet(user, name)
+    try:
+        return blast_radius(graph, node, root)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown node: {e.args[0]}")
+
+
+@router.get("/fleet/{name}/components")
+def fleet_components(name: str, members: bool = False, user=Depends(get_current_user)):
+    """Connected components, largest first; `members=true` lists their nodes."""
+    graph = _fleet(user, name)
+    out = []
+    for comp in connected_components(graph):
+        entry = {"size": len(comp), "devices": sum(1 for n in comp if n in graph.devices)}
+        if members:
+            entry["nodes"] = sorted(comp)
+        out.append(entry)
+    return {"count": len(out), "components": out}
+
+
+@router.get("/cache")
+def topology_cache_stats():
+    return {"parse_cache": PARSE_CACHE.stats(), "render_cache": TOPOLOGY_RENDERS.stats()}
@@ -0,0 +1,92 @@
+# ====================================================================
+# NetDoc AI — Audit Cache (config SHA-256 + rule version)
+# ====================================================================
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+
+class AuditCache:
+    """
+    Audit results keyed by (SHA-256 of the config, audit version). The
+    version names the engine and the exact rule pack applied
+    (RulePack.tag), so editing a pack or bumping an engine never serves
+    stale findings: old entries simply stop being looked up.
+
+    The cache is a bounded in-memory LRU. Callers get their own copy
+    of the audit dict.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: Tuple[str, str], audit: Dict[str, object]) -> None:
+        with self._lock:
+            self._entries[key] = audit
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, digest: str, version: str) -> Optional[Dict[str, object]]:
+        with self._lock:
+            audit = self._entries.get((digest, version))
+            if audit is None:
+                return None
+            self._entries.move_to_end((digest, version))
+        return copy.deepcopy(audit)
+
+    def put(self, digest: str, version: str, audit: Dict[str, object]) -> None:
+        """Remember an audit computed elsewhere (e.g. incrementally)."""
+        self._remember((digest, version), copy.deepcopy(audit))
+
+    def get_or_audit(
+        self,
+        digest: str,
+        version: str,
+        audit: Callable[[], Dict[str, object]],
+    ) -> Dict[str, object]:
+        key = (digest, version)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        with self._lock:
+            self.misses += 1
+        result = audit()
+        self._remember(key, copy.deepcopy(result))
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# ------------------------------------------------------------
+# PROCESS-WIDE CACHE
+# ------------------------------------------------------------
+AUDIT_CACHE = AuditCache(max_entries=int(os.getenv("NETDOC_AUDIT_CACHE_SIZE", "256")))
+
+
+def audit_cache_stats() -> Dict[str, int]:
+    return AUDIT_CACHE.stats()
@@ -0,0 +1,226 @@
+# ====================================================================
+# NetDoc AI — Fleet Batch Audit (process pool, completion order)
+# ====================================================================
+
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import IO, Dict, Iterable, Iterator, Optional, Tuple
+
+from .audit_engine import run_security_audit
+from .ir import ParsedConfig
+
+# worker processes shared by all batch requests (0 = one per core)
+BATCH_WORKERS = int(os.getenv("NETDOC_BATCH_WORKERS", "0")) or os.cpu_count() or 1
+
+# configs handed to the pool at once; bounds memory when an archive
+# holds thousands of devices
+BATCH_IN_FLIGHT = BATCH_WORKERS * 4
+
+# archive members larger than this are reported instead of audited
+BATCH_MAX_CONFIG_BYTES = int(os.getenv("NETDOC_BATCH_MAX_CONFIG_BYTES", str(64 * 1024 * 1024)))
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+        return _POOL
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died so the next batch starts a fresh one."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# -------------------------------
+# INPUT
+# -------------------------------
+def spool(fileobj: IO[bytes]) -> IO[bytes]:
+    """
+    Copy an upload to a temporary file owned by the caller: the batch is
+    streamed after the request handler returns, when the framework may
+    already have closed its own upload files.
+    """
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+    out = tempfile.TemporaryFile()
+    shutil.copyfileobj(fileobj, out, 1024 * 1024)
+    out.seek(0)
+    return out
+
+
+def _skip_member(name: str) -> bool:
+    # macOS archive metadata and hidden files
+    base = os.path.basename(name)
+    return not base or base.startswith(".") or "__MACOSX/" in name
+
+
+def iter_configs(name: str, fileobj: IO[bytes]) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """
+    (device name, config bytes) for every config in one upload: each
+    file of a zip or tar (.tar, .tar.gz, ...) archive, or the upload
+    itself. Oversized members yield None instead of their bytes.
+    """
+    fileobj.seek(0)
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or _skip_member(info.filename):
+                    continue
+                if info.file_size > BATCH_MAX_CONFIG_BYTES:
+                    yield info.filename, None
+                    continue
+                yield info.filename, zf.read(info)
+        return
+
+    fileobj.seek(0)
+    try:
+        tf = tarfile.open(fileobj=fileobj, mode="r:*")
+    except tarfile.TarError:
+        fileobj.seek(0)
+        yield name, fileobj.read()
+        return
+
+    with tf:
+        for member in tf:
+            if not member.isfile() or _skip_member(member.name):
+                continue
+            if member.size > BATCH_MAX_CONFIG_BYTES:
+                yield member.name, None
+                continue
+            f = tf.extractfile(member)
+            if f is not None:
+                yield member.name, f.read()
+
+
+# -------------------------------
+# WORKER
+# -------------------------------
+def audit_one(device: str, data: bytes) -> Dict:
+    """Audit one config. Runs in a pool process."""
+    t0 = time.perf_counter()
+    try:
+        audit, error = run_security_audit(ParsedConfig(data.decode("utf-8", errors="ignore"))), None
+    except Exception as e:
+        audit, error = None, f"{type(e).__name__}: {e}"
+    return {
+        "device": device,
+        "bytes": len(data),
+        "audit": audit,
+        "error": error,
+        "audit_ms": round((time.perf_counter() - t0) * 1000, 3),
+    }
+
+
+# -------------------------------
+# BATCH
+# -------------------------------
+def run_batch(
+    sources: Iterable[Tuple[str, IO[bytes]]],
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> Iterator[Dict]:
+    """
+    Audit every config in `sources` (name, file object) on the process
+    pool. Yields one result per device as soon as it completes —
+    completion order, not input order — with `audit_ms` (time in the
+    worker) and `elapsed_ms` (submission to completion), then a final
+    {"summary": ...}. Archives are read while earlier devices are
+    already being audited. A crashed worker only fails the devices it
+    held: the shared pool is replaced and the stream goes on.
+    """
+    workers = BATCH_WORKERS if pool is None else None
+    shared = pool is None
+    pool = pool or get_pool()
+    started = time.perf_counter()
+    pending: Dict[Future, Tuple[str, float]] = {}
+    counts = {"devices": 0, "errors": 0}
+
+    def submit(device: str, data: bytes) -> Optional[Future]:
+        # a shared pool that broke (here or in another batch) is replaced
+        # once; None if the config cannot be handed to any pool
+        nonlocal pool
+        for attempt in range(2):
+            try:
+                return pool.submit(audit_one, device, data)
+            except (BrokenProcessPool, RuntimeError):  # RuntimeError: already shut down
+                if not shared or attempt:
+                    return None
+                _discard_pool(pool)
+                pool = get_pool()
+        return None
+
+    def collect(done) -> Iterator[Dict]:
+        for fut in done:
+            device, submitted = pending.pop(fut)
+            try:
+                result = fut.result()
+            except BrokenProcessPool as e:
+                _discard_pool(pool)
+                result = {"device": device, "audit": None, "error": f"worker crashed: {e}"}
+            except Exception as e:
+                result = {"device": device, "audit": None, "error": f"{type(e).__name__}: {e}"}
+            result["elapsed_ms"] = round((time.perf_counter() - submitted) * 1000, 3)
+            counts["devices"] += 1
+            counts["errors"] += result["error"] is not None
+            yield result
+
+    try:
+        for source, fileobj in sources:
+            for device, data in iter_configs(source, fileobj):
+                if data is None:
+                    counts["devices"] += 1
+                    counts["errors"] += 1
+                    yield {
+                        "device": device,
+                        "audit": None,
+                        "error": f"config larger than {BATCH_MAX_CONFIG_BYTES} bytes",
+                        "elapsed_ms": 0.0,
+                    }
+                    continue
+
+                fut = submit(device, data)
+                if fut is None:
+                    counts["devices"] += 1
+                    counts["errors"] += 1
+                    yield {"device": device, "audit": None, "error": "worker pool unavailable", "elapsed_ms": 0.0}
+                    continue
+                pending[fut] = (device, time.perf_counter())
+
+                # stream whatever finished meanwhile; block only when the window is full
+                if len(pending) >= BATCH_IN_FLIGHT:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                else:
+                    done = [f for f in pending if f.done()]
+                yield from collect(done)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from collect(done)
+    finally:
+        # client went away: don't audit what nobody will read
+        for fut in pending:
+            fut.cancel()
+
+    yield {
+        "summary": {
+            **counts,
+            "workers": workers,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+    }
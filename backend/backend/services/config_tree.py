@@ -0,0 +1,245 @@
+# ====================================================================
+# NetDoc AI — Config Stanza Tree (single-pass tokenizer)
+# ====================================================================
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, Optional, Pattern, Union
+import re
+
+# Comment / separator lines (Cisco "!", generic "#") never become stanzas.
+COMMENT_PREFIXES = ("!", "#")
+
+# FortiOS blocks are closed by keywords instead of indentation.
+BLOCK_OPENERS = ("config", "edit")
+BLOCK_TERMINATORS = {"end": "config", "next": "edit"}
+
+# A top-level stanza: one non-indented, non-comment line followed by the
+# indented (or blank) lines below it. Matching whole blocks at once keeps
+# the per-line work inside the regex engine.
+STANZA_RE = re.compile(r"^([^\s!#].*)((?:\n[ \t].*|\n(?=\r?\n))*)", re.MULTILINE)
+
+
+class Stanza:
+    """
+    One configuration line plus the lines nested under it.
+
+    `keyword` is the lower-cased first token, `args` the rest of the line.
+    Top-level stanzas keep their raw body text and only tokenize it into
+    `children` on first access, so parsers that just need one or two
+    values can run a regex over `body` instead.
+    """
+
+    __slots__ = ("text", "keyword", "lineno", "indent", "_body", "_children")
+
+    def __init__(self, text: str, lineno: int = 0, indent: int = 0) -> None:
+        self.text = text
+        self.keyword = text.split(None, 1)[0].lower() if text else ""
+        self.lineno = lineno
+        self.indent = indent
+        self._body: Optional[str] = None
+        self._children: Optional[List[Stanza]] = None
+
+    @property
+    def args(self) -> str:
+        return self.text[len(self.keyword):].strip()
+
+    @property
+    def children(self) -> List["Stanza"]:
+        if self._children is None:
+            lines = self._body.split("\n")[1:] if self._body else []
+            self._children = list(_tokenize(lines, self.lineno + 1))
+        return self._children
+
+    @property
+    def body(self) -> str:
+        """
+        Raw text of everything nested under this stanza. Every nested
+        line (including the first) is preceded by a newline.
+        """
+        if self._body is not None:
+            return self._body
+        return "".join("\n" + " " * c.indent + c.text for c in self.walk())
+
+    def search(self, pattern: Pattern[str]):
+        return pattern.search(self.body)
+
+    def iter_children(self, keyword: str) -> Iterator["Stanza"]:
+        for child in self.children:
+            if child.keyword == keyword:
+                yield child
+
+    def find(self, keyword: str, args: Optional[str] = None) -> Optional["Stanza"]:
+        """
+        First direct child with `keyword` (and, optionally, matching args,
+        compared case-insensitively).
+        """
+        for child in self.children:
+            if child.keyword != keyword:
+                continue
+            if args is None or child.args.lower() == args:
+                return child
+        return None
+
+    def walk(self) -> Iterator["Stanza"]:
+        """Depth-first iteration over every stanza below this one."""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.children:
+                stack.extend(reversed(node.children))
+
+    def __repr__(self) -> str:
+        return f"Stanza({self.text!r}, line={self.lineno})"
+
+
+def _tokenize(lines: Iterable[str], first_lineno: int = 1) -> Iterator[Stanza]:
+    """
+    Full tokenizer for nested blocks. Nesting follows indentation
+    (Cisco style) except for FortiOS `config ... end` / `edit ... next`
+    blocks, which stay open until their terminator.
+    """
+    root = Stanza("", indent=-1)
+    root._children = []
+    stack: List[Stanza] = [root]
+
+    for lineno, raw in enumerate(lines, first_lineno):
+        body = raw.lstrip()
+        if not body or body[0] in COMMENT_PREFIXES:
+            continue
+        indent = len(raw) - len(body)
+        text = body.rstrip()
+
+        top = stack[-1]
+        while top.indent >= indent and top.keyword not in BLOCK_OPENERS:
+            stack.pop()
+            top = stack[-1]
+
+        opener = BLOCK_TERMINATORS.get(text)
+        if opener is not None:
+            depth = len(stack) - 1
+            while depth > 0 and stack[depth].keyword != opener:
+                depth -= 1
+            if depth > 0:
+                del stack[depth:]
+                continue
+
+        node = Stanza(text, lineno, indent)
+        node._children = []
+        if stack[-1] is root:
+            yield node
+        else:
+            stack[-1]._children.append(node)
+        stack.append(node)
+
+
+def _iter_text_stanzas(text: str) -> Iterator[Stanza]:
+    current: Optional[Stanza] = None
+    body_start = 0
+    depth = 0  # open FortiOS "config" blocks at column 0
+    lineno = 1
+    last = 0
+
+    for m in STANZA_RE.finditer(text):
+        start = m.start()
+        lineno += text.count("\n", last, start)
+        last = start
+        head, body = m.groups()
+        head = head.rstrip()
+
+        if depth:
+            if head == "end":
+                depth -= 1
+                if not depth:
+                    current._body = text[body_start:start - 1]
+                    yield current
+                    current = None
+                continue
+            if head.startswith("config "):
+                depth += 1
+            continue
+
+        current = Stanza(head, lineno)
+        if current.keyword == "config":
+            body_start = m.start(2)
+            depth = 1
+            continue
+
+        current._body = body
+        yield current
+        current = None
+
+    if current is not None:
+        current._body = text[body_start:]
+        yield current
+
+
+def _iter_line_stanzas(lines: Iterable[str]) -> Iterator[Stanza]:
+    current: Optional[Stanza] = None
+    body: List[str] = []
+    depth = 0  # open FortiOS "config" blocks at column 0
+
+    for lineno, raw in enumerate(lines, 1):
+        raw = raw.rstrip("\r\n")
+        c = raw[:1]
+        if c == " " or c == "\t" or c == "":
+            if current is not None:
+                body.append(raw)
+            continue
+
+        if depth:
+            text = raw.rstrip()
+            if text == "end":
+                depth -= 1
+                if not depth:
+                    current._body = "\n" + "\n".join(body) if body else ""
+                    yield current
+                    current = None
+                    continue
+            elif text.startswith("config "):
+                depth += 1
+            body.append(raw)
+            continue
+
+        if current is not None:
+            current._body = "\n" + "\n".join(body) if body else ""
+            yield current
+            current = None
+
+        if c in COMMENT_PREFIXES:
+            continue
+
+        current = Stanza(raw.rstrip(), lineno)
+        body = []
+        if current.keyword == "config":
+            depth = 1
+
+    if current is not None:
+        current._body = "\n" + "\n".join(body) if body else ""
+        yield current
+
+
+def iter_stanzas(source: Union[str, Iterable[str]]) -> Iterator[Stanza]:
+    """
+    Split a config into top-level stanzas in one pass, yielding each one
+    as soon as it is complete.
+
+    `source` is either the whole config text or an iterable of lines.
+    A stanza starts at any non-indented line and owns the indented lines
+    below it. FortiOS `config` blocks own everything up to their matching
+    non-indented `end` (so flat, unindented exports work too). Nothing
+    below the top level is tokenized until `Stanza.children` is read.
+    """
+    if isinstance(source, str):
+        return _iter_text_stanzas(source)
+    return _iter_line_stanzas(source)
+
+
+def build_tree(source: Union[str, Iterable[str]]) -> Stanza:
+    """
+    Build the full stanza tree (global -> block -> sub-commands).
+    """
+    root = Stanza("", indent=-1)
+    root._children = list(iter_stanzas(source))
+    return root
@@ -0,0 +1,86 @@
+# ====================================================================
+# NetDoc AI — Parsed Config (shared intermediate representation)
+# ====================================================================
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Union
+
+from .config_tree import Stanza, build_tree
+from .parse_cache import PARSE_CACHE, config_digest
+
+
+class ParsedConfig:
+    """
+    One config, parsed once per request and shared by the audit and
+    topology engines. Lines, the line index, the stanza tree and the
+    parse_config dict are each built on first use and then reused.
+    """
+
+    __slots__ = ("raw", "parsed_given", "_lower", "_lines", "_line_starts", "_tree", "_parsed", "_digest")
+
+    def __init__(self, raw: str, parsed: Optional[Dict] = None):
+        self.raw = raw
+        self._lower: Optional[str] = None
+        self._lines: Optional[List[str]] = None
+        self._line_starts: Optional[List[int]] = None
+        self._tree: Optional[Stanza] = None
+        self._parsed = parsed
+        # a parse result handed in is not keyed by `raw`: never cache on it
+        self.parsed_given = parsed is not None
+        self._digest: Optional[str] = None
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.raw.lower()
+        return self._lower
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self.raw.splitlines()
+        return self._lines
+
+    @property
+    def line_starts(self) -> List[int]:
+        """Character offset at which every line starts."""
+        if self._line_starts is None:
+            starts = [0]
+            pos = self.raw.find("\n")
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = self.raw.find("\n", pos + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def lineno(self, offset: int) -> int:
+        """1-based line number of a character offset."""
+        return bisect_right(self.line_starts, offset)
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = config_digest(self.raw)
+        return self._digest
+
+    @property
+    def tree(self) -> Stanza:
+        if self._tree is None:
+            self._tree = build_tree(self.raw)
+        return self._tree
+
+    @property
+    def parsed(self) -> Dict:
+        """parse_config output (shared with the parse cache: read-only)."""
+        if self._parsed is None:
+            self._parsed = PARSE_CACHE.get_or_parse(self.raw)
+        return self._parsed
+
+
+ConfigInput = Union[str, ParsedConfig]
+
+
+def as_parsed(config: ConfigInput) -> ParsedConfig:
+    if isinstance(config, ParsedConfig):
+        return config
+    return ParsedConfig(config)
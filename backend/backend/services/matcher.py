@@ -0,0 +1,329 @@
+# ====================================================================
+# NetDoc AI — Compiled multi-pattern matcher (one pass per text)
+# ====================================================================
+
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Pattern, Set, Tuple, Union
+import re
+
+# Optional: pyahocorasick runs literal checks in C, one pass for any
+# number of literals. Without it literals become a trie-shaped regex.
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on the environment
+    ahocorasick = None
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre_parse
+
+Check = Union[str, Pattern[str]]
+
+# After this many hits on checks that are already found, the scan
+# switches to a combined regex of only the checks still missing.
+WASTED_HITS_BEFORE_NARROWING = 32
+
+# Below this many literals, one C-level `in` per literal (memchr-driven,
+# stops at the first hit) beats any single-pass automaton.
+MULTI_LITERAL_MIN = 32
+
+# Regexes that need literals at least this long are verified only on the
+# lines containing them instead of joining the combined regex.
+GATE_MIN_LEN = 3
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """
+    One regex for many literals, shaped like a trie ("ip http (?:secure-
+    server|server)|telnet"), so matching at a position costs the length
+    of the longest literal instead of the number of literals. Longer
+    literals win over their own prefixes.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+def _required_literals(rx: Pattern[str]) -> Tuple[str, ...]:
+    """
+    Runs of plain characters that every match of `rx` contains, longest
+    first: ("router eigrp",) for r"^router eigrp \\d+". Empty when the
+    regex cannot be checked line by line or needs no long literal.
+    """
+    if rx.flags & re.IGNORECASE:
+        return ()
+    # checked one line at a time, an end anchor would match every line end
+    if "\\Z" in rx.pattern or ("$" in rx.pattern and not rx.flags & re.MULTILINE):
+        return ()
+    try:
+        items = _sre_parse.parse(rx.pattern).data
+    except Exception:  # pragma: no cover - already compiled once
+        return ()
+
+    runs: List[str] = []
+    run: List[str] = []
+    for op, av in items + [(None, None)]:
+        if op is _sre_parse.LITERAL:
+            run.append(chr(av))
+        elif op is not _sre_parse.AT:  # anchors are zero-width
+            runs.append("".join(run))
+            run = []
+    if any("\n" in r for r in runs):
+        return ()
+    return tuple(sorted({r for r in runs if len(r) >= GATE_MIN_LEN}, key=len, reverse=True))
+
+
+class _Plan:
+    """Compiled form of one set of checks."""
+
+    __slots__ = (
+        "combined", "literal_re", "implied", "regexes", "automaton", "max_len", "direct",
+        "gated", "gate_literals", "gate_automaton",
+    )
+
+    def __init__(
+        self,
+        literals: Dict[str, List[str]],
+        regexes: Dict[str, Pattern[str]],
+        gated: List[tuple],
+    ) -> None:
+        self.regexes = regexes
+        self.gated = gated
+        self.gate_literals = sorted({lit for _, lits, _ in gated for lit in lits})
+        self.gate_automaton = None
+        if len(self.gate_literals) >= MULTI_LITERAL_MIN and ahocorasick is not None:
+            self.gate_automaton = ahocorasick.Automaton()
+            for lit in self.gate_literals:
+                self.gate_automaton.add_word(lit, lit)
+            self.gate_automaton.make_automaton()
+        self.automaton = None
+        self.max_len = max(map(len, literals), default=0)
+        self.direct: List[tuple] = []
+
+        if len(literals) < MULTI_LITERAL_MIN:
+            self.direct = list(literals.items())
+            literals = {}
+        elif ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for lit, names in literals.items():
+                self.automaton.add_word(lit, tuple(names))
+            self.automaton.make_automaton()
+            literals = {}
+
+        # a literal also implies the literals that are its prefixes
+        # (the trie only reports the longest one at a position)
+        self.implied: Dict[str, List[str]] = {
+            lit: [n for other, names in literals.items() if lit.startswith(other) for n in names]
+            for lit in literals
+        }
+
+        trie = _trie_regex(literals) if literals else ""
+        self.literal_re: Optional[Pattern[str]] = re.compile(trie) if trie else None
+
+        parts = [trie] if trie else []
+        parts.extend(f"(?:{rx.pattern})" for rx in regexes.values())
+        flags = 0
+        for rx in regexes.values():
+            flags |= rx.flags & (re.IGNORECASE | re.MULTILINE)
+        self.combined: Optional[Pattern[str]] = re.compile("|".join(parts), flags) if parts else None
+
+
+class MultiMatcher:
+    """
+    Evaluates many "does the text contain X" checks in a single scan.
+
+    `checks` maps a name to either a literal substring or a compiled
+    regex. Large literal sets run through one Aho-Corasick pass (or,
+    without pyahocorasick, a trie-shaped regex); a handful of literals
+    are plain `in` tests, which are faster at that size. Regexes (and
+    trie literals) are folded into one combined regex; each position it
+    stops at is then resolved against the trie and the regexes not found
+    yet, so checks that overlap or share a start position are never
+    masked. Scanning stops as soon as every check has been found, and
+    narrows to the missing checks when already-found ones keep matching.
+    A regex that needs literals (r"^router bgp \\d+" needs "router bgp")
+    skips the combined regex: it is only tried when all of them occur,
+    and then only on the lines holding the rarest one.
+
+    Literals are lower-cased and meant to run over a lower-cased view of
+    the config (ParsedConfig.lower); regexes are used as given.
+    Checks must not span lines (blocks are cut at newlines, and
+    literal-gated regexes are verified one line at a time).
+    """
+
+    def __init__(self, checks: Mapping[str, Check]) -> None:
+        self.names: List[str] = list(checks)
+        self._checks: Dict[str, Check] = {
+            name: check.lower() if isinstance(check, str) else check
+            for name, check in checks.items()
+        }
+        self._plans: Dict[FrozenSet[str], _Plan] = {}
+        self._all: FrozenSet[str] = frozenset(self.names)
+        self._gates: Dict[str, Tuple[str, ...]] = {}
+        for name, check in self._checks.items():
+            if not isinstance(check, str):
+                literals = _required_literals(check)
+                if literals:
+                    self._gates[name] = literals
+
+    def _plan(self, names: FrozenSet[str]) -> _Plan:
+        plan = self._plans.get(names)
+        if plan is None:
+            literals: Dict[str, List[str]] = {}
+            regexes: Dict[str, Pattern[str]] = {}
+            gated: List[tuple] = []
+            for name in self.names:
+                if name not in names:
+                    continue
+                check = self._checks[name]
+                if isinstance(check, str):
+                    literals.setdefault(check, []).append(name)
+                elif name in self._gates:
+                    gated.append((name, self._gates[name], check))
+                else:
+                    regexes[name] = check
+            if len(self._plans) >= 64:
+                self._plans.clear()
+            plan = self._plans[names] = _Plan(literals, regexes, gated)
+        return plan
+
+    def scan(self, text: str, found: Optional[Set[str]] = None) -> Set[str]:
+        """Names of all checks present in `text` (added to `found`)."""
+        found = set() if found is None else found
+        total = len(self.names)
+        if len(found) >= total:
+            return found
+
+        if found:
+            plan = self._plan(frozenset(n for n in self.names if n not in found))
+        else:  # the common case when scanning many small texts
+            plan = self._plan(self._all)
+        if plan.automaton is not None:
+            plan = self._scan_automaton(plan, text, found)
+            if plan is None:
+                return found
+        self._scan_direct(plan, text, found)
+        self._scan_gated(plan, text, found)
+
+        pos = 0
+        wasted = 0
+        while plan.combined is not None:
+            m = plan.combined.search(text, pos)
+            if m is None:
+                break
+            start = m.start()
+            before = len(found)
+
+            if plan.literal_re is not None:
+                lm = plan.literal_re.match(text, start)
+                if lm is not None and lm.end() > start:
+                    found.update(plan.implied[lm.group()])
+            for name, rx in plan.regexes.items():
+                if name not in found and rx.match(text, start):
+                    found.add(name)
+
+            if len(found) >= total:
+                break
+            if len(found) == before:
+                wasted += 1
+                if wasted >= WASTED_HITS_BEFORE_NARROWING:
+                    plan = self._plan(frozenset(n for n in self.names if n not in found))
+                    self._scan_direct(plan, text, found)
+                    wasted = 0
+            pos = start + 1
+        return found
+
+    @staticmethod
+    def _scan_direct(plan: _Plan, text: str, found: Set[str]) -> None:
+        for lit, names in plan.direct:
+            if lit in text:
+                found.update(names)
+
+    @staticmethod
+    def _scan_gated(plan: _Plan, text: str, found: Set[str]) -> None:
+        if not plan.gated:
+            return
+        # how often each required literal occurs: one pass for many of them
+        if plan.gate_automaton is not None:
+            present: Dict[str, int] = {}
+            for _, lit in plan.gate_automaton.iter(text):
+                present[lit] = present.get(lit, 0) + 1
+        else:
+            present = {lit: 1 for lit in plan.gate_literals if lit in text}
+        if not present:
+            return
+
+        find, rfind = text.find, text.rfind
+        for name, literals, rx in plan.gated:
+            if name in found or not all(lit in present for lit in literals):
+                continue
+            # walk the rarest literal's lines
+            literal = min(literals, key=present.__getitem__)
+            pos = find(literal)
+            while pos != -1:
+                start = rfind("\n", 0, pos) + 1
+                end = find("\n", pos)
+                if end == -1:
+                    end = len(text)
+                if rx.search(text, start, end):
+                    found.add(name)
+                    break
+                pos = find(literal, end)
+
+    def _scan_automaton(self, plan: _Plan, text: str, found: Set[str]) -> Optional[_Plan]:
+        """
+        Literal checks through the Aho-Corasick automaton. Returns the
+        plan to run the regex checks with, or None once all are found.
+        """
+        total = len(self.names)
+        wasted = 0
+        it = plan.automaton.iter(text)
+        while True:
+            for end, names in it:
+                before = len(found)
+                found.update(names)
+                if len(found) >= total:
+                    return None
+                if len(found) > before:
+                    continue
+                wasted += 1
+                if wasted >= WASTED_HITS_BEFORE_NARROWING:
+                    break
+            else:
+                return plan
+
+            # narrow to the missing checks and resume where we were
+            plan = self._plan(frozenset(n for n in self.names if n not in found))
+            if plan.automaton is None:
+                return plan
+            wasted = 0
+            it = plan.automaton.iter(text, max(0, end + 1 - plan.max_len))
+
+    def scan_blocks(self, blocks: Iterable[str]) -> Set[str]:
+        """scan() over line-aligned blocks, stopping once everything is found."""
+        found: Set[str] = set()
+        total = len(self.names)
+        for block in blocks:
+            self.scan(block, found)
+            if len(found) >= total:
+                break
+        return found
+
+    def evaluate(self, blocks: Iterable[str]) -> Dict[str, bool]:
+        """{check name: present?} for every check."""
+        found = self.scan_blocks(blocks)
+        return {name: name in found for name in self.names}
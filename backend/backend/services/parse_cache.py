@@ -0,0 +1,117 @@
+# ====================================================================
+# NetDoc AI — Parse Cache (content-addressed, LRU + disk)
+# ====================================================================
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from .parser import PARSER_VERSION, parse_config
+
+
+def config_digest(config_text: str) -> str:
+    """SHA-256 of the config bytes (UTF-8)."""
+    return hashlib.sha256(config_text.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+class ParseCache:
+    """
+    parse_config results keyed by SHA-256 of the config plus
+    PARSER_VERSION. Bounded in-memory LRU with an optional pickle-on-disk
+    tier. Cached results are shared and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(config_text: str) -> str:
+        return f"{PARSER_VERSION}-{config_digest(config_text)}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _load(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _store(self, key: str, parsed: Dict) -> None:
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            pass  # the disk tier is best-effort
+
+    def _remember(self, key: str, parsed: Dict) -> None:
+        with self._lock:
+            self._entries[key] = parsed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_parse(self, config_text: str, parse: Callable[[str], Dict] = parse_config) -> Dict:
+        key = self.key(config_text)
+
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return parsed
+
+        if self.cache_dir:
+            parsed = self._load(key)
+            if parsed is not None:
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                self._remember(key, parsed)
+                return parsed
+
+        with self._lock:
+            self.misses += 1
+
+        parsed = parse(config_text)
+        self._remember(key, parsed)
+        if self.cache_dir:
+            self._store(key, parsed)
+        return parsed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+
+PARSE_CACHE = ParseCache(
+    max_entries=int(os.getenv("NETDOC_PARSE_CACHE_SIZE", "128")),
+    cache_dir=os.getenv("NETDOC_PARSE_CACHE_DIR") or None,
+)
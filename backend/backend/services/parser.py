@@ -2,11 +2,52 @@
 # NetDoc AI — Multi-Vendor Configuration Parser
 # ====================================================================
 
+import functools
+import ipaddress
 import re
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
+from .config_tree import iter_stanzas
 
-def parse_config(config_text: str) -> Dict:
+# Bump whenever parser output changes so cached parses are invalidated.
+PARSER_VERSION = "3"
+
+# description / IP lines inside an interface block; the mask is either
+# dotted ("255.255.255.252") or a "/30" suffix
+INT_FIELDS_RE = re.compile(
+    r"\n[ \t]+(?:description[ \t]+(.*)|ip address[ \t]+(\d+\.\d+\.\d+\.\d+)"
+    r"(?:[ \t]+(\d+\.\d+\.\d+\.\d+)|/(\d{1,2}))?)",
+    re.IGNORECASE,
+)
+VLAN_RE = re.compile(r"vlan (\d+)")
+
+
+@functools.lru_cache(maxsize=256)
+def prefix_length(mask: str, length: str = "") -> Optional[int]:
+    """Prefix length of a dotted mask or "/nn" suffix; None if invalid."""
+    if length:
+        n = int(length)
+        return n if n <= 32 else None
+    if not mask:
+        return None
+    try:
+        return ipaddress.IPv4Network(f"0.0.0.0/{mask}").prefixlen
+    except ValueError:
+        return None
+
+
+def iter_config_lines(fileobj, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Decode an uploaded (binary) file line by line so large uploads are
+    never read into one string.
+    """
+    for line in fileobj:
+        if isinstance(line, bytes):
+            line = line.decode(encoding, errors="ignore")
+        yield line
+
+
+def parse_config(config_text: Union[str, Iterable[str]]) -> Dict:
     """
     Generic parser that extracts:
     - hostname
@@ -15,51 +56,48 @@ def parse_config(config_text: str) -> Dict:
     - VLANs
     - OSPF/BGP hints
     - neighbor relationships (basic)
-    """
 
-    lines = config_text.splitlines()
+    Accepts the full text or any iterable of lines (see iter_config_lines).
+    """
 
     hostname = "Unknown"
     interfaces = []
     vlans = []
-    current_int = None
 
-    for raw in lines:
-        line = raw.strip().lower()
+    for stanza in iter_stanzas(config_text):
+        kw = stanza.keyword
 
         # -------------------------
         # HOSTNAME
         # -------------------------
-        if line.startswith("hostname"):
-            hostname = raw.split()[1]
+        if kw == "hostname":
+            args = stanza.args.split()
+            if args:
+                hostname = args[0]
 
         # -------------------------
-        # INTERFACE START
+        # INTERFACE (+ description / IP address)
         # -------------------------
-        if raw.lower().startswith("interface"):
-            current_int = {"name": raw.split()[1], "ip": None, "desc": None}
-            interfaces.append(current_int)
-            continue
+        elif kw == "interface":
+            args = stanza.args.split()
+            current_int = {"name": args[0] if args else "", "ip": None, "prefixlen": None, "desc": None}
 
-        # -------------------------
-        # DESCRIPTION
-        # -------------------------
-        if "description" in line and current_int:
-            current_int["desc"] = raw.split("description")[-1].strip()
+            for desc, ip, mask, length in INT_FIELDS_RE.findall(stanza.body):
+                if ip:
+                    current_int["ip"] = ip
+                    current_int["prefixlen"] = prefix_length(mask, length)
+                else:
+                    current_int["desc"] = desc.strip()
 
-        # -------------------------
-        # IP ADDRESS
-        # -------------------------
-        match_ip = re.search(r"ip address (\d+\.\d+\.\d+\.\d+)", line)
-        if match_ip and current_int:
-            current_int["ip"] = match_ip.group(1)
+            interfaces.append(current_int)
 
         # -------------------------
         # VLAN
         # -------------------------
-        match_vlan = re.match(r"vlan (\d+)", line)
-        if match_vlan:
-            vlans.append(int(match_vlan.group(1)))
+        elif kw == "vlan":
+            match_vlan = VLAN_RE.match(stanza.text.lower())
+            if match_vlan:
+                vlans.append(int(match_vlan.group(1)))
 
     return {
         "hostname": hostname,
@@ -0,0 +1,435 @@
+# ====================================================================
+# NetDoc AI — Rule Engine (declarative, versioned rule packs)
+# ====================================================================
+#
+#  A rule pack is a JSON (or, with PyYAML installed, YAML) file:
+#
+#    {
+#      "name": "netdoc-api",
+#      "version": "1.0.0",
+#      "max_score": 100,
+#      "rules": [
+#        {
+#          "id": "API-003",
+#          "title": "Telnet enabled",
+#          "pattern": "telnet",            substring, or a regex with "type": "regex"
+#          "scope": "global",              where the pattern is looked for
+#          "expect": "absent",             absent | present | info
+#          "unless": ["transport input ssh"],  patterns that suppress the finding
+#          "severity": "high",             info | low | medium | high | critical
+#          "weight": 25,                   added to risk_score when the rule fires
+#          "remediation": "Disable Telnet and enforce SSH",
+#          "key": "uses_telnet",           optional boolean in the audit output
+#          "report": "match",              key reports the match (default) or "finding"
+#          "tags": ["management"]
+#        }
+#      ]
+#    }
+#
+#  Patterns are matched case-insensitively (regexes run over the
+#  lower-cased config, with MULTILINE and CRLF line ends turned into
+#  LF, so `$` anchors work on Windows exports). A pack is compiled once into a
+#  single MultiMatcher and cached until its file changes, so adding
+#  rules does not add passes over the config.
+# ====================================================================
+
+from typing import Dict, Iterable, List, Optional, Set
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from .ir import ConfigInput, as_parsed
+from .matcher import MultiMatcher
+
+try:
+    import yaml
+except ImportError:  # YAML packs are optional
+    yaml = None
+
+RULE_PACK_DIR = os.getenv("NETDOC_RULE_PACK_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rule_packs"
+)
+
+SEVERITIES = ("info", "low", "medium", "high", "critical")
+EXPECTS = ("absent", "present", "info")
+SCOPES = ("global",)
+REPORTS = ("match", "finding")
+
+
+class RulePackError(ValueError):
+    """A rule pack could not be read or is invalid."""
+
+
+class Rule:
+    __slots__ = (
+        "id", "title", "pattern", "type", "scope", "expect", "unless",
+        "severity", "weight", "remediation", "key", "report", "tags", "_profile",
+    )
+
+    def __init__(self, data: Dict[str, object], pack: str = "?") -> None:
+        def fail(msg: str) -> RulePackError:
+            return RulePackError(f"{pack}: rule {data.get('id', '?')}: {msg}")
+
+        try:
+            self.id = str(data["id"])
+            self.pattern = str(data["pattern"])
+        except KeyError as e:
+            raise fail(f"missing {e.args[0]!r}") from None
+
+        self.title = str(data.get("title") or self.id)
+        self.type = str(data.get("type", "literal"))
+        self.scope = str(data.get("scope", "global"))
+        self.expect = str(data.get("expect", "absent"))
+        self.unless = [str(u) for u in data.get("unless", ())]
+        self.severity = str(data.get("severity", "medium"))
+        self.weight = data.get("weight", 0)
+        self.remediation = data.get("remediation") or None
+        self.key = data.get("key") or None
+        self.report = str(data.get("report", "match"))
+        self.tags = tuple(data.get("tags", ()))
+        self._profile = None  # compiled patterns, built by the first profile()
+
+        if self.type not in ("literal", "regex"):
+            raise fail(f"unknown type {self.type!r}")
+        if self.scope not in SCOPES:
+            raise fail(f"unknown scope {self.scope!r}")
+        if self.expect not in EXPECTS:
+            raise fail(f"unknown expect {self.expect!r}")
+        if self.severity not in SEVERITIES:
+            raise fail(f"unknown severity {self.severity!r}")
+        if self.report not in REPORTS:
+            raise fail(f"unknown report {self.report!r}")
+        if isinstance(self.weight, bool) or not isinstance(self.weight, (int, float)):
+            raise fail(f"weight must be a number, not {self.weight!r}")
+        if self.type == "regex":
+            try:
+                re.compile(self.pattern)
+            except re.error as e:
+                raise fail(f"bad regex: {e}") from None
+
+    def check(self):
+        """The pattern in the form MultiMatcher takes."""
+        if self.type == "regex":
+            return re.compile(self.pattern, re.MULTILINE)
+        return self.pattern.lower()
+
+    def fires(self, present: bool, suppressed: bool) -> bool:
+        if self.expect == "info":
+            return False
+        hit = present if self.expect == "absent" else not present
+        return hit and not suppressed
+
+    def finding(self) -> Dict[str, object]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "severity": self.severity,
+            "weight": self.weight,
+            "remediation": self.remediation,
+            "tags": list(self.tags),
+        }
+
+
+class RuleResult:
+    """Outcome of one pack over one config."""
+
+    __slots__ = ("pack", "checks", "findings", "risk_score", "recommendations")
+
+    def __init__(self, pack: "RulePack", checks, findings, risk_score, recommendations) -> None:
+        self.pack = pack
+        self.checks: Dict[str, bool] = checks
+        self.findings: List[Dict[str, object]] = findings
+        self.risk_score = risk_score
+        self.recommendations: List[str] = recommendations
+
+    def fired(self, rule_id: str) -> bool:
+        return any(f["id"] == rule_id for f in self.findings)
+
+    def message(self, rule_id: str, ok: str = "OK") -> str:
+        """Title of the rule if it fired, `ok` otherwise."""
+        for f in self.findings:
+            if f["id"] == rule_id:
+                return f["title"]
+        return ok
+
+    def messages(self, tag: str) -> List[str]:
+        """Titles of every fired rule carrying `tag`, in pack order."""
+        return [f["title"] for f in self.findings if tag in f["tags"]]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "rule_pack": self.pack.tag,
+            "checks": dict(self.checks),
+            "findings": list(self.findings),
+            "risk_score": self.risk_score,
+            "recommendations": list(self.recommendations),
+        }
+
+
+def _lf(text: str) -> str:
+    """
+    Drop the CRs of Windows-exported (CRLF) configs, so rules anchored
+    with `$` match them like LF configs.
+    """
+    return text.replace("\r", "") if "\r" in text else text
+
+
+class RulePack:
+    """
+    A loaded, compiled rule pack. Every rule pattern and `unless`
+    pattern becomes one entry of a single MultiMatcher.
+    """
+
+    def __init__(self, data: Dict[str, object], source: Optional[str] = None, digest: Optional[str] = None) -> None:
+        if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+            raise RulePackError(f"{source or 'rule pack'}: expected an object with a 'rules' list")
+
+        self.name = str(data.get("name") or os.path.splitext(os.path.basename(source or "pack"))[0])
+        self.version = str(data.get("version", "0"))
+        self.description = str(data.get("description", ""))
+        self.max_score = data.get("max_score", 100)
+        self.source = source
+        self.digest = digest or hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        self.rules: List[Rule] = [Rule(r, self.name) for r in data["rules"]]
+        ids = [r.id for r in self.rules]
+        if len(ids) != len(set(ids)):
+            dupes = sorted({i for i in ids if ids.count(i) > 1})
+            raise RulePackError(f"{self.name}: duplicate rule ids {dupes}")
+
+        checks = {}
+        for rule in self.rules:
+            checks[rule.id] = rule.check()
+            for n, pattern in enumerate(rule.unless):
+                checks[f"{rule.id}:unless:{n}"] = pattern.lower()
+        self.matcher = MultiMatcher(checks)
+
+    @property
+    def tag(self) -> str:
+        """Identifies the exact rules applied: name@version+content hash."""
+        return f"{self.name}@{self.version}+{self.digest[:12]}"
+
+    def result(self, found: Set[str]) -> RuleResult:
+        """Build the result from the set of matched check names."""
+        checks: Dict[str, bool] = {}
+        findings: List[Dict[str, object]] = []
+        recommendations: List[str] = []
+        score = 0
+
+        for rule in self.rules:
+            present = rule.id in found
+            suppressed = any(f"{rule.id}:unless:{n}" in found for n in range(len(rule.unless)))
+            fired = rule.fires(present, suppressed)
+
+            if rule.key:
+                checks[rule.key] = fired if rule.report == "finding" else present
+            if fired:
+                findings.append(rule.finding())
+                score += rule.weight
+                if rule.remediation and rule.remediation not in recommendations:
+                    recommendations.append(rule.remediation)
+
+        score = max(0, min(self.max_score, score))
+        if isinstance(score, float):
+            score = round(score, 1)
+        return RuleResult(self, checks, findings, score, recommendations)
+
+    def evaluate(self, config: ConfigInput) -> RuleResult:
+        """One pass of the pack's matcher over the lower-cased config."""
+        return self.result(self.matcher.scan(_lf(as_parsed(config).lower)))
+
+    def profile(self, config: ConfigInput) -> Dict[str, object]:
+        """
+        What each rule costs. evaluate() checks all rules in one pass and
+        cannot attribute time, so here every rule's pattern (with its
+        unless patterns) runs on its own over the config, counting every
+        match (`condition_hits`: unless patterns found). `total_ms` is a
+        normal evaluate(). Rules come most expensive first; totals go to
+        RULE_STATS.
+        """
+        cfg = as_parsed(config)
+        t0 = time.perf_counter()
+        self.evaluate(cfg)
+        total = time.perf_counter() - t0
+
+        text = _lf(cfg.lower)
+        rows = []
+        for rule in self.rules:
+            cost = [0.0, 0, 0, 0]
+            _time_rule(rule, text, cost)
+            rows.append({
+                "id": rule.id,
+                "ms": round(cost[0] * 1000, 3),
+                "matches": cost[1],
+                "bytes": cost[2],
+                "condition_hits": cost[3],
+            })
+        rows.sort(key=lambda r: r["ms"], reverse=True)
+        RULE_STATS.record(self.name, rows)
+        return {
+            "pack": self.tag,
+            "total_ms": round(total * 1000, 3),
+            "bytes": len(text),
+            "rules": rows,
+        }
+
+    def __repr__(self) -> str:
+        return f"RulePack({self.tag!r}, rules={len(self.rules)})"
+
+
+# ---------------------------------------------------------------
+# PROFILING
+# ---------------------------------------------------------------
+def _time_rule(rule: Rule, text: str, cost: list) -> None:
+    """
+    Run one rule's patterns over `text`, adding to [seconds, matches,
+    bytes, condition hits]; condition hits count the rule's unless /
+    where patterns found in `text`.
+    """
+    if rule._profile is None:
+        rule._profile = (rule.check(), [p.lower() for p in rule.unless])
+    check, others = rule._profile
+
+    t0 = time.perf_counter()
+    if isinstance(check, str):
+        matches = text.count(check)
+    else:
+        matches = sum(1 for _ in check.finditer(text))
+    conditions = sum(other in text for other in others)
+    cost[0] += time.perf_counter() - t0
+    cost[1] += matches
+    cost[2] += len(text)
+    cost[3] += conditions
+
+
+class RuleStats:
+    """
+    Per-rule totals over every profiled audit in this process: runs,
+    time, matches and bytes scanned, keyed by (pack name, rule id).
+    """
+
+    def __init__(self) -> None:
+        self._rules: Dict[tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, pack: str, rows: Iterable[Dict[str, object]]) -> None:
+        with self._lock:
+            for row in rows:
+                total = self._rules.setdefault((pack, row["id"]), [0, 0.0, 0, 0])
+                total[0] += 1
+                total[1] += row["ms"]
+                total[2] += row["matches"]
+                total[3] += row["bytes"]
+
+    def top(self, n: Optional[int] = 20, pack: Optional[str] = None) -> List[Dict[str, object]]:
+        """The most expensive rules by total time."""
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._rules.items() if pack is None or k[0] == pack]
+        rows = [
+            {
+                "pack": name,
+                "id": rule_id,
+                "runs": runs,
+                "total_ms": round(ms, 3),
+                "mean_ms": round(ms / runs, 3),
+                "matches": matches,
+                "bytes": size,
+            }
+            for (name, rule_id), (runs, ms, matches, size) in items
+        ]
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows if n is None else rows[:n]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rules.clear()
+
+
+RULE_STATS = RuleStats()
+
+
+def rule_stats(n: Optional[int] = 20, pack: Optional[str] = None) -> List[Dict[str, object]]:
+    return RULE_STATS.top(n, pack)
+
+
+# ---------------------------------------------------------------
+# LOADING (compiled once, reloaded when the file changes)
+# ---------------------------------------------------------------
+_PACKS: Dict[str, tuple] = {}   # path -> (mtime_ns, RulePack)
+_PACKS_LOCK = threading.Lock()
+
+
+def _resolve(name_or_path: str, pack_dir: str) -> str:
+    if os.path.sep in name_or_path or os.path.splitext(name_or_path)[1]:
+        return os.path.abspath(name_or_path)
+    for ext in (".json", ".yaml", ".yml"):
+        path = os.path.join(pack_dir, name_or_path + ext)
+        if os.path.exists(path):
+            return os.path.abspath(path)
+    raise RulePackError(f"rule pack {name_or_path!r} not found in {pack_dir}")
+
+
+def _read(path: str) -> RulePack:
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        raise RulePackError(f"cannot read rule pack {path}: {e}") from None
+
+    if path.endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise RulePackError(f"{path}: YAML rule packs need PyYAML")
+        try:
+            data = yaml.safe_load(raw)
+        except yaml.YAMLError as e:
+            raise RulePackError(f"{path}: {e}") from None
+    else:
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise RulePackError(f"{path}: {e}") from None
+
+    return RulePack(data, source=path, digest=hashlib.sha256(raw).hexdigest())
+
+
+def load_rule_pack(name_or_path: str, pack_dir: str = RULE_PACK_DIR) -> RulePack:
+    """
+    Load a pack by name (looked up in `pack_dir`) or path. Compiled
+    packs are shared across requests and only rebuilt when the file's
+    mtime changes.
+    """
+    path = _resolve(name_or_path, pack_dir)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError as e:
+        raise RulePackError(f"cannot read rule pack {path}: {e}") from None
+
+    with _PACKS_LOCK:
+        cached = _PACKS.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    pack = _read(path)
+    with _PACKS_LOCK:
+        _PACKS[path] = (mtime, pack)
+    return pack
+
+
+def list_rule_packs(pack_dir: str = RULE_PACK_DIR) -> List[str]:
+    try:
+        names = os.listdir(pack_dir)
+    except OSError:
+        return []
+    return sorted(
+        os.path.splitext(n)[0] for n in names if n.endswith((".json", ".yaml", ".yml"))
+    )
+
+
+def run_rule_pack(config: ConfigInput, pack: str = "netdoc-api") -> Dict[str, object]:
+    """Evaluate one pack and return its result as a plain dict."""
+    return load_rule_pack(pack).evaluate(config).to_dict()
@@ -2,52 +2,41 @@
 # NetDoc AI — Topology Builder Engine (Mermaid v2)
 # ====================================================================
 
-from typing import Dict, List
-from .parser import parse_config
+from typing import Dict, Iterable, Union
+from .ir import ParsedConfig, as_parsed
+from .parser import PARSER_VERSION, parse_config
+from .topology_graph import MEDIA_TYPES, Rendered, RenderCache, device_links, etag_of, node_id, to_mermaid
 
+# rendered topologies of single configs, keyed like the parse cache
+TOPOLOGY_RENDERS = RenderCache()
 
-def _network_node(ip: str) -> str:
-    """Convert IP into a simple network node like NET_10_20"""
-    parts = ip.split(".")
-    if len(parts) >= 2:
-        return f"NET_{parts[0]}_{parts[1]}"
-    return "NET_UNKNOWN"
-
-
-def generate_topology(config_text: str) -> str:
-    parsed = parse_config(config_text)
 
+def mermaid_from_parsed(parsed: Dict) -> str:
     hostname = parsed["hostname"]
-    interfaces = parsed["interfaces"]
-
-    nodes = {hostname.replace("-", "_"): hostname}
+    nodes = {node_id(hostname): hostname}
     edges = []
 
-    for intf in interfaces:
-        if intf["ip"]:
-            net = _network_node(intf["ip"])
-
-            nodes.setdefault(net, net)
-            edges.append((hostname, net))
-
-        if intf["desc"]:
-            # Basic detection of lowercase neighbor names
-            desc = intf["desc"].replace(" ", "_")
-            neighbor = desc.upper()
-
-            if len(neighbor) <= 18:
-                nodes.setdefault(neighbor, neighbor)
-                edges.append((hostname, neighbor))
+    for link in device_links(parsed):
+        nodes.setdefault(node_id(link.target), link.target)
+        edges.append((hostname, link.target))
 
     # -------------------------------
     # MERMAID OUTPUT
     # -------------------------------
-    out = ["graph TD;"]
+    return to_mermaid(nodes, ((node_id(a), node_id(b)) for a, b in edges))
+
 
-    for node_id, label in nodes.items():
-        out.append(f'    {node_id}["{label}"];')
+def render_topology(config_text: Union[str, ParsedConfig]) -> Rendered:
+    """Mermaid render + ETag of one config, cached by content."""
+    cfg = as_parsed(config_text)
+    if cfg.parsed_given:
+        body = mermaid_from_parsed(cfg.parsed)
+        return Rendered(body, etag_of(body), MEDIA_TYPES["mermaid"])
+    key = f"{PARSER_VERSION}-{cfg.digest}"
+    return TOPOLOGY_RENDERS.get_or_render(key, lambda: mermaid_from_parsed(cfg.parsed))
 
-    for a, b in edges:
-        out.append(f"    {a.replace('-', '_')} --> {b.replace('-', '_')};")
 
-    return "\n".join(out)
+def generate_topology(config_text: Union[str, ParsedConfig, Iterable[str]]) -> str:
+    if isinstance(config_text, (str, ParsedConfig)):
+        return render_topology(config_text).body
+    return mermaid_from_parsed(parse_config(config_text))
@@ -0,0 +1,313 @@
+# ====================================================================
+# NetDoc AI — Fleet Topology Graph (in-memory adjacency + renders)
+# ====================================================================
+
+import hashlib
+import ipaddress
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+
+class Link(NamedTuple):
+    """One edge, owned by the device whose config produced it."""
+
+    source: str     # hostname of that device
+    target: str     # connected subnet ("10.0.0.0/30") or neighbor name
+    kind: str       # "network" | "neighbor"
+    interface: str  # local interface on `source`
+
+
+def network_node(intf: Dict) -> Optional[str]:
+    """
+    Connected subnet of an interface ("10.0.0.0/30"), from its address
+    and mask. None for host routes (/32 loopbacks) and unmasked IPs,
+    which connect nothing.
+    """
+    if not intf.get("ip") or intf.get("prefixlen") is None:
+        return None
+    try:
+        net = ipaddress.ip_network(f"{intf['ip']}/{intf['prefixlen']}", strict=False)
+    except ValueError:
+        return None
+    if net.prefixlen == net.max_prefixlen:
+        return None
+    return str(net)
+
+
+def neighbor_node(intf: Dict) -> Optional[str]:
+    """Basic detection of a neighbor name from the description."""
+    if not intf.get("desc"):
+        return None
+    neighbor = intf["desc"].replace(" ", "_").upper()
+    return neighbor if len(neighbor) <= 18 else None
+
+
+def node_id(name: str) -> str:
+    """Mermaid-safe node id for a hostname or subnet node."""
+    if "/" in name:
+        return "NET_" + re.sub(r"\W", "_", name)
+    return name.replace("-", "_")
+
+
+def device_links(parsed: Dict) -> Iterator[Link]:
+    """Links of one parse_config result, interface by interface."""
+    hostname = parsed["hostname"]
+    for intf in parsed["interfaces"]:
+        net = network_node(intf)
+        if net:
+            yield Link(hostname, net, "network", intf["name"])
+        neighbor = neighbor_node(intf)
+        if neighbor:
+            yield Link(hostname, neighbor, "neighbor", intf["name"])
+
+
+def to_mermaid(labels: Dict[str, str], edges: Iterable[Tuple[str, str]]) -> str:
+    out = ["graph TD;"]
+    for nid, label in labels.items():
+        out.append(f'    {nid}["{label}"];')
+    for a, b in edges:
+        out.append(f"    {a} --> {b};")
+    return "\n".join(out)
+
+
+# -------------------------------
+# SERIALIZED RENDERS
+# -------------------------------
+MEDIA_TYPES = {
+    "mermaid": "text/plain; charset=utf-8",
+    "json": "application/json",
+    "graphml": "application/graphml+xml",
+}
+
+
+class Rendered(NamedTuple):
+    body: str
+    etag: str        # quoted, for ETag / If-None-Match
+    media_type: str
+
+
+def etag_of(body: str) -> str:
+    return '"' + hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names `etag` (weak or strong) or is "*"."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class RenderCache:
+    """Bounded LRU of Rendered topologies by key (parser version + digest)."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Rendered]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: str, render: Callable[[], str], fmt: str = "mermaid") -> Rendered:
+        key = f"{fmt}:{key}"
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        body = render()
+        rendered = Rendered(body, etag_of(body), MEDIA_TYPES[fmt])
+        with self._lock:
+            self._entries[key] = rendered
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rendered
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# -------------------------------
+# GRAPH
+# -------------------------------
+class TopologyGraph:
+    """
+    Topology of a fleet. Links are grouped by the device that owns them,
+    so re-uploading one device replaces only its own links; `out` and
+    `inn` index targets by source and sources by target. Renders and
+    query indexes are cached until the next change bumps `version`.
+    """
+
+    def __init__(self):
+        self.devices: Dict[str, Dict[str, object]] = {}
+        self.links: Dict[str, List[Link]] = {}
+        self.out: Dict[str, Set[str]] = {}
+        self.inn: Dict[str, Set[str]] = {}
+        self.targets: Dict[str, str] = {}  # non-device node -> link kind
+        self.version = 0
+        self.lock = threading.RLock()
+        self._derived: Dict[str, Tuple[int, object]] = {}  # key -> (version, value)
+
+    def replace_device(self, hostname: str, links: Iterable[Link], **info) -> None:
+        with self.lock:
+            self._drop_links(hostname)
+            self.devices[hostname] = info
+            self.targets.pop(hostname, None)
+
+            owned = self.links[hostname] = list(links)
+            out = self.out.setdefault(hostname, set())
+            for link in owned:
+                out.add(link.target)
+                self.inn.setdefault(link.target, set()).add(hostname)
+                if link.target not in self.devices:
+                    self.targets.setdefault(link.target, link.kind)
+            self.version += 1
+
+    def remove_device(self, hostname: str) -> bool:
+        with self.lock:
+            if hostname not in self.devices:
+                return False
+            self._drop_links(hostname)
+            del self.devices[hostname]
+            if self.inn.get(hostname):
+                self.targets[hostname] = "neighbor"
+            else:
+                self._forget(hostname)
+            self.version += 1
+            return True
+
+    def _drop_links(self, hostname: str) -> None:
+        for target in self.out.pop(hostname, ()):
+            sources = self.inn.get(target)
+            if sources is not None:
+                sources.discard(hostname)
+                if not sources and target not in self.devices:
+                    self._forget(target)
+        self.links.pop(hostname, None)
+
+    def _forget(self, name: str) -> None:
+        self.inn.pop(name, None)
+        if not self.out.get(name):
+            self.out.pop(name, None)
+        self.targets.pop(name, None)
+
+    # reads -------------------------------------------------------
+    def nodes(self) -> Dict[str, str]:
+        out = dict.fromkeys(self.devices, "device")
+        out.update(self.targets)
+        return out
+
+    def neighbors(self, name: str) -> Set[str]:
+        return self.out.get(name, set()) | self.inn.get(name, set())
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        for source, links in self.links.items():
+            seen: Set[str] = set()
+            for link in links:
+                if link.target not in seen:
+                    seen.add(link.target)
+                    yield source, link.target
+
+    def to_mermaid(self) -> str:
+        labels = {node_id(n): n for n in self.nodes()}
+        if not labels:
+            return 'graph TD;\n    A["No topology information detected"];'
+        return to_mermaid(labels, ((node_id(a), node_id(b)) for a, b in self.edges()))
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "nodes": [{"id": n, "kind": k} for n, k in self.nodes().items()],
+            "adjacency": {
+                src: [[l.target, l.kind, l.interface] for l in links]
+                for src, links in self.links.items()
+            },
+        })
+
+    def to_graphml(self) -> str:
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">',
+            '  <key id="kind" for="node" attr.name="kind" attr.type="string"/>',
+            '  <key id="link" for="edge" attr.name="kind" attr.type="string"/>',
+            '  <key id="interface" for="edge" attr.name="interface" attr.type="string"/>',
+            '  <graph id="topology" edgedefault="directed">',
+        ]
+        for n, k in self.nodes().items():
+            lines.append(f'    <node id={quoteattr(n)}><data key="kind">{k}</data></node>')
+        for links in self.links.values():
+            for l in links:
+                lines.append(
+                    f"    <edge source={quoteattr(l.source)} target={quoteattr(l.target)}>"
+                    f'<data key="link">{l.kind}</data>'
+                    f'<data key="interface">{escape(l.interface or "")}</data></edge>'
+                )
+        lines += ["  </graph>", "</graphml>"]
+        return "\n".join(lines)
+
+    def render(self, fmt: str = "mermaid") -> Rendered:
+        """Serialized as "mermaid", "json" or "graphml", once per version."""
+        if fmt not in MEDIA_TYPES:
+            raise ValueError(f"unknown topology format {fmt!r}")
+
+        def build() -> Rendered:
+            body = getattr(self, f"to_{fmt}")()
+            return Rendered(body, etag_of(body), MEDIA_TYPES[fmt])
+
+        return self.cached(f"render:{fmt}", build)
+
+    def cached(self, key: str, build: Callable[[], object]):
+        """`build()`, computed once per graph version and key."""
+        with self.lock:
+            hit = self._derived.get(key)
+            if hit is not None and hit[0] == self.version:
+                return hit[1]
+            value = build()
+            self._derived[key] = (self.version, value)
+            return value
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "devices": len(self.devices),
+                "nodes": len(self.devices) + len(self.targets),
+                "edges": sum(len(t) for t in self.out.values()),
+                "version": self.version,
+            }
+
+
+# -------------------------------
+# FLEETS (named, per workspace and process)
+# -------------------------------
+_FLEETS: Dict[Tuple[int, str], TopologyGraph] = {}
+_FLEETS_LOCK = threading.Lock()
+
+
+def get_fleet(workspace_id: int, name: str, create: bool = False) -> Optional[TopologyGraph]:
+    with _FLEETS_LOCK:
+        graph = _FLEETS.get((workspace_id, name))
+        if graph is None and create:
+            graph = _FLEETS[workspace_id, name] = TopologyGraph()
+        return graph
+
+
+def add_to_fleet(workspace_id: int, name: str, parsed: Dict) -> TopologyGraph:
+    """Replace one device's links in a workspace's named fleet graph."""
+    graph = get_fleet(workspace_id, name, create=True)
+    graph.replace_device(parsed["hostname"], device_links(parsed))
+    return graph
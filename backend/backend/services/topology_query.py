@@ -0,0 +1,254 @@
+# ====================================================================
+# NetDoc AI — Topology Queries (paths, neighborhoods, failures)
+# ====================================================================
+#
+# Graph questions answered on a fleet's in-memory TopologyGraph: what is
+# between two devices, what is near one, which nodes and links are single
+# points of failure, and what loses connectivity when one of them dies.
+# The undirected adjacency index is built once per graph version.
+# ====================================================================
+
+from typing import Dict, List, Optional, Set, Tuple
+from .topology_graph import TopologyGraph
+
+Adjacency = Dict[str, Tuple[str, ...]]
+
+
+def adjacency(graph: TopologyGraph) -> Adjacency:
+    """Undirected adjacency index {node: neighbors}, cached per graph version."""
+    def build() -> Adjacency:
+        with graph.lock:
+            return {n: tuple(sorted(graph.neighbors(n))) for n in graph.nodes()}
+
+    return graph.cached("query:adjacency", build)
+
+
+def _pair(a: str, b: str) -> Tuple[str, str]:
+    return (a, b) if a < b else (b, a)
+
+
+def _multiplicity(graph: TopologyGraph) -> Dict[Tuple[str, str], int]:
+    """
+    Parallel links per node pair. A link described from both ends
+    (A names B, B names A) is one link, so the larger side counts.
+    """
+    def build() -> Dict[Tuple[str, str], int]:
+        directed: Dict[Tuple[str, str], int] = {}
+        with graph.lock:
+            for links in graph.links.values():
+                for link in links:
+                    key = (link.source, link.target)
+                    directed[key] = directed.get(key, 0) + 1
+        mult: Dict[Tuple[str, str], int] = {}
+        for (a, b), n in directed.items():
+            key = _pair(a, b)
+            mult[key] = max(mult.get(key, 0), n)
+        return mult
+
+    return graph.cached("query:multiplicity", build)
+
+
+def _require(adj: Adjacency, *names: str) -> None:
+    for name in names:
+        if name not in adj:
+            raise KeyError(name)
+
+
+# ------------------------------------------------------------
+# PATHS AND NEIGHBORHOODS
+# ------------------------------------------------------------
+def shortest_path(graph: TopologyGraph, src: str, dst: str) -> Optional[List[str]]:
+    """
+    Fewest-hop path from `src` to `dst` (both included), or None when
+    they are not connected. Bidirectional BFS: each step grows the
+    smaller frontier, so only a small part of a large fleet is visited.
+    Raises KeyError for unknown nodes.
+    """
+    adj = adjacency(graph)
+    _require(adj, src, dst)
+    if src == dst:
+        return [src]
+
+    prev = ({src: None}, {dst: None})
+    depth = ({src: 0}, {dst: 0})
+    frontiers = ([src], [dst])
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine_prev, mine_depth = prev[side], depth[side]
+        other_depth = depth[1 - side]
+
+        # finish the whole level, then keep the shortest meeting
+        best: Optional[Tuple[int, str]] = None
+        nxt: List[str] = []
+        for node in frontiers[side]:
+            d = mine_depth[node] + 1
+            for other in adj[node]:
+                if other in mine_prev:
+                    continue
+                mine_prev[other] = node
+                mine_depth[other] = d
+                nxt.append(other)
+                if other in other_depth:
+                    total = d + other_depth[other]
+                    if best is None or total < best[0]:
+                        best = (total, other)
+        if best is not None:
+            meet = best[1]
+            head: List[str] = []
+            node: Optional[str] = meet
+            while node is not None:
+                head.append(node)
+                node = prev[0][node]
+            tail: List[str] = []
+            node = prev[1][meet]
+            while node is not None:
+                tail.append(node)
+                node = prev[1][node]
+            return head[::-1] + tail
+        frontiers = (nxt, frontiers[1]) if side == 0 else (frontiers[0], nxt)
+
+    return None
+
+
+def k_hop(graph: TopologyGraph, center: str, k: int = 1, limit: Optional[int] = None) -> Dict[str, int]:
+    """
+    {node: hops} for every node within `k` hops of `center`, nearest
+    first; at most `limit` nodes. Raises KeyError for unknown nodes.
+    """
+    adj = adjacency(graph)
+    _require(adj, center)
+    hops = {center: 0}
+    frontier = [center]
+    for d in range(1, k + 1):
+        nxt: List[str] = []
+        for node in frontier:
+            for other in adj[node]:
+                if other not in hops:
+                    hops[other] = d
+                    nxt.append(other)
+                    if limit is not None and len(hops) >= limit:
+                        return hops
+        if not nxt:
+            break
+        frontier = nxt
+    return hops
+
+
+# ------------------------------------------------------------
+# COMPONENTS AND SINGLE POINTS OF FAILURE
+# ------------------------------------------------------------
+def _reach(adj: Adjacency, start: str, seen: Set[str]) -> List[str]:
+    """Nodes reachable from `start` avoiding `seen` (which it extends)."""
+    seen.add(start)
+    found = [start]
+    stack = [start]
+    while stack:
+        for other in adj[stack.pop()]:
+            if other not in seen:
+                seen.add(other)
+                found.append(other)
+                stack.append(other)
+    return found
+
+
+def connected_components(graph: TopologyGraph) -> List[List[str]]:
+    """Connected components, largest first (cached per graph version)."""
+    def build() -> List[List[str]]:
+        adj = adjacency(graph)
+        seen: Set[str] = set()
+        out = [_reach(adj, n, seen) for n in adj if n not in seen]
+        out.sort(key=len, reverse=True)
+        return out
+
+    return graph.cached("query:components", build)
+
+
+def articulation_points(graph: TopologyGraph) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    (articulation points, bridges): nodes and links whose loss splits
+    their component. Iterative Tarjan, O(nodes + links), cached per
+    graph version. A pair joined by parallel links is never a bridge.
+    """
+    def build() -> Tuple[List[str], List[Tuple[str, str]]]:
+        adj = adjacency(graph)
+        mult = _multiplicity(graph)
+        disc: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        points: Set[str] = set()
+        bridges: List[Tuple[str, str]] = []
+        clock = 0
+
+        for root in adj:
+            if root in disc:
+                continue
+            disc[root] = low[root] = clock
+            clock += 1
+            children = 0
+            stack = [(root, None, iter(adj[root]))]
+            while stack:
+                node, parent, it = stack[-1]
+                descended = False
+                for other in it:
+                    if other == parent and mult.get(_pair(node, other), 1) < 2:
+                        continue  # the tree link itself
+                    if other in disc:
+                        if disc[other] < low[node]:
+                            low[node] = disc[other]
+                        continue
+                    disc[other] = low[other] = clock
+                    clock += 1
+                    stack.append((other, node, iter(adj[other])))
+                    descended = True
+                    break
+                if descended:
+                    continue
+
+                stack.pop()
+                if parent is None:
+                    continue
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+                if low[node] > disc[parent]:
+                    bridges.append(_pair(parent, node))
+                if parent == root:
+                    children += 1
+                elif low[node] >= disc[parent]:
+                    points.add(parent)
+            if children > 1:
+                points.add(root)
+
+        return sorted(points), sorted(bridges)
+
+    return graph.cached("query:articulation", build)
+
+
+def blast_radius(graph: TopologyGraph, node: str, root: Optional[str] = None) -> Dict[str, object]:
+    """
+    What loses connectivity if `node` dies: the rest of its component
+    splits into pieces, and every node outside the piece holding `root`
+    (default: the largest piece) is cut off. Raises KeyError for
+    unknown nodes.
+    """
+    adj = adjacency(graph)
+    _require(adj, node)
+    if root is not None:
+        _require(adj, root)
+
+    seen = {node}
+    pieces = [_reach(adj, start, seen) for start in adj[node] if start not in seen]
+    if root is not None and root != node:
+        kept = next((p for p in pieces if root in p), [])
+    else:
+        kept = max(pieces, key=len, default=[])
+    if root == node:
+        kept = []
+
+    lost = sorted(n for p in pieces if p is not kept for n in p)
+    return {
+        "node": node,
+        "reachable": len(kept),
+        "lost": lost,
+        "lost_devices": [n for n in lost if n in graph.devices],
+        "pieces": len(pieces),
+    }
@@ -0,0 +1 @@
+# benchmark scripts — run with: python -m benchmarks.<name>
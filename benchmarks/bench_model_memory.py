@@ -0,0 +1,86 @@
+# ============================================================
+#  NetDoc AI — Benchmark: parsed model memory (fleet scale)
+#  python -m benchmarks.bench_model_memory --devices 2000 --ports 48
+# ============================================================
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+import argparse
+import gc
+import json
+import tracemalloc
+
+from utils.parser import Device, Interface
+
+
+# Layout used before the slotted model, kept here as the baseline.
+@dataclass
+class LegacyInterface:
+    name: str
+    ip: Optional[str] = None
+    description: Optional[str] = None
+    neighbors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class LegacyDevice:
+    hostname: str
+    vendor: str = "generic"
+    interfaces: List[LegacyInterface] = field(default_factory=list)
+
+
+def _fresh(s: str) -> str:
+    # parsed tokens are new string objects, not shared literals
+    return "".join(list(s))
+
+
+def build_fleet(device_cls, interface_cls, devices: int, ports: int) -> list:
+    fleet = []
+    for d in range(devices):
+        intfs = []
+        for p in range(ports):
+            intf = interface_cls(
+                name=_fresh(f"GigabitEthernet1/0/{p + 1}"),
+                ip=f"10.{d % 250}.{p}.1" if p < 4 else None,
+                description=f"to SW{p} uplink" if p < 2 else None,
+            )
+            if p < 2:
+                intf.neighbors = [_fresh(f"SW{p}")]
+            intfs.append(intf)
+        fleet.append(device_cls(hostname=f"SW{d}", vendor=_fresh("cisco"), interfaces=intfs))
+    return fleet
+
+
+def measure(build: Callable[[], list]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    fleet = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del fleet
+    return current
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Parsed model memory on a synthetic fleet")
+    ap.add_argument("--devices", type=int, default=2000)
+    ap.add_argument("--ports", type=int, default=48)
+    args = ap.parse_args()
+
+    legacy = measure(lambda: build_fleet(LegacyDevice, LegacyInterface, args.devices, args.ports))
+    slotted = measure(lambda: build_fleet(Device, Interface, args.devices, args.ports))
+
+    print(json.dumps({
+        "benchmark": "model_memory",
+        "devices": args.devices,
+        "ports": args.ports,
+        "legacy_bytes": legacy,
+        "slotted_bytes": slotted,
+        "reduction_pct": round(100.0 * (legacy - slotted) / legacy, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+# ============================================================
+#  NetDoc AI — Benchmark: parse / audit / topology / export
+#  python -m benchmarks.run_benchmarks --profiles small medium --output bench.json
+#  python -m benchmarks.run_benchmarks --compare bench.json
+#  python -m benchmarks.run_benchmarks --rank-rules cis-ios-l1 --corpus configs/ --budget-ms 50
+# ============================================================
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.synthetic import cisco_config, fleet_bundle, fortios_config, rule_pack
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT, "backend", "backend")
+# packs that are only benchmarked (e.g. the 63-rule CIS-style baseline),
+# not shipped with the app's rule_packs/
+PACK_DIR = os.path.join(ROOT, "benchmarks", "rule_packs")
+
+# name -> generated config text
+PROFILES: Dict[str, Callable[[], str]] = {
+    "small": lambda: cisco_config(interfaces=24, vlans=10, acl_lines=20),
+    "fortinet": lambda: fortios_config(interfaces=48, vlans=40, acl_lines=500),
+    "medium": lambda: cisco_config(interfaces=500, vlans=100, acl_lines=1000),
+    "large": lambda: cisco_config(interfaces=5000, vlans=1000, acl_lines=20000),
+    "fleet": lambda: fleet_bundle(devices=200, interfaces=48, vlans=20, acl_lines=100),
+}
+DEFAULT_PROFILES = ("small", "fortinet", "medium", "fleet")
+
+# (case name, setup run before every timed call, timed call)
+Case = Tuple[str, Optional[Callable[[], None]], Callable[[str], object]]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, timeout=10,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def build_cases() -> List[Case]:
+    import audit_engine
+    import main
+    import security_engine
+    from exports import exporter
+    from rule_engine import RulePack, load_rule_pack
+    from utils.audit_cache import AUDIT_CACHE
+    from utils.ir import ParsedConfig
+    from utils.parse_cache import PARSE_CACHE
+    from utils.parser import detect_vendor, parse_config
+    from utils.neighbors import DEFAULT_SOURCES
+    from utils.topology_graph import TopologyGraph, device_links, subnet_peers
+    from utils.topology_query import articulation_points, connected_components, shortest_path
+
+    def clear_cache() -> None:
+        PARSE_CACHE.clear()
+        AUDIT_CACHE.clear()
+        main.TOPOLOGY_RENDERS.clear()
+
+    cis_pack = load_rule_pack("cis-ios-l1", PACK_DIR)
+    big_pack = RulePack(rule_pack(rules=600))
+
+    def pipeline(text: str) -> object:
+        # the upload page: one ParsedConfig through audit, topology and export
+        cfg = ParsedConfig(text)
+        audit = main.run_security_audit(cfg)
+        topology = main.generate_topology_mermaid(cfg)
+        return main.export_all_formats(cfg, audit, topology)
+
+    def graph_queries(text: str) -> object:
+        # a fresh graph per run, so the per-version indexes are built cold
+        graph = TopologyGraph()
+        for dev in ParsedConfig(text).devices:
+            graph.replace_device(dev.hostname, device_links(dev, DEFAULT_SOURCES))
+        comps = connected_components(graph)
+        if comps and len(comps[0]) > 1:
+            shortest_path(graph, comps[0][0], comps[0][-1])
+        return articulation_points(graph)
+
+    cases: List[Case] = [
+        ("parse_config", None, parse_config),
+        ("detect_vendor", None, detect_vendor),
+        ("main.run_security_audit", clear_cache, main.run_security_audit),
+        ("main.run_security_audit[cached]", None, main.run_security_audit),
+        ("audit_engine.run_security_audit", None, audit_engine.run_security_audit),
+        ("security_engine.run_security_audit", None, lambda t: security_engine.run_security_audit({"raw": t})),
+        ("rule_engine[cis-ios-l1]", None, cis_pack.evaluate),
+        ("rule_engine[600 rules]", None, big_pack.evaluate),
+        ("main.generate_topology_mermaid", clear_cache, main.generate_topology_mermaid),
+        ("main.generate_topology_mermaid[cached]", None, main.generate_topology_mermaid),
+        ("topology_graph.subnet_peers[cached parse]", None, lambda t: list(subnet_peers(ParsedConfig(t).devices))),
+        ("topology_query[path+critical]", None, graph_queries),
+        ("main.export_all_formats", None, lambda t: main.export_all_formats(t, {"line_count": 1}, "graph TD;")),
+        ("exporter.export_all_formats", None, lambda t: exporter.export_all_formats({"raw_chars": len(t)}, "graph TD;")),
+        ("pipeline[upload_and_audit]", clear_cache, pipeline),
+    ]
+
+    # optional: PDF/DOCX exports need reportlab and python-docx
+    try:
+        import export_engine
+    except ImportError:
+        pass
+    else:
+        cases.append(("export_engine.export_all_formats", None, lambda t: export_engine.export_all_formats({"raw_chars": len(t)})))
+
+    # the FastAPI backend's engines import as top-level "services.*"
+    if BACKEND_DIR not in sys.path:
+        sys.path.append(BACKEND_DIR)
+    try:
+        from services import audit_engine as backend_audit
+        from services import topology_engine as backend_topology
+        from services.audit_cache import AUDIT_CACHE as BACKEND_AUDIT_CACHE
+        from services.parse_cache import PARSE_CACHE as BACKEND_CACHE
+    except ImportError:
+        pass
+    else:
+        def backend_clear() -> None:
+            BACKEND_CACHE.clear()
+            BACKEND_AUDIT_CACHE.clear()
+            backend_topology.TOPOLOGY_RENDERS.clear()
+
+        cases += [
+            ("backend.run_security_audit", backend_clear, backend_audit.run_security_audit),
+            ("backend.generate_topology", backend_clear, backend_topology.generate_topology),
+        ]
+
+    return cases
+
+
+def time_case(case: Case, text: str, repeat: int) -> Dict[str, float]:
+    _, setup, fn = case
+    samples: List[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn(text)
+        samples.append(time.perf_counter() - t0)
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+    }
+
+
+def run(profiles: List[str], repeat: int, only: Optional[List[str]] = None) -> Dict[str, object]:
+    cases = build_cases()
+    if only:
+        cases = [c for c in cases if any(o in c[0] for o in only)]
+
+    results = []
+    for profile in profiles:
+        text = PROFILES[profile]()
+        for case in cases:
+            row = {
+                "case": case[0],
+                "profile": profile,
+                "chars": len(text),
+                "lines": text.count("\n"),
+                "repeat": repeat,
+            }
+            row.update(time_case(case, text, repeat))
+            results.append(row)
+            print(f"{profile:>9}  {case[0]:<42} {row['median_s'] * 1000:10.3f} ms", file=sys.stderr)
+
+    return {
+        "benchmark": "pipeline",
+        "commit": _git_commit(),
+        "created": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[Dict[str, object]]:
+    """
+    Median-time ratio (current / baseline) for every case present in
+    both reports; rows above `threshold` are flagged as regressions.
+    """
+    before = {(r["case"], r["profile"]): r for r in baseline["results"]}
+    rows = []
+    for r in report["results"]:
+        old = before.get((r["case"], r["profile"]))
+        if not old or not old["median_s"]:
+            continue
+        ratio = r["median_s"] / old["median_s"]
+        rows.append({
+            "case": r["case"],
+            "profile": r["profile"],
+            "baseline_s": old["median_s"],
+            "current_s": r["median_s"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > threshold,
+        })
+    return rows
+
+
+def _corpus(profiles: List[str], corpus_dir: Optional[str]) -> List[Tuple[str, str]]:
+    """(name, config text) pairs: every file under `corpus_dir`, or the profiles."""
+    if not corpus_dir:
+        return [(p, PROFILES[p]()) for p in profiles]
+    configs = []
+    for dirpath, _, files in os.walk(corpus_dir):
+        for name in sorted(files):
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                configs.append((os.path.relpath(path, corpus_dir), f.read().decode("utf-8", errors="ignore")))
+    return configs
+
+
+def rank_rules(
+    pack_name: str,
+    configs: List[Tuple[str, str]],
+    repeat: int,
+    top: int = 20,
+) -> Dict[str, object]:
+    """
+    Profile a rule pack over a corpus and rank its most expensive rules.
+    `pack_name` is a pack name (benchmarks/rule_packs first, then the
+    app's) or path, or a number for a synthetic pack with that many rules.
+    """
+    from rule_engine import RULE_STATS, RulePack, load_rule_pack
+    from utils.ir import ParsedConfig
+
+    if pack_name.isdigit():
+        pack = RulePack(rule_pack(rules=int(pack_name)))
+    else:
+        found = os.path.join(PACK_DIR, pack_name + ".json")
+        pack = load_rule_pack(found if os.path.exists(found) else pack_name)
+
+    RULE_STATS.clear()
+    totals = []
+    for name, text in configs:
+        cfg = ParsedConfig(text)
+        runs = [pack.profile(cfg)["total_ms"] for _ in range(repeat)]
+        totals.append({"config": name, "chars": len(text), "median_ms": statistics.median(runs)})
+        print(f"{name:>24}  {pack.tag:<40} {totals[-1]['median_ms']:10.3f} ms", file=sys.stderr)
+
+    ranked = RULE_STATS.top(top, pack.name)
+    for row in ranked:
+        print(f"  {row['id']:<28} {row['mean_ms']:10.3f} ms/run  {row['matches']:>9} matches", file=sys.stderr)
+
+    return {
+        "benchmark": "rules",
+        "pack": pack.tag,
+        "rules": len(pack.rules),
+        "commit": _git_commit(),
+        "created": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "configs": totals,
+        "max_ms": max((t["median_ms"] for t in totals), default=0.0),
+        "ranking": ranked,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Time the parse / audit / topology / export pipeline")
+    ap.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=list(DEFAULT_PROFILES))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", nargs="+", help="run only cases whose name contains one of these")
+    ap.add_argument("--output", help="write the JSON report here (default: stdout)")
+    ap.add_argument("--compare", help="baseline report to compare against")
+    ap.add_argument("--threshold", type=float, default=1.25, help="ratio counted as a regression")
+    ap.add_argument("--rank-rules", metavar="PACK", help="rank a rule pack's most expensive rules (name, path or rule count)")
+    ap.add_argument("--corpus", help="directory of configs for --rank-rules (default: the profiles)")
+    ap.add_argument("--top", type=int, default=20, help="rules listed by --rank-rules")
+    ap.add_argument("--budget-ms", type=float, help="--rank-rules fails when a config's audit exceeds this")
+    args = ap.parse_args()
+
+    failed = False
+    if args.rank_rules:
+        report = rank_rules(args.rank_rules, _corpus(args.profiles, args.corpus), args.repeat, args.top)
+        if args.budget_ms is not None:
+            report["budget_ms"] = args.budget_ms
+            failed = report["max_ms"] > args.budget_ms
+    else:
+        report = run(args.profiles, args.repeat, args.only)
+
+    if args.compare and not args.rank_rules:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["baseline_commit"] = baseline.get("commit")
+        report["comparison"] = compare(report, baseline, args.threshold)
+        failed = any(r["regression"] for r in report["comparison"])
+
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# ============================================================
+#  NetDoc AI — Synthetic config generator (Cisco IOS / FortiOS)
+#  python -m benchmarks.synthetic --vendor cisco --interfaces 500 > big.cfg
+# ============================================================
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+import argparse
+import random
+import sys
+
+WEAK_SECRETS = ("cisco", "admin", "12345", "password")
+
+
+def _ip(n: int, host: int = 1) -> str:
+    return f"10.{(n >> 8) % 250}.{n % 250}.{host}"
+
+
+def cisco_config(
+    hostname: str = "CORE-SW1",
+    interfaces: int = 48,
+    vlans: int = 20,
+    acl_lines: int = 50,
+    descriptions: bool = True,
+    neighbors: int = 8,
+    seed: int = 0,
+) -> str:
+    """
+    A Cisco IOS running-config with the requested number of interfaces,
+    VLANs and ACL entries. Deterministic for a given seed. Descriptions
+    name one of `neighbors` peer switches so topology has edges to draw.
+    """
+    rnd = random.Random(seed)
+    out: List[str] = [
+        "!",
+        "version 15.2",
+        "service timestamps debug datetime msec",
+        "no service password-encryption",
+        "!",
+        f"hostname {hostname}",
+        "!",
+        f"enable secret 5 $1$abcd${rnd.getrandbits(64):x}",
+        f"username admin privilege 15 password 0 {rnd.choice(WEAK_SECRETS)}",
+        "aaa new-model",
+        "!",
+    ]
+
+    for v in range(1, vlans + 1):
+        out += [f"vlan {v * 10}", f" name VLAN_{v * 10}", "!"]
+
+    for i in range(interfaces):
+        out.append(f"interface GigabitEthernet1/0/{i + 1}")
+        if descriptions:
+            peer = f"ACC{rnd.randrange(max(neighbors, 1))}"
+            out.append(f" description to {peer} Gi0/{rnd.randrange(48)} uplink")
+        if i % 4 == 0:
+            out.append(f" ip address {_ip(i)} 255.255.255.252")
+        else:
+            out += [
+                " switchport mode access",
+                f" switchport access vlan {10 * (1 + i % max(vlans, 1))}",
+                " spanning-tree portfast",
+                " spanning-tree bpduguard enable",
+            ]
+        out += [" no shutdown", "!"]
+
+    for a in range(acl_lines):
+        action = "permit" if a % 5 else "deny"
+        out.append(
+            f"access-list {100 + a // 100} {action} tcp {_ip(a, 0)} 0.0.0.255 any eq {rnd.choice((22, 80, 443, 23))}"
+        )
+
+    out += [
+        "!",
+        "ip http server",
+        "ip http secure-server",
+        "snmp-server community public RO",
+        "logging buffered 16384",
+        "cdp run",
+        "!",
+        "line vty 0 4",
+        " transport input telnet ssh",
+        " password 0 cisco",
+        "!",
+        "end",
+    ]
+    return "\n".join(out) + "\n"
+
+
+def fortios_config(
+    hostname: str = "FGT-EDGE1",
+    interfaces: int = 24,
+    vlans: int = 10,
+    acl_lines: int = 50,
+    descriptions: bool = True,
+    neighbors: int = 8,
+    seed: int = 0,
+) -> str:
+    """
+    A FortiOS full-configuration export: system global, physical and
+    VLAN interfaces, and `acl_lines` firewall policies.
+    """
+    rnd = random.Random(seed)
+    out: List[str] = [
+        "#config-version=FGT60F-7.2.5-FW-build1517-230606:opmode=0:vdom=0",
+        "config system global",
+        f'    set hostname "{hostname}"',
+        "    set admin-sport 443",
+        "    set admintimeout 480",
+        "end",
+        "config system interface",
+    ]
+
+    def port(name: str, n: int, vlanid: Optional[int] = None) -> None:
+        out.append(f'    edit "{name}"')
+        out.append('        set vdom "root"')
+        if n % 2 == 0:
+            out.append(f"        set ip {_ip(n)} 255.255.255.0")
+        out.append("        set allowaccess ping https ssh")
+        if descriptions:
+            out.append(f'        set alias "to ACC{rnd.randrange(max(neighbors, 1))}"')
+        if vlanid is not None:
+            out.extend(['        set interface "port1"', f"        set vlanid {vlanid}"])
+        out.append("    next")
+
+    for i in range(interfaces):
+        port(f"port{i + 1}", i)
+    for v in range(vlans):
+        port(f"vlan{(v + 1) * 10}", interfaces + v, vlanid=(v + 1) * 10)
+    out.append("end")
+
+    out.append("config firewall policy")
+    for p in range(acl_lines):
+        out += [
+            f"    edit {p + 1}",
+            f'        set name "policy-{p + 1}"',
+            '        set srcintf "port1"',
+            '        set dstintf "port2"',
+            f'        set action {"accept" if p % 5 else "deny"}',
+            '        set srcaddr "all"',
+            '        set dstaddr "all"',
+            f'        set service "{rnd.choice(("HTTPS", "SSH", "ALL", "TELNET"))}"',
+            "    next",
+        ]
+    out.append("end")
+    return "\n".join(out) + "\n"
+
+
+def fleet_bundle(
+    devices: int = 10,
+    fortinet_ratio: float = 0.2,
+    banner: bool = True,
+    seed: int = 0,
+    **sizes,
+) -> str:
+    """
+    Many devices in one upload, separated by "==== NAME ====" banners
+    (or simply concatenated). `sizes` is passed to the per-vendor
+    generators (interfaces, vlans, acl_lines, descriptions, neighbors).
+    """
+    rnd = random.Random(seed)
+    parts: List[str] = []
+    for d in range(devices):
+        fortinet = rnd.random() < fortinet_ratio
+        name = f"FGT-{d:04d}" if fortinet else f"SW-{d:04d}"
+        gen = fortios_config if fortinet else cisco_config
+        if banner:
+            parts.append(f"==== {name} ====\n")
+        parts.append(gen(hostname=name, seed=seed + d, **sizes))
+    return "".join(parts)
+
+
+def rule_pack(rules: int = 600, regex_ratio: float = 0.1, seed: int = 0) -> Dict[str, object]:
+    """
+    A CIS-sized rule pack (rule_engine format) of plausible IOS
+    commands, most of which never match, for timing rule evaluation
+    against the number of rules.
+    """
+    rnd = random.Random(seed)
+    stems = (
+        "ip ssh", "ip http", "snmp-server", "logging", "ntp", "aaa", "service",
+        "spanning-tree", "ip ospf", "ip dhcp snooping", "ip arp inspection",
+        "banner", "line vty", "crypto key", "archive", "vtp",
+    )
+    severities = ("info", "low", "medium", "high", "critical")
+    out: List[Dict[str, object]] = []
+    for n in range(rules):
+        stem = rnd.choice(stems)
+        rule: Dict[str, object] = {
+            "id": f"SYN-{n:04d}",
+            "title": f"{stem} check {n}",
+            "expect": rnd.choice(("absent", "present")),
+            "severity": rnd.choice(severities),
+            "weight": rnd.randint(0, 5),
+            "remediation": f"Review '{stem}' settings ({n})",
+        }
+        if rnd.random() < regex_ratio:
+            rule["type"] = "regex"
+            rule["pattern"] = rf"^{stem} \S+ option-{n}\b"
+        else:
+            rule["pattern"] = f"{stem} option-{n}"
+        out.append(rule)
+    return {"name": "synthetic", "version": str(seed), "rules": out}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Write a synthetic config to stdout")
+    ap.add_argument("--vendor", choices=("cisco", "fortinet", "fleet"), default="cisco")
+    ap.add_argument("--devices", type=int, default=10)
+    ap.add_argument("--interfaces", type=int, default=48)
+    ap.add_argument("--vlans", type=int, default=20)
+    ap.add_argument("--acl-lines", type=int, default=50)
+    ap.add_argument("--no-descriptions", action="store_true")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    sizes = dict(
+        interfaces=args.interfaces,
+        vlans=args.vlans,
+        acl_lines=args.acl_lines,
+        descriptions=not args.no_descriptions,
+    )
+    if args.vendor == "cisco":
+        text = cisco_config(seed=args.seed, **sizes)
+    elif args.vendor == "fortinet":
+        text = fortios_config(seed=args.seed, **sizes)
+    else:
+        text = fleet_bundle(devices=args.devices, seed=args.seed, **sizes)
+    sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
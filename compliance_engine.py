@@ -0,0 +1,270 @@
+# ===============================================================
+#  NetDoc AI — Fleet Compliance (device × rule matrix)
+# ===============================================================
+#
+#  Audit outcomes of a whole fleet as one boolean matrix:
+#  failed[d, r] is True when rule r fired on device d. Pass rates,
+#  worst devices, snapshot trends and risk scores under new weights
+#  are NumPy / pandas operations over the matrix instead of loops over
+#  stored audit JSON. Snapshots are saved as packed bitsets.
+# ===============================================================
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+import json
+
+import numpy as np
+import pandas as pd
+
+from rule_engine import RulePack, RuleResult, load_rule_pack
+
+# per-device attributes the matrix can be sliced and grouped by
+INFO_COLUMNS = ("site", "vendor", "plan")
+
+Outcome = Union[RuleResult, Dict[str, object], Iterable[str]]
+
+
+def failed_rule_ids(outcome: Outcome) -> List[str]:
+    """
+    Ids of the rules that fired, from a RuleResult, an audit dict
+    (main.run_security_audit's "failed_rules", or rule_engine's
+    "findings") or a plain iterable of ids.
+    """
+    if isinstance(outcome, RuleResult):
+        return [f["id"] for f in outcome.findings]
+    if isinstance(outcome, dict):
+        if "failed_rules" in outcome:
+            return list(outcome["failed_rules"])
+        return [f["id"] for f in outcome.get("findings", ())]
+    return list(outcome)
+
+
+class ComplianceMatrix:
+    """
+    Which devices fail which rules. `info` holds per-device attributes
+    (INFO_COLUMNS, or any others) used by select() and the `by=`
+    aggregations; devices without an entry get NaN.
+    """
+
+    def __init__(
+        self,
+        failed,
+        devices: Iterable[str],
+        rules: Iterable[str],
+        weights=None,
+        max_score: float = 100,
+        info: Optional[pd.DataFrame] = None,
+        pack: Optional[str] = None,
+    ) -> None:
+        self.devices = pd.Index(list(devices), name="device")
+        self.rules = pd.Index(list(rules), name="rule")
+        self.failed = np.asarray(failed, dtype=bool).reshape(len(self.devices), len(self.rules))
+        self.weights = pd.Series(
+            0.0 if weights is None else weights, index=self.rules, dtype=float, name="weight"
+        )
+        self.max_score = max_score
+        self.pack = pack
+
+        if info is None:
+            info = pd.DataFrame(index=self.devices, columns=list(INFO_COLUMNS))
+        elif not isinstance(info, pd.DataFrame):
+            info = pd.DataFrame.from_dict(dict(info), orient="index")
+        self.info = info.reindex(self.devices)
+
+    # -----------------------------------------------------------
+    # building
+    # -----------------------------------------------------------
+    @classmethod
+    def from_results(
+        cls,
+        results: Mapping[str, Outcome],
+        pack: Union[str, RulePack] = "netdoc-core",
+        info=None,
+    ) -> "ComplianceMatrix":
+        """
+        {device: outcome} for one rule pack. Ids the pack does not know
+        (results from another pack version) are ignored.
+        """
+        if isinstance(pack, str):
+            pack = load_rule_pack(pack)
+        rules = [r.id for r in pack.rules]
+        column = {rule_id: n for n, rule_id in enumerate(rules)}
+
+        devices = list(results)
+        failed = np.zeros((len(devices), len(rules)), dtype=bool)
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, device in enumerate(devices):
+            for rule_id in failed_rule_ids(results[device]):
+                col = column.get(rule_id)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        failed[rows, cols] = True
+
+        weights = [r.weight for r in pack.rules]
+        return cls(failed, devices, rules, weights, pack.max_score, info, pack.tag)
+
+    @classmethod
+    def from_reports(
+        cls,
+        reports: Iterable[Tuple[str, str]],
+        pack: Union[str, RulePack] = "netdoc-core",
+        info=None,
+    ) -> "ComplianceMatrix":
+        """(device, AuditReport.audit_json) pairs; later pairs win."""
+        results = {device: json.loads(audit_json) for device, audit_json in reports}
+        return cls.from_results(results, pack, info)
+
+    # -----------------------------------------------------------
+    # views
+    # -----------------------------------------------------------
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.failed.shape
+
+    def frame(self) -> pd.DataFrame:
+        """The matrix as a device × rule DataFrame of booleans."""
+        return pd.DataFrame(self.failed, index=self.devices, columns=self.rules)
+
+    def select(self, devices: Optional[Iterable[str]] = None, rules: Optional[Iterable[str]] = None, **info) -> "ComplianceMatrix":
+        """
+        A sub-matrix: listed devices and/or rules, and devices whose
+        info matches every keyword (select(site="NYC", vendor="cisco");
+        a list value matches any of its items).
+        """
+        mask = np.ones(len(self.devices), dtype=bool)
+        if devices is not None:
+            mask &= self.devices.isin(list(devices))
+        for column, value in info.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= self.info[column].isin(list(values)).to_numpy()
+
+        cols = np.ones(len(self.rules), dtype=bool)
+        if rules is not None:
+            cols = self.rules.isin(list(rules))
+
+        return ComplianceMatrix(
+            self.failed[np.ix_(mask, cols)],
+            self.devices[mask],
+            self.rules[cols],
+            self.weights[cols].to_numpy(),
+            self.max_score,
+            self.info[mask],
+            self.pack,
+        )
+
+    # -----------------------------------------------------------
+    # aggregations
+    # -----------------------------------------------------------
+    def fail_counts(self) -> pd.Series:
+        """Devices failing each rule."""
+        return pd.Series(self.failed.sum(axis=0), index=self.rules, name="failing")
+
+    def pass_rates(self, by: Optional[str] = None) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Share of devices passing each rule (0–1); with `by` (an info
+        column such as "site"), one row per group.
+        """
+        if by is None:
+            if not len(self.devices):
+                return pd.Series(np.nan, index=self.rules, name="pass_rate")
+            return pd.Series(1.0 - self.failed.mean(axis=0), index=self.rules, name="pass_rate")
+        return 1.0 - self.frame().groupby(self.info[by].to_numpy(), dropna=False).mean()
+
+    def failing(self, rule_id: str) -> List[str]:
+        """Devices on which `rule_id` fired."""
+        return list(self.devices[self.failed[:, self.rules.get_loc(rule_id)]])
+
+    def risk_scores(self, weights: Optional[Mapping[str, float]] = None) -> pd.Series:
+        """
+        Every device's risk score, recomputed from the matrix: the sum of
+        the weights of its failed rules, clamped to 0..max_score. Weights
+        in `weights` override the pack's, so a re-weighting can be
+        previewed across the fleet without re-auditing.
+        """
+        w = self.weights
+        if weights:
+            w = w.copy()
+            known = [rule_id for rule_id in weights if rule_id in w.index]
+            w[known] = [weights[rule_id] for rule_id in known]
+        scores = self.failed.astype(np.float64) @ w.to_numpy()
+        return pd.Series(np.clip(scores, 0, self.max_score), index=self.devices, name="risk_score")
+
+    def worst_devices(self, n: int = 10, weights: Optional[Mapping[str, float]] = None) -> pd.DataFrame:
+        """The `n` highest-risk devices with their score and failed-rule count."""
+        out = pd.DataFrame({
+            "risk_score": self.risk_scores(weights),
+            "failed": self.failed.sum(axis=1),
+        })
+        return out.sort_values(["risk_score", "failed"], ascending=False, kind="stable").head(n)
+
+    def summary(self, by: str) -> pd.DataFrame:
+        """Devices, mean risk score and mean pass rate per info group."""
+        keys = self.info[by].to_numpy()
+        out = pd.DataFrame({
+            "risk_score": self.risk_scores().to_numpy(),
+            "pass_rate": 1.0 - self.failed.mean(axis=1) if len(self.rules) else np.nan,
+        }).groupby(keys, dropna=False)
+        result = out.mean()
+        result.insert(0, "devices", out.size())
+        return result
+
+    def trend(self, previous: "ComplianceMatrix") -> pd.DataFrame:
+        """
+        Per-rule change since an earlier snapshot, over the devices and
+        rules present in both: pass rates before/after, their delta, and
+        how many devices newly fail or were fixed.
+        """
+        devices = self.devices.intersection(previous.devices, sort=False)
+        rules = self.rules.intersection(previous.rules, sort=False)
+        now = self.failed[np.ix_(self.devices.get_indexer(devices), self.rules.get_indexer(rules))]
+        before = previous.failed[
+            np.ix_(previous.devices.get_indexer(devices), previous.rules.get_indexer(rules))
+        ]
+
+        n = max(len(devices), 1)
+        out = pd.DataFrame({
+            "pass_rate_before": 1.0 - before.sum(axis=0) / n,
+            "pass_rate": 1.0 - now.sum(axis=0) / n,
+            "newly_failing": (now & ~before).sum(axis=0),
+            "fixed": (before & ~now).sum(axis=0),
+        }, index=rules)
+        out.insert(2, "delta", out["pass_rate"] - out["pass_rate_before"])
+        return out
+
+    # -----------------------------------------------------------
+    # snapshots (packed bitset, ~1.3 MB for 10k devices × 1k rules)
+    # -----------------------------------------------------------
+    def save(self, path: str) -> None:
+        meta = {
+            "pack": self.pack,
+            "max_score": self.max_score,
+            "info": self.info.astype(object).where(self.info.notna(), None).to_dict(orient="list"),
+        }
+        np.savez_compressed(
+            path,
+            bits=np.packbits(self.failed, axis=1),
+            shape=np.array(self.failed.shape),
+            devices=np.array(self.devices, dtype=str),
+            rules=np.array(self.rules, dtype=str),
+            weights=self.weights.to_numpy(),
+            meta=np.array(json.dumps(meta)),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ComplianceMatrix":
+        with np.load(path, allow_pickle=False) as data:
+            rows, cols = data["shape"]
+            failed = np.unpackbits(data["bits"], axis=1, count=cols).astype(bool)
+            devices = data["devices"].tolist()
+            meta = json.loads(str(data["meta"]))
+            info = pd.DataFrame(meta["info"], index=devices) if devices else None
+            return cls(
+                failed, devices, data["rules"].tolist(), data["weights"],
+                meta["max_score"], info, meta["pack"],
+            )
+
+    def __repr__(self) -> str:
+        return f"ComplianceMatrix({self.pack!r}, devices={self.shape[0]}, rules={self.shape[1]})"
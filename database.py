@@ -5,7 +5,7 @@
 import os
 import datetime
 from sqlalchemy import (
-    create_engine, Column, Integer, String, DateTime,
+    create_engine, inspect, text, Column, Integer, String, DateTime,
     ForeignKey, Text
 )
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base
@@ -89,6 +89,12 @@ class Upload(Base):
     content = Column(Text)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
+    # Incremental re-parse (see utils/incremental.py)
+    hostname = Column(String, index=True, nullable=True)
+    content_sha256 = Column(String(64), index=True, nullable=True)
+    stanza_hashes = Column(Text, nullable=True)   # JSON: stanza key -> hash
+    parsed_json = Column(Text, nullable=True)     # JSON: device + per-stanza interfaces
+
     # Relationships
     user = relationship("User", back_populates="uploads")
     organization = relationship("Organization", back_populates="uploads")
@@ -108,10 +114,48 @@ class AuditReport(Base):
     audit_json = Column(Text)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
+    # Audit cache (see audit_store.py): same config + same rules = same audit
+    config_sha256 = Column(String(64), index=True, nullable=True)
+    rule_version = Column(String, index=True, nullable=True)
+
+    # Incremental audits: the upload audited and per-stanza rule hits
+    upload_id = Column(Integer, ForeignKey("uploads.id"), index=True, nullable=True)
+    stanza_hits = Column(Text, nullable=True)     # JSON: rule_engine.RuleSnapshot
+
     user = relationship("User", back_populates="audits")
     organization = relationship("Organization", back_populates="audits")
 
 
+# ===============================================================
+#  TOPOLOGY TABLES (org-wide graph, see topology_store.py)
+# ===============================================================
+class TopologyNode(Base):
+    """One device of an org's topology, from its latest upload."""
+    __tablename__ = "topology_nodes"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    org_id = Column(Integer, ForeignKey("organizations.id"), index=True)
+    name = Column(String, index=True, nullable=False)     # hostname
+    vendor = Column(String, nullable=True)
+    upload_id = Column(Integer, ForeignKey("uploads.id"), nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
+
+
+class TopologyEdge(Base):
+    """One link, owned by the device (`source`) whose config produced it."""
+    __tablename__ = "topology_edges"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    org_id = Column(Integer, ForeignKey("organizations.id"), index=True)
+    source = Column(String, index=True, nullable=False)   # owning hostname
+    target = Column(String, nullable=False)               # network node / neighbor
+    kind = Column(String, nullable=False)                 # "network" | "neighbor"
+    interface = Column(String, nullable=True)
+
+
 # ===============================================================
 #  ANNOUNCEMENTS TABLE  **(NEW)**
 # ===============================================================
@@ -163,6 +207,40 @@ class SNMPPoll(Base):
 
 
 
+# ===============================================================
+#  MIGRATIONS (columns added to existing tables)
+# ===============================================================
+# create_all only creates missing tables; it never alters one that
+# already exists. Columns added to a model after its table shipped are
+# listed here and added by add_missing_columns on startup.
+ADDED_COLUMNS = {
+    "uploads": ("hostname", "content_sha256", "stanza_hashes", "parsed_json"),
+    "audit_reports": ("config_sha256", "rule_version", "upload_id", "stanza_hits"),
+}
+
+
+def add_missing_columns(bind=engine):
+    """
+    ALTER TABLE ... ADD COLUMN (plus its index) for every ADDED_COLUMNS
+    entry the database does not have yet. Safe to run on every start.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table_name, names in ADDED_COLUMNS.items():
+            if not inspector.has_table(table_name):
+                continue
+            have = {c["name"] for c in inspector.get_columns(table_name)}
+            table = Base.metadata.tables[table_name]
+            for name in names:
+                if name in have:
+                    continue
+                column_type = table.c[name].type.compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type}"))
+                for index in table.indexes:
+                    if name in index.columns:
+                        index.create(conn, checkfirst=True)
+
+
 # ===============================================================
 #  INIT DB
 # ===============================================================
@@ -170,6 +248,7 @@ def init_db():
     print("📌 Initializing database…")
 
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
     db = SessionLocal()
 
     # Create default org if none exists
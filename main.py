@@ -9,45 +9,70 @@ import io
 import json
 import zipfile
 
-from utils.parser import parse_config, Device, Interface
+from utils.parser import PARSER_VERSION, Device
+from utils.ir import ConfigInput, as_parsed
+from utils.spool import MappedConfig
+from utils.neighbors import (
+    DiscoveryNeighbors,
+    FleetHostnames,
+    description_neighbors,
+)
+from utils.topology_graph import RenderCache, device_links, node_id, subnet_index, to_mermaid
+from utils.audit_cache import AUDIT_CACHE
+from rule_engine import load_rule_pack
 
 
 # ------------------------------------------------------------
 # SECURITY AUDIT
 # ------------------------------------------------------------
-def run_security_audit(config_text: str) -> Dict[str, object]:
+# Checks, weights and remediation live in rule_packs/netdoc-core.json;
+# the pack is compiled once and every rule is evaluated in one pass.
+AUDIT_PACK = "netdoc-core"
+
+# bump when run_security_audit changes its output for the same rules
+AUDIT_ENGINE_VERSION = "3"
+
+
+def audit_version() -> str:
+    """Cache version of the audit: engine version + exact rule pack."""
+    return f"main/{AUDIT_ENGINE_VERSION}/{load_rule_pack(AUDIT_PACK).tag}"
+
+
+def run_security_audit(config: ConfigInput, profile: bool = False) -> Dict[str, object]:
     """
-    Very lightweight static checks. You can extend this easily.
+    Very lightweight static checks. Extend them in the rule pack.
+    Accepts raw text, a ParsedConfig or a (memory-mapped) MappedConfig.
+
+    Results are cached by config SHA-256 and audit_version(), so an
+    unchanged config is not re-audited (stored uploads keep theirs as
+    AuditReports, see audit_store.audit_upload). Memory-mapped configs
+    are always audited.
+    With `profile`, the config is audited afresh and per-rule timings
+    are added under "_profile" (see RulePack.profile).
     """
-    lines = config_text.splitlines()
-
-    def has(pattern: str) -> bool:
-        p = pattern.lower()
-        return any(p in l.lower() for l in lines)
-
-    audit: Dict[str, object] = {
-        "line_count": len(lines),
-        "contains_enable_secret": has("enable secret"),
-        "contains_enable_password": has("enable password"),
-        "contains_telnet": has("telnet"),
-        "contains_http": has("ip http server"),
-        "contains_https": has("ip http secure-server"),
-        "contains_snmp": has("snmp-server"),
-        "contains_acl": has("access-list"),
-    }
+    cfg = as_parsed(config)
+    if profile:
+        audit = _audit(cfg)
+        audit["_profile"] = load_rule_pack(AUDIT_PACK).profile(cfg)
+        return audit
+    if isinstance(cfg, MappedConfig):
+        return _audit(cfg)
+    return AUDIT_CACHE.get_or_audit(cfg.digest, audit_version(), lambda: _audit(cfg))
+
+
+def _audit(cfg) -> Dict[str, object]:
+    return audit_from_result(cfg.line_count, load_rule_pack(AUDIT_PACK).evaluate(cfg))
+
+
+def audit_from_result(line_count: int, result) -> Dict[str, object]:
+    """The audit dict for a RuleResult of AUDIT_PACK."""
+    audit: Dict[str, object] = {"line_count": line_count}
+    audit.update(result.checks)
 
     # quick “risk_score” (0–100) — purely illustrative
-    penalties = 0
-    if audit["contains_telnet"]:
-        penalties += 30
-    if audit["contains_http"]:
-        penalties += 20
-    if not audit["contains_https"]:
-        penalties += 10
-    if not audit["contains_enable_secret"] and audit["contains_enable_password"]:
-        penalties += 15
-    risk_score = max(0, min(100, penalties))
-    audit["risk_score"] = risk_score
+    audit["risk_score"] = result.risk_score
+    audit["recommendations"] = result.recommendations
+    audit["failed_rules"] = [f["id"] for f in result.findings]  # fleet compliance matrix
 
     return audit
 
@@ -56,62 +81,54 @@ def run_security_audit(config_text: str) -> Dict[str, object]:
 # TOPOLOGY (MERMAID)
 # ------------------------------------------------------------
 
-def _network_node_from_ip(ip: str) -> str:
-    """
-    Convert an IP into a coarse “network node” label.
-    Example: 10.10.1.1 -> NET_10_10
-    """
-    try:
-        octets = ip.split(".")
-        return f"NET_{octets[0]}_{octets[1]}"
-    except Exception:
-        return "NET_MISC"
+# rendered graphs of single configs, keyed like the parse cache
+TOPOLOGY_RENDERS = RenderCache()
 
 
-def generate_topology_mermaid(config_text: str) -> str:
+def generate_topology_mermaid(config: ConfigInput) -> str:
     """
     Turn parsed devices into a Mermaid graph.
+    Unchanged configs are served from the render cache (keyed by the
+    text, so a ParsedConfig with devices handed in is never cached).
     """
-    devices: List[Device] = parse_config(config_text)
+    cfg = as_parsed(config)
+    if isinstance(cfg, MappedConfig) or cfg.devices_given:
+        return _topology_mermaid(cfg)
+    key = f"{PARSER_VERSION}-{cfg.digest}"
+    return TOPOLOGY_RENDERS.get_or_render(key, lambda: _topology_mermaid(cfg)).body
+
+
+def _topology_mermaid(cfg) -> str:
+    devices: List[Device] = cfg.devices
+
+    # cached devices are shared, so neighbors are resolved here instead of
+    # being written back onto the interfaces
+    sources = [description_neighbors, FleetHostnames.from_devices(devices)]
+    if cfg.contains("Device ID:") or cfg.contains("System Name:"):
+        sources.append(DiscoveryNeighbors.from_lines(cfg.iter_lines()))
+    # connected subnets of the bundle, for addresses given without a mask
+    subnets = subnet_index(devices)
 
     node_labels: Dict[str, str] = {}  # id -> label
     edges: List[Tuple[str, str]] = []
 
     # ----- build nodes & edges -----
     for dev in devices:
-        dev_id = dev.hostname.replace("-", "_")
+        dev_id = node_id(dev.hostname)
         node_labels[dev_id] = dev.hostname
 
-        for intf in dev.interfaces:
-            # Network node based on IP
-            if intf.ip:
-                net_id = _network_node_from_ip(intf.ip)
-                node_labels.setdefault(net_id, net_id)
-                edges.append((dev_id, net_id))
-
-            # Neighbor-based link
-            for n in intf.neighbors:
-                neigh_id = n.replace("-", "_")
-                # we don't know if neighbor exists as full device, but it is ok
-                node_labels.setdefault(neigh_id, n)
-                edges.append((dev_id, neigh_id))
+        # connected subnet per IP, then neighbor-based links; we don't
+        # know if a neighbor exists as full device, but it is ok
+        for link in device_links(dev, sources, subnets):
+            target = node_id(link.target)
+            node_labels.setdefault(target, link.target)
+            edges.append((dev_id, target))
 
     # If parsing failed and we have nothing, return simple stub
     if not node_labels:
         return "graph TD;\n    A[\"No topology information detected\"];"
 
-    # ----- build Mermaid syntax -----
-    lines: List[str] = ["graph TD;"]
-
-    # nodes
-    for node_id, label in node_labels.items():
-        lines.append(f'    {node_id}["{label}"];')
-
-    # edges
-    for a, b in edges:
-        lines.append(f"    {a} --> {b};")
-
-    return "\n".join(lines)
+    return to_mermaid(node_labels, edges)
 
 
 # ------------------------------------------------------------
@@ -119,7 +136,7 @@ def generate_topology_mermaid(config_text: str) -> str:
 # ------------------------------------------------------------
 
 def export_all_formats(
-    config_text: str, audit: Dict[str, object], topology: str
+    config: ConfigInput, audit: Dict[str, object], topology: str
 ) -> bytes:
     """
     Create an in-memory ZIP with:
@@ -129,9 +146,13 @@ def export_all_formats(
     You can wire this to a Streamlit download button.
     """
     mem = io.BytesIO()
+    cfg = as_parsed(config)
 
     with zipfile.ZipFile(mem, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr("config.txt", config_text)
+        if isinstance(cfg, MappedConfig):
+            zf.write(cfg.path, "config.txt")  # streamed from the spool file
+        else:
+            zf.writestr("config.txt", cfg.raw)
         zf.writestr("audit.json", json.dumps(audit, indent=2))
         zf.writestr("topology.mmd", topology)
 
@@ -0,0 +1,697 @@
+# ===============================================================
+#  NetDoc AI — Rule Engine (declarative, versioned rule packs)
+# ===============================================================
+#
+#  A rule pack is a JSON (or, with PyYAML installed, YAML) file:
+#
+#    {
+#      "name": "netdoc-core",
+#      "version": "1.0.0",
+#      "max_score": 100,
+#      "rules": [
+#        {
+#          "id": "CORE-003",
+#          "title": "Telnet enabled",
+#          "pattern": "telnet",            substring, or a regex with "type": "regex"
+#          "scope": "global",              where the pattern is looked for
+#          "where": [],                    scoped rules: patterns a stanza needs to be checked
+#          "expect": "absent",             absent | present | info
+#          "unless": ["transport input ssh"],  patterns that suppress the finding
+#          "severity": "high",             info | low | medium | high | critical
+#          "weight": 30,                   added to risk_score when the rule fires
+#          "remediation": "Disable Telnet and enforce SSH",
+#          "key": "contains_telnet",       optional boolean in the audit output
+#          "report": "match",              key reports the match (default) or "finding"
+#          "tags": ["management"]
+#        }
+#      ]
+#    }
+#
+#  Patterns are matched case-insensitively (regexes run over the
+#  lower-cased config, with MULTILINE and CRLF line ends turned into
+#  LF, so `$` anchors work on Windows exports). A pack is compiled once into a
+#  single MultiMatcher and cached until its file changes, so adding
+#  rules does not add passes over the config.
+#
+#  A scope other than "global" names top-level stanzas: "interface",
+#  "line vty", "snmp-server", "interface gigabitethernet1/0/*". Such a
+#  rule is checked in every matching stanza (header plus body) that
+#  contains all of its `where` patterns, using the config's stanza
+#  index, so it costs only the stanzas it targets. Its finding lists
+#  the offending stanzas with line numbers:
+#
+#    {"scope": "interface", "where": ["switchport mode access"],
+#     "pattern": "spanning-tree bpduguard enable", "expect": "present"}
+#    -> "locations": [{"stanza": "interface Gi1/0/7", "line": 212}]
+# ===============================================================
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from utils.config_tree import STANZA_RE, StanzaIndex, in_scope
+from utils.incremental import iter_keyed_stanzas, stanza_hash
+from utils.ir import ConfigInput, as_parsed
+from utils.matcher import MultiMatcher
+
+try:
+    import yaml
+except ImportError:  # YAML packs are optional
+    yaml = None
+
+RULE_PACK_DIR = os.getenv("NETDOC_RULE_PACK_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "rule_packs"
+)
+
+SEVERITIES = ("info", "low", "medium", "high", "critical")
+EXPECTS = ("absent", "present", "info")
+REPORTS = ("match", "finding")
+
+
+class RulePackError(ValueError):
+    """A rule pack could not be read or is invalid."""
+
+
+class Rule:
+    __slots__ = (
+        "id", "title", "pattern", "type", "scope", "where", "expect", "unless",
+        "severity", "weight", "remediation", "key", "report", "tags", "_profile",
+    )
+
+    def __init__(self, data: Dict[str, object], pack: str = "?") -> None:
+        def fail(msg: str) -> RulePackError:
+            return RulePackError(f"{pack}: rule {data.get('id', '?')}: {msg}")
+
+        try:
+            self.id = str(data["id"])
+            self.pattern = str(data["pattern"])
+        except KeyError as e:
+            raise fail(f"missing {e.args[0]!r}") from None
+
+        self.title = str(data.get("title") or self.id)
+        self.type = str(data.get("type", "literal"))
+        self.scope = " ".join(str(data.get("scope", "global")).lower().split())
+        self.where = [str(w) for w in data.get("where", ())]
+        self.expect = str(data.get("expect", "absent"))
+        self.unless = [str(u) for u in data.get("unless", ())]
+        self.severity = str(data.get("severity", "medium"))
+        self.weight = data.get("weight", 0)
+        self.remediation = data.get("remediation") or None
+        self.key = data.get("key") or None
+        self.report = str(data.get("report", "match"))
+        self.tags = tuple(data.get("tags", ()))
+        self._profile = None  # compiled patterns, built by the first profile()
+
+        if self.type not in ("literal", "regex"):
+            raise fail(f"unknown type {self.type!r}")
+        if not self.scope or any(c in self.scope.split(" ")[0] for c in "*?["):
+            raise fail(f"bad scope {self.scope!r}: must start with a stanza keyword")
+        if self.where and not self.scoped:
+            raise fail("'where' needs a stanza scope")
+        if self.expect not in EXPECTS:
+            raise fail(f"unknown expect {self.expect!r}")
+        if self.severity not in SEVERITIES:
+            raise fail(f"unknown severity {self.severity!r}")
+        if self.report not in REPORTS:
+            raise fail(f"unknown report {self.report!r}")
+        if isinstance(self.weight, bool) or not isinstance(self.weight, (int, float)):
+            raise fail(f"weight must be a number, not {self.weight!r}")
+        if self.type == "regex":
+            try:
+                re.compile(self.pattern)
+            except re.error as e:
+                raise fail(f"bad regex: {e}") from None
+
+    @property
+    def scoped(self) -> bool:
+        return self.scope != "global"
+
+    @property
+    def keyword(self) -> str:
+        """First word of the scope: the stanza index group it reads."""
+        return self.scope.split(" ", 1)[0]
+
+    def check(self):
+        """The pattern in the form MultiMatcher takes."""
+        if self.type == "regex":
+            return re.compile(self.pattern, re.MULTILINE)
+        return self.pattern.lower()
+
+    def fires(self, present: bool, suppressed: bool) -> bool:
+        if self.expect == "info":
+            return False
+        hit = present if self.expect == "absent" else not present
+        return hit and not suppressed
+
+    def locate(self, text: str, check) -> int:
+        """Offset of the pattern in a (lower-cased) stanza, or 0."""
+        if isinstance(check, str):
+            return max(text.find(check), 0)
+        m = check.search(text)
+        return m.start() if m else 0
+
+    def finding(self) -> Dict[str, object]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "severity": self.severity,
+            "weight": self.weight,
+            "remediation": self.remediation,
+            "tags": list(self.tags),
+        }
+
+
+class RuleResult:
+    """Outcome of one pack over one config."""
+
+    __slots__ = ("pack", "checks", "findings", "risk_score", "recommendations")
+
+    def __init__(self, pack: "RulePack", checks, findings, risk_score, recommendations) -> None:
+        self.pack = pack
+        self.checks: Dict[str, bool] = checks
+        self.findings: List[Dict[str, object]] = findings
+        self.risk_score = risk_score
+        self.recommendations: List[str] = recommendations
+
+    def fired(self, rule_id: str) -> bool:
+        return any(f["id"] == rule_id for f in self.findings)
+
+    def message(self, rule_id: str, ok: str = "OK") -> str:
+        """Title of the rule if it fired, `ok` otherwise."""
+        for f in self.findings:
+            if f["id"] == rule_id:
+                return f["title"]
+        return ok
+
+    def messages(self, tag: str) -> List[str]:
+        """Titles of every fired rule carrying `tag`, in pack order."""
+        return [f["title"] for f in self.findings if tag in f["tags"]]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "rule_pack": self.pack.tag,
+            "checks": dict(self.checks),
+            "findings": list(self.findings),
+            "risk_score": self.risk_score,
+            "recommendations": list(self.recommendations),
+        }
+
+
+def _lf(text: str) -> str:
+    """
+    Drop the CRs of Windows-exported (CRLF) configs, so rules anchored
+    with `$` match them like LF configs.
+    """
+    return text.replace("\r", "") if "\r" in text else text
+
+
+class RulePack:
+    """
+    A loaded, compiled rule pack. Every rule pattern and `unless`
+    pattern becomes one entry of a single MultiMatcher.
+    """
+
+    def __init__(self, data: Dict[str, object], source: Optional[str] = None, digest: Optional[str] = None) -> None:
+        if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+            raise RulePackError(f"{source or 'rule pack'}: expected an object with a 'rules' list")
+
+        self.name = str(data.get("name") or os.path.splitext(os.path.basename(source or "pack"))[0])
+        self.version = str(data.get("version", "0"))
+        self.description = str(data.get("description", ""))
+        self.max_score = data.get("max_score", 100)
+        self.source = source
+        self.digest = digest or hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        self.rules: List[Rule] = [Rule(r, self.name) for r in data["rules"]]
+        ids = [r.id for r in self.rules]
+        if len(ids) != len(set(ids)):
+            dupes = sorted({i for i in ids if ids.count(i) > 1})
+            raise RulePackError(f"{self.name}: duplicate rule ids {dupes}")
+
+        # one matcher for the global rules, one per scope for the others
+        checks: Dict[str, Dict[str, object]] = {}
+        for rule in self.rules:
+            group = checks.setdefault(rule.scope, {})
+            group[rule.id] = rule.check()
+            for n, pattern in enumerate(rule.unless):
+                group[f"{rule.id}:unless:{n}"] = pattern.lower()
+            for n, pattern in enumerate(rule.where):
+                group[f"{rule.id}:where:{n}"] = pattern.lower()
+        self.matcher = MultiMatcher(checks.pop("global", {}))
+        self.scope_matchers: Dict[str, tuple] = {
+            scope: (MultiMatcher(group), [r for r in self.rules if r.scope == scope], group)
+            for scope, group in checks.items()
+        }
+
+    @property
+    def tag(self) -> str:
+        """Identifies the exact rules applied: name@version+content hash."""
+        return f"{self.name}@{self.version}+{self.digest[:12]}"
+
+    def result(
+        self, found: Set[str], located: Optional[Dict[str, List[Dict[str, object]]]] = None
+    ) -> RuleResult:
+        """
+        Build the result from the set of matched check names and, for
+        scoped rules, the stanzas each one fired in (scan_stanzas).
+        """
+        checks: Dict[str, bool] = {}
+        findings: List[Dict[str, object]] = []
+        recommendations: List[str] = []
+        score = 0
+        located = located or {}
+
+        for rule in self.rules:
+            present = rule.id in found
+            if rule.scoped:
+                locations = located.get(rule.id, [])
+                fired = bool(locations)
+            else:
+                suppressed = any(f"{rule.id}:unless:{n}" in found for n in range(len(rule.unless)))
+                fired = rule.fires(present, suppressed)
+
+            if rule.key:
+                checks[rule.key] = fired if rule.report == "finding" else present
+            if fired:
+                finding = rule.finding()
+                if rule.scoped:
+                    finding["locations"] = locations
+                findings.append(finding)
+                score += rule.weight
+                if rule.remediation and rule.remediation not in recommendations:
+                    recommendations.append(rule.remediation)
+
+        score = max(0, min(self.max_score, score))
+        if isinstance(score, float):
+            score = round(score, 1)
+        return RuleResult(self, checks, findings, score, recommendations)
+
+    def scan_blocks(self, blocks: Iterable[str]) -> Set[str]:
+        return self.matcher.scan_blocks(blocks)
+
+    def scan_stanzas(self, config: ConfigInput, found: Set[str]) -> Dict[str, List[Dict[str, object]]]:
+        """
+        Evaluate the scoped rules over the stanzas they target. Adds the
+        ids of scoped rules present in any checked stanza to `found` and
+        returns {rule id: [{"stanza", "line"}, ...]} for those that fired.
+        """
+        located: Dict[str, List[Dict[str, object]]] = {}
+        if not self.scope_matchers:
+            return located
+
+        cfg = as_parsed(config)
+        index = getattr(cfg, "stanza_index", None)
+        if index is None:  # streamed sources: keep only the stanzas we need
+            index = StanzaIndex(cfg.iter_stanzas(), {r.keyword for r in self.rules if r.scoped})
+
+        for scope in self.scope_matchers:
+            for stanza in index.select(scope):
+                text = _lf((stanza.text + stanza.body).lower())
+                for rule_id, line in self._check_stanza(scope, text, found).items():
+                    located.setdefault(rule_id, []).append({
+                        "stanza": stanza.text,
+                        "line": stanza.lineno + line,
+                    })
+        return located
+
+    def _check_stanza(self, scope: str, text: str, found: Set[str]) -> Dict[str, int]:
+        """
+        The scope's rules over one (lower-cased) stanza: adds the rules
+        present to `found`, returns {rule id: line within the stanza} for
+        those that fire.
+        """
+        matcher, rules, group = self.scope_matchers[scope]
+        hits = matcher.scan(text)
+        fired: Dict[str, int] = {}
+        for rule in rules:
+            if not all(f"{rule.id}:where:{n}" in hits for n in range(len(rule.where))):
+                continue
+            present = rule.id in hits
+            if present:
+                found.add(rule.id)
+            suppressed = any(f"{rule.id}:unless:{n}" in hits for n in range(len(rule.unless)))
+            if not rule.fires(present, suppressed):
+                continue
+            # a forbidden pattern is reported where it is, a missing one at the header
+            offset = rule.locate(text, group[rule.id]) if present else 0
+            fired[rule.id] = text.count("\n", 0, offset)
+        return fired
+
+    def evaluate(self, config: ConfigInput) -> RuleResult:
+        """
+        One pass of the pack's matcher over the lower-cased config, plus
+        the scoped rules over the stanzas they target.
+        """
+        cfg = as_parsed(config)
+        found = self.scan_blocks(map(_lf, cfg.lower_blocks())) if self.matcher.names else set()
+        return self.result(found, self.scan_stanzas(cfg, found))
+
+    def evaluate_incremental(
+        self, config_text: str, previous: Optional["RuleSnapshot"] = None
+    ) -> Tuple[RuleResult, "RuleSnapshot", List[str]]:
+        """
+        Evaluate a config stanza by stanza, reusing the hits of every
+        stanza whose hash is unchanged since `previous` (a snapshot of
+        the same device's last audit under this exact pack). Returns the
+        result, the snapshot to keep for next time, and the stanza keys
+        that were added, changed or removed.
+
+        Gives the same result as evaluate() because checks never span
+        lines. Lines outside every stanza (column-0 comments, indented
+        lines after a `!` inside a block or before the first stanza) form
+        a pseudo-stanza that is always re-scanned.
+        """
+        if previous is not None and previous.pack != self.tag:
+            previous = None
+        old_hashes = previous.hashes if previous else {}
+
+        hashes: Dict[str, str] = {}
+        hits: Dict[str, List[str]] = {}
+        lines: Dict[str, Dict[str, int]] = {}
+        found: Set[str] = set()
+        located: Dict[str, List[Dict[str, object]]] = {}
+        changed: List[str] = []
+
+        for key, stanza in iter_keyed_stanzas(config_text):
+            h = hashes[key] = stanza_hash(stanza)
+            if old_hashes.get(key) == h:
+                stanza_hits = previous.hits.get(key, ())
+                fired = previous.lines.get(key, {})
+            else:
+                changed.append(key)
+                text = _lf((stanza.text + stanza.body).lower())
+                scanned: Set[str] = self.matcher.scan(text) if self.matcher.names else set()
+                fired = {}
+                for scope in self.scope_matchers:
+                    if in_scope(stanza, scope):
+                        fired.update(self._check_stanza(scope, text, scanned))
+                stanza_hits = sorted(scanned)
+
+            if stanza_hits:
+                hits[key] = list(stanza_hits)
+                found.update(stanza_hits)
+            if fired:
+                lines[key] = fired
+                for rule_id, line in fired.items():
+                    located.setdefault(rule_id, []).append({"stanza": stanza.text, "line": stanza.lineno + line})
+
+        if self.matcher.names:
+            loose = loose_lines(config_text)
+            if loose:
+                found |= self.matcher.scan(_lf(loose.lower()))
+
+        changed += [k for k in old_hashes if k not in hashes]
+        result = self.result(found, located)
+        return result, RuleSnapshot(self.tag, hashes, hits, lines, finding_keys(result)), changed
+
+    def delta(self, previous: Optional["RuleSnapshot"], current: "RuleSnapshot") -> Dict[str, List[Dict[str, object]]]:
+        """
+        Findings that are new, resolved or unchanged between two audits
+        of a device, one entry per rule (global) or per rule and stanza
+        (scoped).
+        """
+        before = set(previous.findings) if previous else set()
+        now = current.findings
+        titles = {r.id: (r.title, r.severity) for r in self.rules}
+
+        def entry(key) -> Dict[str, object]:
+            rule_id, stanza = key
+            title, severity = titles.get(rule_id, (rule_id, None))
+            return {"id": rule_id, "title": title, "severity": severity, "stanza": stanza}
+
+        return {
+            "new": [entry(k) for k in now if k not in before],
+            "resolved": [entry(k) for k in sorted(before, key=str) if k not in set(now)],
+            "unchanged": [entry(k) for k in now if k in before],
+        }
+
+    def profile(self, config: ConfigInput) -> Dict[str, object]:
+        """
+        What each rule costs. evaluate() checks all rules in one pass and
+        cannot attribute time, so here every rule's pattern (with its
+        unless / where patterns) runs on its own over the text it applies
+        to, counting every match (`condition_hits`: unless / where
+        patterns found). `total_ms` is a normal evaluate().
+        Rules come most expensive first; totals go to RULE_STATS.
+        """
+        cfg = as_parsed(config)
+        t0 = time.perf_counter()
+        self.evaluate(cfg)
+        total = time.perf_counter() - t0
+
+        costs = {rule.id: [0.0, 0, 0, 0] for rule in self.rules}  # seconds, matches, bytes, condition hits
+        scanned = 0
+        for block in map(_lf, cfg.lower_blocks()):
+            scanned += len(block)
+            for rule in self.rules:
+                if not rule.scoped:
+                    _time_rule(rule, block, costs[rule.id])
+
+        if self.scope_matchers:
+            index = getattr(cfg, "stanza_index", None)
+            if index is None:
+                index = StanzaIndex(cfg.iter_stanzas(), {r.keyword for r in self.rules if r.scoped})
+            for scope, (_, rules, _) in self.scope_matchers.items():
+                for stanza in index.select(scope):
+                    text = _lf((stanza.text + stanza.body).lower())
+                    for rule in rules:
+                        _time_rule(rule, text, costs[rule.id])
+
+        rows = [
+            {"id": rule_id, "ms": round(sec * 1000, 3), "matches": matches, "bytes": size, "condition_hits": hits}
+            for rule_id, (sec, matches, size, hits) in costs.items()
+        ]
+        rows.sort(key=lambda r: r["ms"], reverse=True)
+        RULE_STATS.record(self.name, rows)
+        return {
+            "pack": self.tag,
+            "total_ms": round(total * 1000, 3),
+            "bytes": scanned,
+            "rules": rows,
+        }
+
+    def __repr__(self) -> str:
+        return f"RulePack({self.tag!r}, rules={len(self.rules)})"
+
+
+# ---------------------------------------------------------------
+# INCREMENTAL AUDITS
+# ---------------------------------------------------------------
+def loose_lines(config_text: str) -> str:
+    """
+    The config with every top-level stanza cut out: what evaluate() scans
+    but no stanza owns (column-0 comments and the indented lines that
+    follow them or precede the first stanza). Empty if there is none.
+    """
+    loose = STANZA_RE.sub("", config_text)
+    return loose if loose.strip() else ""
+
+
+def finding_keys(result: RuleResult) -> List[Tuple[str, Optional[str]]]:
+    """(rule id, stanza) for every fired global rule (stanza None) and scoped location."""
+    keys: List[Tuple[str, Optional[str]]] = []
+    for f in result.findings:
+        if "locations" in f:
+            keys.extend((f["id"], loc["stanza"]) for loc in f["locations"])
+        else:
+            keys.append((f["id"], None))
+    return keys
+
+
+class RuleSnapshot:
+    """
+    What one pack found in each stanza of an audited config, so the
+    next audit of the device only re-checks the stanzas that changed:
+    stanza hashes, the check names hit per stanza, the line (within the
+    stanza) of every scoped rule that fired, and the finding keys for
+    delta views.
+    """
+
+    __slots__ = ("pack", "hashes", "hits", "lines", "findings")
+
+    def __init__(self, pack: str, hashes, hits, lines, findings) -> None:
+        self.pack = pack
+        self.hashes: Dict[str, str] = hashes
+        self.hits: Dict[str, List[str]] = hits
+        self.lines: Dict[str, Dict[str, int]] = lines
+        self.findings: List[Tuple[str, Optional[str]]] = findings
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "pack": self.pack,
+            "stanzas": self.hashes,
+            "hits": self.hits,
+            "lines": self.lines,
+            "findings": self.findings,
+        })
+
+    @classmethod
+    def from_json(cls, data: Optional[str]) -> Optional["RuleSnapshot"]:
+        if not data:
+            return None
+        try:
+            d = json.loads(data)
+            return cls(d["pack"], d["stanzas"], d["hits"], d["lines"], [tuple(k) for k in d["findings"]])
+        except (ValueError, KeyError, TypeError):
+            return None
+
+
+# ---------------------------------------------------------------
+# PROFILING
+# ---------------------------------------------------------------
+def _time_rule(rule: Rule, text: str, cost: list) -> None:
+    """
+    Run one rule's patterns over `text`, adding to [seconds, matches,
+    bytes, condition hits]; condition hits count the rule's unless /
+    where patterns found in `text`.
+    """
+    if rule._profile is None:
+        rule._profile = (rule.check(), [p.lower() for p in rule.unless + rule.where])
+    check, others = rule._profile
+
+    t0 = time.perf_counter()
+    if isinstance(check, str):
+        matches = text.count(check)
+    else:
+        matches = sum(1 for _ in check.finditer(text))
+    conditions = sum(other in text for other in others)
+    cost[0] += time.perf_counter() - t0
+    cost[1] += matches
+    cost[2] += len(text)
+    cost[3] += conditions
+
+
+class RuleStats:
+    """
+    Per-rule totals over every profiled audit in this process: runs,
+    time, matches and bytes scanned, keyed by (pack name, rule id).
+    """
+
+    def __init__(self) -> None:
+        self._rules: Dict[tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, pack: str, rows: Iterable[Dict[str, object]]) -> None:
+        with self._lock:
+            for row in rows:
+                total = self._rules.setdefault((pack, row["id"]), [0, 0.0, 0, 0])
+                total[0] += 1
+                total[1] += row["ms"]
+                total[2] += row["matches"]
+                total[3] += row["bytes"]
+
+    def top(self, n: Optional[int] = 20, pack: Optional[str] = None) -> List[Dict[str, object]]:
+        """The most expensive rules by total time."""
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._rules.items() if pack is None or k[0] == pack]
+        rows = [
+            {
+                "pack": name,
+                "id": rule_id,
+                "runs": runs,
+                "total_ms": round(ms, 3),
+                "mean_ms": round(ms / runs, 3),
+                "matches": matches,
+                "bytes": size,
+            }
+            for (name, rule_id), (runs, ms, matches, size) in items
+        ]
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows if n is None else rows[:n]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rules.clear()
+
+
+RULE_STATS = RuleStats()
+
+
+def rule_stats(n: Optional[int] = 20, pack: Optional[str] = None) -> List[Dict[str, object]]:
+    return RULE_STATS.top(n, pack)
+
+
+# ---------------------------------------------------------------
+# LOADING (compiled once, reloaded when the file changes)
+# ---------------------------------------------------------------
+_PACKS: Dict[str, tuple] = {}   # path -> (mtime_ns, RulePack)
+_PACKS_LOCK = threading.Lock()
+
+
+def _resolve(name_or_path: str, pack_dir: str) -> str:
+    if os.path.sep in name_or_path or os.path.splitext(name_or_path)[1]:
+        return os.path.abspath(name_or_path)
+    for ext in (".json", ".yaml", ".yml"):
+        path = os.path.join(pack_dir, name_or_path + ext)
+        if os.path.exists(path):
+            return os.path.abspath(path)
+    raise RulePackError(f"rule pack {name_or_path!r} not found in {pack_dir}")
+
+
+def _read(path: str) -> RulePack:
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        raise RulePackError(f"cannot read rule pack {path}: {e}") from None
+
+    if path.endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise RulePackError(f"{path}: YAML rule packs need PyYAML")
+        try:
+            data = yaml.safe_load(raw)
+        except yaml.YAMLError as e:
+            raise RulePackError(f"{path}: {e}") from None
+    else:
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise RulePackError(f"{path}: {e}") from None
+
+    return RulePack(data, source=path, digest=hashlib.sha256(raw).hexdigest())
+
+
+def load_rule_pack(name_or_path: str, pack_dir: str = RULE_PACK_DIR) -> RulePack:
+    """
+    Load a pack by name (looked up in `pack_dir`) or path. Compiled
+    packs are shared across requests and only rebuilt when the file's
+    mtime changes.
+    """
+    path = _resolve(name_or_path, pack_dir)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError as e:
+        raise RulePackError(f"cannot read rule pack {path}: {e}") from None
+
+    with _PACKS_LOCK:
+        cached = _PACKS.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    pack = _read(path)
+    with _PACKS_LOCK:
+        _PACKS[path] = (mtime, pack)
+    return pack
+
+
+def list_rule_packs(pack_dir: str = RULE_PACK_DIR) -> List[str]:
+    try:
+        names = os.listdir(pack_dir)
+    except OSError:
+        return []
+    return sorted(
+        os.path.splitext(n)[0] for n in names if n.endswith((".json", ".yaml", ".yml"))
+    )
+
+
+def run_rule_pack(config: ConfigInput, pack: str = "netdoc-core") -> Dict[str, object]:
+    """Evaluate one pack and return its result as a plain dict."""
+    return load_rule_pack(pack).evaluate(config).to_dict()
@@ -4,72 +4,111 @@
 # ============================================================
 
 import re
-
-def find_weak_passwords(raw_text):
-    patterns = [
-        r"password 0 \S+",
-        r"username \S+ password",
-        r"enable password \S+",
-        r"enable secret \S+",
-        r"password \S+",
-        r"secret \S+",
-    ]
-
-    weak_keywords = ["cisco", "admin", "1234", "12345", "password"]
-
+import time
+
+from rule_engine import load_rule_pack
+from utils.ir import as_parsed
+
+# every "password"/"secret" with its optional type (0/5/7/8/9) and value,
+# found in one pass over the text. Run over the lower-cased text: without
+# IGNORECASE the regex engine can skip ahead to candidate positions.
+CREDENTIAL_PATTERN = r"(?P<kind>password|secret)(?:[ \t]+(?P<type>[05789]))?[ \t]+(?P<value>\S+)"
+CREDENTIAL_RE = re.compile(CREDENTIAL_PATTERN)
+CREDENTIAL_RE_IGNORECASE = re.compile(CREDENTIAL_PATTERN, re.IGNORECASE)
+
+WEAK_KEYWORDS = frozenset({"cisco", "admin", "1234", "12345", "password"})
+WEAK_KEYWORD_RE = re.compile(
+    "|".join(re.escape(w) for w in sorted(WEAK_KEYWORDS, key=len, reverse=True))
+)
+
+CREDENTIAL_ISSUES = {
+    "0": "plaintext password (type 0)",
+    "5": "MD5 hash (type 5)",
+    "7": "reversible encoding (type 7)",
+}
+
+# "password encryption aes", FortiOS "set password ENC ..."
+NOT_A_CREDENTIAL = frozenset({"encryption", "enc"})
+
+# hashes written without their type digit ("secret $9$...")
+HASH_PREFIX_TYPES = (("$1$", "5"), ("$8$", "8"), ("$9$", "9"))
+
+
+def _credential_type(type_digit, value):
+    if type_digit:
+        return type_digit
+    for prefix, ctype in HASH_PREFIX_TYPES:
+        if value.startswith(prefix):
+            return ctype
+    return "0"
+
+
+def find_credentials(raw_text, first_line=1):
+    """
+    Credentials that are stored insecurely, as structured findings in
+    line order: {"line", "context", "user", "kind", "type", "issue",
+    "keyword", "match"}. Type 0/5/7 credentials are all reported; a
+    plaintext value is also matched against WEAK_KEYWORDS. Type 8/9
+    hashes (with or without their type digit) are fine.
+    """
     found = []
+    line, last = first_line, 0
+    count, rfind = raw_text.count, raw_text.rfind
+
+    # offsets into the lower-cased text are only valid for raw_text when
+    # lowering kept its length (it does for ASCII configs)
+    text = raw_text.lower()
+    pattern = CREDENTIAL_RE
+    if len(text) != len(raw_text):
+        text, pattern = raw_text, CREDENTIAL_RE_IGNORECASE
+
+    for m in pattern.finditer(text):
+        start = m.start()
+        if start and (text[start - 1].isalnum() or text[start - 1] == "_"):
+            continue  # "xpassword": not the keyword
+        value = raw_text[m.start("value"):m.end("value")]
+        if value.lower() in NOT_A_CREDENTIAL:
+            continue
+        ctype = _credential_type(m.group("type"), value)
+        if ctype not in CREDENTIAL_ISSUES:
+            continue
+
+        line += count("\n", last, start)
+        last = start
+
+        head = raw_text[rfind("\n", 0, start) + 1:start].split()
+        context = head[0].lower() if head else "line"
+        keyword = None
+        if ctype == "0":
+            hit = WEAK_KEYWORD_RE.search(value.lower())
+            keyword = hit.group() if hit else None
+
+        found.append({
+            "line": line,
+            "context": context,
+            "user": head[1] if context == "username" and len(head) > 1 else None,
+            "kind": m.group("kind").lower(),
+            "type": ctype,
+            "issue": CREDENTIAL_ISSUES[ctype] + (f", weak keyword '{keyword}'" if keyword else ""),
+            "keyword": keyword,
+            "match": raw_text[start:m.end()],
+        })
+
+    return found
+
+
+def is_weak_password(finding):
+    """
+    What `weak_passwords` has always reported: any "password" credential
+    and any plaintext secret with a weak keyword. Hashed secrets are not
+    listed there (see `credential_findings` for those).
+    """
+    return finding["kind"] == "password" or finding["keyword"] is not None
 
-    for p in patterns:
-        matches = re.findall(p, raw_text, re.IGNORECASE)
-        for m in matches:
-            # Check if weak phrase appears
-            if any(w in m.lower() for w in weak_keywords):
-                found.append(m)
-
-    return list(set(found))
-
-
-def find_missing_aaa(raw_text):
-    if "aaa new-model" not in raw_text.lower():
-        return "AAA is NOT enabled"
-    return "OK"
-
-
-def find_stp_issues(raw_text):
-    issues = []
-    if "spanning-tree portfast" not in raw_text.lower():
-        issues.append("No STP PortFast detected")
-
-    if "bpduguard" not in raw_text.lower():
-        issues.append("No BPDU Guard detected")
 
-    return issues
-
-
-def find_default_vlan(raw_text):
-    issues = []
-    # default VLAN has risks
-    vlan10 = re.findall(r"interface vlan ?1", raw_text, re.IGNORECASE)
-    if vlan10:
-        issues.append("VLAN 1 active — not recommended")
-
-    trunks = re.findall(r"switchport trunk allowed vlan.*1", raw_text)
-    if trunks:
-        issues.append("VLAN 1 allowed on trunk")
-
-    return issues
-
-
-def find_no_logging(raw_text):
-    if "logging buffered" not in raw_text.lower():
-        return "Logging not configured"
-    return "OK"
-
-
-def find_cdp_exposure(raw_text):
-    if "cdp run" in raw_text.lower():
-        return "CDP is enabled — may expose topology"
-    return "OK"
+def find_weak_passwords(raw_text):
+    """Matched text of every weak password (see is_weak_password)."""
+    return [f["match"] for f in find_credentials(raw_text) if is_weak_password(f)]
 
 
 def find_interface_problems(parsed):
@@ -90,17 +129,59 @@ def find_interface_problems(parsed):
 # -------------------------------------------------------------
 # MAIN AUDIT WRAPPER
 # -------------------------------------------------------------
-def run_security_audit(parsed):
-    raw = parsed.get("raw", "")
+# AAA / STP / VLAN 1 / logging / CDP checks come from this rule pack,
+# all evaluated in one pass over the config.
+HARDENING_PACK = "netdoc-hardening"
+
+
+def run_security_audit(parsed, profile=False):
+    # raw text, a ParsedConfig, a MappedConfig (scanned block by block),
+    # or the legacy {"raw": ..., "interfaces": ...} dict.
+    # `profile` adds per-rule timings under "_profile".
+    # Interface warnings need the dict's status / IP data: parsed text has
+    # no port mode, so every L2 port would look like it is "missing IP".
+    cfg = as_parsed(parsed)
+    interfaces = parsed if isinstance(parsed, dict) else {}
+
+    result = load_rule_pack(HARDENING_PACK).evaluate(cfg)
+
+    credentials = []
+    first_line = 1
+    scanned = 0
+    t0 = time.perf_counter()
+    for raw in cfg.text_blocks():
+        credentials += find_credentials(raw, first_line)
+        first_line += raw.count("\n")
+        scanned += len(raw)
+    credentials_ms = (time.perf_counter() - t0) * 1000
 
     audit = {
-        "weak_passwords": find_weak_passwords(raw),
-        "aaa_status": find_missing_aaa(raw),
-        "stp_issues": find_stp_issues(raw),
-        "default_vlan_risks": find_default_vlan(raw),
-        "logging": find_no_logging(raw),
-        "cdp_exposure": find_cdp_exposure(raw),
-        "interface_warnings": find_interface_problems(parsed),
+        "weak_passwords": list(dict.fromkeys(f["match"] for f in credentials if is_weak_password(f))),
+        # every insecurely stored credential, with line / user / type / issue
+        "credential_findings": credentials,
+        "aaa_status": result.message("HARD-AAA"),
+        "stp_issues": result.messages("stp"),
+        "default_vlan_risks": result.messages("vlan"),
+        "logging": result.message("HARD-LOGGING"),
+        "cdp_exposure": result.message("HARD-CDP"),
+        "interface_warnings": find_interface_problems(interfaces),
+        # scoped rules: which interface / line / snmp-server stanza and line
+        "stanza_findings": [f for f in result.findings if "locations" in f],
+        "risk_score": result.risk_score,
+        "recommendations": result.recommendations,
     }
 
+    if profile:
+        report = load_rule_pack(HARDENING_PACK).profile(cfg)
+        # the credential scan is not a pack rule, but it is part of the cost
+        report["rules"].append({
+            "id": "credentials",
+            "ms": round(credentials_ms, 3),
+            "matches": len(credentials),
+            "bytes": scanned,
+            "condition_hits": 0,
+        })
+        report["rules"].sort(key=lambda r: r["ms"], reverse=True)
+        audit["_profile"] = report
+
     return audit
@@ -0,0 +1,41 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# the app imports its modules from the repository root ("utils.parser", ...)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+SAMPLES = os.path.join(ROOT, "samples")
+
+# the FastAPI backend's engines import as top-level "services.*"
+BACKEND_DIR = os.path.join(ROOT, "backend", "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.append(BACKEND_DIR)
+
+# database.py needs a DATABASE_URL at import; tests use a throwaway sqlite file
+os.environ.setdefault(
+    "DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="netdoc-tests-"), "test.db")
+)
+
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def db():
+    """Fresh tables and empty process-wide caches for one test."""
+    import topology_store
+    from database import Base, engine
+    from utils.audit_cache import AUDIT_CACHE
+
+    AUDIT_CACHE.clear()
+    topology_store._GRAPHS.clear()
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,42 @@
+from audit_store import audit_upload
+from database import AuditReport, SessionLocal
+from main import audit_version, run_security_audit
+from upload_engine import ingest_upload
+from utils.audit_cache import AUDIT_CACHE, AuditCache
+
+CONFIG = "hostname R1\nenable password cisco\nline vty 0 4\n transport input telnet\n"
+
+
+def test_hit_is_served_from_memory_and_version_invalidates():
+    cache = AuditCache(max_entries=2)
+    calls = []
+
+    def audit():
+        calls.append(1)
+        return {"risk_score": 10, "recommendations": ["x"]}
+
+    first = cache.get_or_audit("sha", "v1", audit)
+    first["recommendations"].append("mutated by the caller")
+    assert cache.get_or_audit("sha", "v1", audit) == {"risk_score": 10, "recommendations": ["x"]}
+    assert len(calls) == 1
+
+    cache.get_or_audit("sha", "v2", audit)  # new rules: audited again
+    cache.get_or_audit("other", "v2", audit)
+    assert len(calls) == 2 + 1
+    assert cache.get("sha", "v1") is None  # evicted (LRU of 2)
+    assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 1, "misses": 3}
+
+
+def test_each_org_keeps_its_own_report(db):
+    cached = run_security_audit(CONFIG)
+    for org_id in (1, 2):
+        upload, _, _ = ingest_upload(org_id, org_id, "r1.cfg", CONFIG)
+        _, audit, _, _ = audit_upload(upload)
+        assert audit == cached
+        audit_upload(upload)  # already has its report
+
+    session = SessionLocal()
+    reports = session.query(AuditReport.org_id, AuditReport.rule_version).order_by(AuditReport.org_id).all()
+    session.close()
+    assert reports == [(1, audit_version()), (2, audit_version())]
+    assert AUDIT_CACHE.stats()["misses"] == 1
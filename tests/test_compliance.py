@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from compliance_engine import ComplianceMatrix
+from rule_engine import RulePack
+
+PACK = RulePack({
+    "name": "matrix",
+    "version": "1",
+    "max_score": 50,
+    "rules": [
+        {"id": f"R-{n}", "title": f"rule {n}", "pattern": f"check {n}", "expect": "absent", "weight": 10 * n}
+        for n in range(1, 12)  # more than 8 rules: packed bits span two bytes
+    ],
+})
+
+RESULTS = {
+    "sw1": ["R-1", "R-11"],
+    "sw2": {"failed_rules": ["R-2"]},
+    "fw1": {"findings": [{"id": "R-1"}, {"id": "R-3"}, {"id": "GONE"}]},
+}
+INFO = {"sw1": {"site": "NYC", "vendor": "cisco"}, "sw2": {"site": "LON", "vendor": "cisco"}}
+
+
+def test_save_load_round_trip(tmp_path):
+    matrix = ComplianceMatrix.from_results(RESULTS, PACK, INFO)
+    path = str(tmp_path / "snapshot.npz")
+    matrix.save(path)
+    loaded = ComplianceMatrix.load(path)
+
+    assert np.array_equal(loaded.failed, matrix.failed)
+    assert list(loaded.devices) == ["sw1", "sw2", "fw1"]
+    assert list(loaded.rules) == list(matrix.rules)
+    assert loaded.weights.tolist() == matrix.weights.tolist()
+    assert (loaded.pack, loaded.max_score) == (PACK.tag, 50)
+    assert loaded.info.loc["sw2", "site"] == "LON"
+    assert loaded.info["site"].isna().tolist() == [False, False, True]
+    assert loaded.risk_scores().tolist() == [50.0, 20.0, 40.0]  # clamped to max_score
+
+
+def test_trend_over_shared_devices_and_rules():
+    before = ComplianceMatrix.from_results(RESULTS, PACK)
+    after = ComplianceMatrix.from_results(
+        {"sw1": ["R-11"], "sw2": ["R-1", "R-2"], "fw1": ["R-1"], "new": ["R-5"]}, PACK
+    )
+    trend = after.trend(before)
+
+    assert trend.loc["R-1", "pass_rate_before"] == pytest.approx(1 / 3)
+    assert trend.loc["R-1", "pass_rate"] == pytest.approx(1 / 3)
+    assert (trend.loc["R-1", "newly_failing"], trend.loc["R-1", "fixed"]) == (1, 1)
+    assert trend.loc["R-5", "newly_failing"] == 0  # "new" is not in the earlier snapshot
+    assert trend.loc["R-3", "delta"] == pytest.approx(1 / 3) and trend.loc["R-3", "fixed"] == 1
+    assert trend.loc["R-1", "delta"] == 0
@@ -0,0 +1,42 @@
+import pytest
+from benchmarks.synthetic import cisco_config, fortios_config
+from conftest import read_sample
+
+from utils.incremental import ParseSnapshot, parse_incremental
+from utils.parser import device_to_dict, parse_config, split_device_chunks
+
+CISCO = cisco_config(interfaces=24, vlans=4, acl_lines=10)
+FORTIOS = fortios_config(interfaces=8, vlans=4, acl_lines=10)
+
+
+def _edits(text):
+    lines = text.splitlines(keepends=True)
+    first_intf = next(n for n, l in enumerate(lines) if l.startswith(("interface ", "    edit ")))
+    yield "unchanged", text
+    yield "edited interface", "".join(lines[:first_intf + 1] + [" description edited\n"] + lines[first_intf + 1:])
+    yield "removed stanza", "".join(lines[:first_intf] + lines[first_intf + 1:])
+    added = ["interface Loopback99\n", " ip address 10.99.99.1 255.255.255.255\n"]
+    yield "added stanza", "".join(lines[:first_intf] + added + lines[first_intf:])
+
+
+@pytest.mark.parametrize("text", [CISCO, FORTIOS], ids=["cisco", "fortios"])
+def test_incremental_matches_full_parse(text):
+    first = parse_incremental(text)
+    assert [device_to_dict(d) for d in first.devices] == [device_to_dict(d) for d in parse_config(text)]
+
+    # through the JSON round trip the Upload row stores
+    previous = ParseSnapshot.from_json(first.snapshot.hashes_json(), first.snapshot.parsed_json())
+    for name, edited in _edits(text):
+        result = parse_incremental(edited, previous)
+        assert [device_to_dict(d) for d in result.devices] == [device_to_dict(d) for d in parse_config(edited)], name
+        assert result.reused  # only the edited stanzas were parsed again
+        if name == "unchanged":
+            assert result.changed == [] and result.removed == []
+
+
+def test_every_device_of_a_bundle_matches_its_full_parse():
+    content = read_sample("sample 1.txt")
+    chunks = split_device_chunks(content)
+    assert len(chunks) == 6
+    for chunk, full in zip(chunks, parse_config(content)):
+        assert device_to_dict(parse_incremental(chunk).devices[0]) == device_to_dict(full)
@@ -0,0 +1,53 @@
+import utils.parse_cache as parse_cache
+from utils.parse_cache import ParseCache
+
+R1 = "hostname R1\ninterface Gi0/0\n ip address 10.0.0.1 255.255.255.0\n"
+R2 = R1.replace("R1", "R2")
+
+
+def _counting_parse(calls):
+    def parse(text):
+        calls.append(text)
+        return parse_cache.parse_config(text)
+    return parse
+
+
+def test_hit_miss_and_lru_eviction():
+    cache = ParseCache(max_entries=1)
+    calls = []
+    parse = _counting_parse(calls)
+
+    assert cache.get(R1) is None
+    first = cache.get_or_parse(R1, parse)
+    again = cache.get_or_parse(R1, parse)
+    assert [d.hostname for d in again] == ["R1"]
+    assert again[0] is first[0] and again is not first  # shared devices, own list
+    assert len(calls) == 1
+
+    cache.get_or_parse(R2, parse)  # evicts R1
+    cache.get_or_parse(R1, parse)
+    assert len(calls) == 3
+    assert cache.stats() == {"entries": 1, "max_entries": 1, "hits": 1, "disk_hits": 0, "misses": 4}
+
+
+def test_edited_config_and_parser_version_invalidate(monkeypatch):
+    cache = ParseCache()
+    calls = []
+    parse = _counting_parse(calls)
+
+    cache.get_or_parse(R1, parse)
+    cache.get_or_parse(R1 + " description edited\n", parse)
+    assert len(calls) == 2
+
+    monkeypatch.setattr(parse_cache, "PARSER_VERSION", "test-upgrade")
+    cache.get_or_parse(R1, parse)
+    assert len(calls) == 3
+
+
+def test_disk_tier_survives_a_new_process(tmp_path):
+    ParseCache(cache_dir=str(tmp_path)).get_or_parse(R1)
+
+    restarted = ParseCache(cache_dir=str(tmp_path))
+    devices = restarted.get_or_parse(R1, lambda text: [])  # never parsed again
+    assert [d.hostname for d in devices] == ["R1"]
+    assert restarted.stats()["disk_hits"] == 1
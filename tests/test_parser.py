@@ -0,0 +1,39 @@
+import io
+
+from utils.parser import parse_config, parse_config_stream, split_device_chunks
+
+STARRED_MOTD = """\
+hostname R1
+!
+banner motd ^C
+**************************************
+=====  Authorized access only  =====
+--------------------------------------
+end
+^C
+!
+interface GigabitEthernet0/1
+ description Uplink
+ ip address 10.0.0.1 255.255.255.252
+!
+end
+"""
+
+
+def _summary(devices):
+    return [(d.hostname, [i.name for i in d.interfaces]) for d in devices]
+
+
+def test_starred_motd_banner_is_one_device():
+    expected = [("R1", ["GigabitEthernet0/1"])]
+    assert len(split_device_chunks(STARRED_MOTD)) == 1
+    assert _summary(parse_config(STARRED_MOTD)) == expected
+    assert _summary(parse_config_stream(io.StringIO(STARRED_MOTD))) == expected
+
+
+def test_banner_between_bundled_devices():
+    r2 = STARRED_MOTD.replace("R1", "R2").replace("^C", "#")
+    bundle = "===== R1 =====\n" + STARRED_MOTD + "===== R2 =====\n" + r2
+    expected = [("R1", ["GigabitEthernet0/1"]), ("R2", ["GigabitEthernet0/1"])]
+    assert _summary(parse_config(bundle, workers=1)) == expected
+    assert _summary(parse_config_stream(io.StringIO(bundle))) == expected
@@ -0,0 +1,53 @@
+import ipaddress
+import random
+
+from utils.prefix_trie import PrefixTrie
+
+
+def _brute_force(prefixes, address):
+    """The longest stored prefix containing `address`, by a linear scan."""
+    covering = [net for net in prefixes if address.version == net.version and address in net]
+    return max(covering, key=lambda net: net.prefixlen, default=None)
+
+
+def test_longest_match_against_brute_force():
+    rng = random.Random(7)
+    prefixes = {}
+    for n in range(400):
+        # clustered in 10.0.0.0/12 so prefixes nest and share branches
+        bits = (10 << 24) | rng.getrandbits(20) << 4
+        net = ipaddress.ip_network((bits, rng.randint(8, 30)), strict=False)
+        prefixes[net] = n
+    trie = PrefixTrie()
+    for net, value in prefixes.items():
+        trie.insert(net, value)
+    assert len(trie) == len(prefixes)
+
+    for _ in range(2000):
+        address = ipaddress.ip_address((10 << 24) | rng.getrandbits(20) << 4 | rng.getrandbits(4))
+        expected = _brute_force(prefixes, address)
+        match = trie.longest_match(address)
+        if expected is None:
+            assert match is None
+        else:
+            assert match == (expected, prefixes[expected])
+
+
+def test_strings_ipv6_default_route_and_remove():
+    trie = PrefixTrie()
+    trie.insert("0.0.0.0/0", "default")
+    trie.insert("10.1.0.0/16", "site")
+    trie.insert("10.1.2.0/24", "lan")
+    trie.insert("2001:db8::/32", "v6")
+
+    assert trie.longest_match("10.1.2.9")[1] == "lan"
+    assert trie.longest_match("10.1.3.9")[1] == "site"
+    assert trie.longest_match("192.0.2.1")[1] == "default"
+    assert trie.longest_match("2001:db8::1")[1] == "v6"
+    assert trie.longest_match("2001:db9::1") is None  # no IPv6 default
+    assert [v for _, v in trie.covering("10.1.2.0/25")] == ["default", "site", "lan"]
+
+    assert trie.remove("10.1.2.0/24") and not trie.remove("10.1.2.0/24")
+    assert trie.longest_match("10.1.2.9")[1] == "site"
+    assert "10.1.2.0/24" not in trie and "10.1.0.0/16" in trie
+    assert [str(net) for net, _ in trie] == ["0.0.0.0/0", "10.1.0.0/16", "2001:db8::/32"]
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+from conftest import ROOT
+from services import rule_engine as backend_rule_engine
+
+import rule_engine
+from rule_engine import load_rule_pack
+
+# benchmarked only, but a good stress test of the engine
+CIS_PACK = os.path.join(ROOT, "benchmarks", "rule_packs", "cis-ios-l1.json")
+
+BASE = """\
+hostname SW1
+!
+aaa new-model
+logging host 10.0.0.5
+!
+interface GigabitEthernet1/0/1
+ switchport mode access
+ spanning-tree portfast
+ spanning-tree bpduguard enable
+!
+line vty 0 4
+ transport input ssh
+!
+end
+"""
+
+VARIANTS = {
+    "base": BASE,
+    # a "!" inside the interface block leaves the next lines in no stanza
+    "comment inside block": BASE.replace(
+        " switchport mode access\n", " switchport mode access\n!\n"
+    ),
+    "leading indented lines": " spanning-tree portfast\n bpduguard\n" + BASE,
+    "comment lines only": BASE.replace("aaa new-model", "! aaa new-model"),
+    "changed stanza": BASE.replace(" transport input ssh", " transport input telnet"),
+    "CRLF": BASE.replace("\n", "\r\n"),
+}
+
+
+def _summary(result):
+    return result.checks, sorted(
+        (f["id"], tuple(sorted((l["stanza"], l["line"]) for l in f.get("locations", ()))))
+        for f in result.findings
+    )
+
+
+@pytest.mark.parametrize("pack_name", ["netdoc-core", "netdoc-hardening", CIS_PACK], ids=["core", "hardening", "cis"])
+@pytest.mark.parametrize("name", sorted(VARIANTS))
+def test_incremental_matches_full_evaluation(pack_name, name):
+    pack = load_rule_pack(pack_name)
+    text = VARIANTS[name]
+    expected = _summary(pack.evaluate(text))
+
+    cold, _, _ = pack.evaluate_incremental(text)
+    assert _summary(cold) == expected
+
+    # reusing every other variant's snapshot must not change the result
+    for other in VARIANTS.values():
+        _, previous, _ = pack.evaluate_incremental(other)
+        warm, _, _ = pack.evaluate_incremental(text, previous)
+        assert _summary(warm) == expected
+
+
+def test_anchored_rules_match_crlf_configs():
+    pack = load_rule_pack(CIS_PACK)
+    config = "hostname R1\nline vty 0 4\n exec-timeout 0 0\n!\nlogging console\nend\n"
+    lf = pack.evaluate(config)
+    crlf = pack.evaluate(config.replace("\n", "\r\n"))
+    assert lf.fired("CIS-1.2.6") and lf.fired("CIS-2.2.3")
+    assert _summary(crlf) == _summary(lf)
+
+
+# global rules only: the backend engine has no stanza scopes
+SHARED_PACK = {
+    "name": "shared",
+    "version": "1",
+    "rules": [
+        {"id": "S-1", "title": "VTY telnet", "pattern": "^ transport input telnet$",
+         "type": "regex", "expect": "absent", "weight": 10, "key": "telnet"},
+        {"id": "S-2", "title": "No AAA", "pattern": "^aaa new-model$", "type": "regex",
+         "expect": "present", "weight": 5},
+        {"id": "S-3", "title": "No logging", "pattern": "logging host", "expect": "present",
+         "unless": ["logging buffered"], "weight": 1},
+    ],
+}
+
+
+@pytest.mark.parametrize("engine", [rule_engine, backend_rule_engine], ids=["root", "backend"])
+def test_both_engines_handle_crlf_and_profile(engine):
+    pack = engine.RulePack(SHARED_PACK)
+    text = VARIANTS["changed stanza"]
+    lf = pack.evaluate(text)
+    crlf = pack.evaluate(text.replace("\n", "\r\n"))
+    assert [f["id"] for f in lf.findings] == ["S-1"]
+    assert (crlf.checks, crlf.findings, crlf.risk_score) == (lf.checks, lf.findings, lf.risk_score)
+
+    profile = pack.profile(text.replace("\n", "\r\n"))
+    rows = {r["id"]: r for r in profile["rules"]}
+    assert rows["S-1"]["matches"] == 1 and rows["S-2"]["matches"] == 1
+    assert rows["S-3"]["condition_hits"] == 0
+    profile = pack.profile(text + "logging buffered 4096\n")
+    assert {r["id"]: r["condition_hits"] for r in profile["rules"]} == {"S-1": 0, "S-2": 0, "S-3": 1}
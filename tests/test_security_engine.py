@@ -0,0 +1,37 @@
+from security_engine import find_credentials, run_security_audit
+
+CONFIG = """hostname R1
+enable secret 5 $1$abcd$xyz
+enable secret $9$Zx1$abcdef
+username admin secret $8$abc
+username bob password 7 0822455D0A16
+username joe secret mysecret
+username amy secret admin1
+line vty 0 4
+ password cisco
+"""
+
+
+def test_untyped_type8_type9_hashes_are_not_plaintext():
+    found = find_credentials("enable secret $9$Zx1$abcdef\nusername a secret $8$abc\n")
+    assert found == []
+
+
+def test_untyped_md5_hash_is_type5():
+    (finding,) = find_credentials("enable secret $1$abcd$xyz\n")
+    assert finding["type"] == "5"
+
+
+def test_weak_passwords_keeps_its_old_scope():
+    audit = run_security_audit(CONFIG)
+    assert audit["weak_passwords"] == ["password 7 0822455D0A16", "secret admin1", "password cisco"]
+    assert [(f["line"], f["type"]) for f in audit["credential_findings"]] == [
+        (2, "5"), (5, "7"), (6, "0"), (7, "0"), (9, "0"),
+    ]
+
+
+def test_parsed_input_has_no_interface_warnings():
+    config = "hostname SW1\ninterface Gi0/1\n switchport mode access\ninterface Vlan10\n ip address 10.0.0.1 255.255.255.0\n"
+    assert run_security_audit(config)["interface_warnings"] == []
+    legacy = {"raw": config, "interfaces": {"Gi0/1": {"status": "down"}}}
+    assert run_security_audit(legacy)["interface_warnings"] == ["Gi0/1 is down", "Gi0/1 missing IP"]
@@ -0,0 +1,23 @@
+from conftest import read_sample
+from main import TOPOLOGY_RENDERS, generate_topology_mermaid
+from utils.ir import ParsedConfig
+from utils.parser import parse_config
+
+
+def test_injected_devices_are_not_cached_under_the_text():
+    content = read_sample("sample 1.txt")
+    TOPOLOGY_RENDERS.clear()
+    partial = generate_topology_mermaid(ParsedConfig(content, devices=parse_config(content)[:1]))
+    full = generate_topology_mermaid(content)
+
+    assert "SW-CORE" not in partial
+    assert "SW-CORE" in full and "R2" in full
+    assert generate_topology_mermaid(ParsedConfig(content)) == full
+
+
+def test_backend_fleets_are_per_workspace():
+    from services.topology_graph import add_to_fleet, get_fleet
+
+    add_to_fleet(1, "core", {"hostname": "R1", "interfaces": []})
+    assert set(get_fleet(1, "core").devices) == {"R1"}
+    assert get_fleet(2, "core") is None
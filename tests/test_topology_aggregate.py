@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from utils.topology_aggregate import aggregate, group_nodes, render_aggregate, site_of
+from utils.topology_graph import Link, TopologyGraph
+
+
+def _fleet():
+    graph = TopologyGraph()
+    graph.replace_device("nyc-core-01", [
+        Link("nyc-core-01", "10.1.0.0/24", "network", "Gi0/0"),
+        Link("nyc-core-01", "nyc-sw-01", "neighbor", "Gi0/1"),
+        Link("nyc-core-01", "lon-core-01", "neighbor", "Gi0/2"),
+    ], vendor="cisco")
+    graph.replace_device("nyc-sw-01", [Link("nyc-sw-01", "10.1.0.0/24", "network", "Vlan1")], vendor="cisco")
+    graph.replace_device("lon-core-01", [
+        Link("lon-core-01", "10.2.0.0/24", "network", "ge-0/0/0"),
+        Link("lon-core-01", "lon-ap-9", "neighbor", "ge-0/0/1"),  # never uploaded
+    ], vendor="juniper")
+    graph.replace_device("sfo.edge1", [Link("sfo.edge1", "172.16.5.0/24", "network", "Eth1")], vendor="arista")
+    return graph
+
+
+def test_site_of():
+    assert site_of("NYC-core-01") == "nyc"
+    assert site_of("sfo.edge1") == "sfo"
+    assert site_of("router") == "(none)"
+
+
+def test_group_by_site_counts_devices_nodes_and_links():
+    agg = aggregate(_fleet(), "site")
+    assert agg.groups == {
+        "nyc": {"devices": 2, "nodes": 3, "internal_links": 3},
+        "lon": {"devices": 1, "nodes": 3, "internal_links": 2},
+        "sfo": {"devices": 1, "nodes": 2, "internal_links": 1},
+    }
+    assert dict(agg.edges) == {("lon", "nyc"): 1}
+    assert agg.group_of["lon-ap-9"] == "lon"  # joins its only neighbor's site
+    assert "    G1 ---|1| G0;" in agg.to_mermaid().split("\n")
+
+
+def test_every_grouping_places_every_node_once():
+    graph = _fleet()
+    for by, groups in [
+        ("component", {"component 1": 6, "component 2": 2}),
+        ("vendor", {"cisco": 3, "juniper": 3, "arista": 2}),
+        ("subnet", {"10.1.0.0/16": 3, "10.2.0.0/16": 3, "172.16.0.0/16": 2}),
+    ]:
+        group_of = group_nodes(graph, by)
+        assert set(group_of) == set(graph.nodes())
+        assert {g: list(group_of.values()).count(g) for g in set(group_of.values())} == groups
+
+    wide = group_nodes(graph, "subnet", prefixlen=8)
+    assert wide["nyc-core-01"] == wide["lon-core-01"] == "10.0.0.0/8"
+    sites = group_nodes(graph, "site", sites={"lon-core-01": "nyc"})
+    assert sites["lon-core-01"] == sites["lon-ap-9"] == "nyc"
+
+    with pytest.raises(ValueError):
+        group_nodes(graph, "rack")
+
+
+def test_aggregate_is_cached_per_version_and_drills_down():
+    graph = _fleet()
+    agg = aggregate(graph, "site")
+    assert aggregate(graph, "site") is agg
+
+    sub = agg.subgraph(graph, "lon")
+    assert set(sub.devices) == {"lon-core-01"}
+    assert set(sub.nodes()) <= set(agg.members["lon"])
+
+    graph.replace_device("lon-core-02", [Link("lon-core-02", "10.2.0.0/24", "network", "ge-0/0/0")])
+    fresh = aggregate(graph, "site")
+    assert fresh is not agg
+    assert fresh.groups["lon"] == {"devices": 2, "nodes": 4, "internal_links": 3}
+
+    body = json.loads(render_aggregate(graph, "site", fmt="json").body)
+    assert {g["id"]: g["devices"] for g in body["groups"]} == {"nyc": 2, "lon": 2, "sfo": 1}
+    with pytest.raises(ValueError):
+        render_aggregate(graph, "site", fmt="svg")
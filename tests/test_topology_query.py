@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from utils.topology_graph import Link, TopologyGraph
+from utils.topology_query import articulation_points, connected_components, shortest_path
+
+
+def _random_graph(rng, devices=14, others=6):
+    graph = TopologyGraph()
+    names = [f"D{n}" for n in range(devices)] + [f"N{n}" for n in range(others)]
+    for n in range(devices):
+        host = f"D{n}"
+        links = []
+        for k in range(rng.randint(0, 2)):
+            target = rng.choice([m for m in names if m != host])
+            links.append(Link(host, target, "neighbor", f"Gi0/{k}"))
+            if rng.random() < 0.15:  # a second, parallel link
+                links.append(Link(host, target, "neighbor", f"Gi1/{k}"))
+        graph.replace_device(host, links)
+    return graph
+
+
+def _undirected(graph):
+    """{node: neighbors} and {pair: parallel links}, from the raw links."""
+    adj = {n: set() for n in graph.nodes()}
+    directed = {}
+    for links in graph.links.values():
+        for link in links:
+            adj[link.source].add(link.target)
+            adj[link.target].add(link.source)
+            directed[(link.source, link.target)] = directed.get((link.source, link.target), 0) + 1
+    mult = {}
+    for (a, b), n in directed.items():
+        pair = tuple(sorted((a, b)))
+        mult[pair] = max(mult.get(pair, 0), n)
+    return adj, mult
+
+
+def _distances(adj, src):
+    dist = {src: 0}
+    frontier = [src]
+    while frontier:
+        nxt = []
+        for node in frontier:
+            for other in adj[node]:
+                if other not in dist:
+                    dist[other] = dist[node] + 1
+                    nxt.append(other)
+        frontier = nxt
+    return dist
+
+
+def _components(adj, skip_node=None, skip_pair=None):
+    seen = {skip_node}
+    count = 0
+    for start in adj:
+        if start in seen:
+            continue
+        count += 1
+        seen.add(start)
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for other in adj[node]:
+                if other in seen or tuple(sorted((node, other))) == skip_pair:
+                    continue
+                seen.add(other)
+                stack.append(other)
+    return count
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_shortest_path_against_bfs(seed):
+    rng = random.Random(seed)
+    graph = _random_graph(rng)
+    adj, _ = _undirected(graph)
+    nodes = sorted(adj)
+    for src in nodes:
+        dist = _distances(adj, src)
+        for dst in nodes:
+            path = shortest_path(graph, src, dst)
+            if dst not in dist:
+                assert path is None
+                continue
+            assert path[0] == src and path[-1] == dst
+            assert len(path) - 1 == dist[dst]
+            assert all(b in adj[a] for a, b in zip(path, path[1:]))
+
+    with pytest.raises(KeyError):
+        shortest_path(graph, nodes[0], "nowhere")
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_articulation_points_and_bridges_against_removal(seed):
+    rng = random.Random(seed)
+    graph = _random_graph(rng)
+    adj, mult = _undirected(graph)
+    base = _components(adj)
+    assert base == len(connected_components(graph))
+
+    points = sorted(n for n in adj if _components(adj, skip_node=n) > base)
+    bridges = sorted(pair for pair, n in mult.items()
+                     if pair[0] != pair[1] and n == 1 and _components(adj, skip_pair=pair) > base)
+    assert articulation_points(graph) == (points, bridges)
@@ -0,0 +1,53 @@
+import topology_store
+from conftest import read_sample
+from topology_store import org_topology, rebuild_org_topology
+from upload_engine import ingest_upload
+from utils.parser import parse_config
+from utils.topology_graph import Link, TopologyGraph
+
+
+def test_bundle_upload_adds_every_device(db):
+    content = read_sample("sample 1.txt")
+    hostnames = {d.hostname for d in parse_config(content)}
+    org_topology(1)  # loaded before the upload: kept in step by it
+
+    ingest_upload(1, 1, "sample 1.txt", content)
+    graph = org_topology(1)
+    assert set(graph.devices) == hostnames
+    assert graph.stats()["devices"] == 6
+
+    nodes = graph.stats()["nodes"]
+    topology_store._GRAPHS.clear()
+    assert org_topology(1).stats()["nodes"] == nodes  # same as loaded from the tables
+    assert rebuild_org_topology(1).stats()["nodes"] == nodes
+
+
+def test_replace_device_drops_links_nobody_else_has():
+    graph = TopologyGraph()
+    graph.replace_device("R1", [Link("R1", "10.0.0.0/24", "network", "Gi0/0"), Link("R1", "SW1", "neighbor", "Gi0/0")])
+    graph.replace_device("R2", [Link("R2", "10.0.0.0/24", "network", "Gi0/0")])
+    assert graph.nodes() == {"R1": "device", "R2": "device", "10.0.0.0/24": "network", "SW1": "neighbor"}
+    assert graph.subnet_of("10.0.0.7")[1] == {"R1", "R2"}
+
+    graph.replace_device("R1", [Link("R1", "10.1.0.0/24", "network", "Gi0/0")])
+    assert "SW1" not in graph
+    assert graph.subnet_of("10.0.0.7")[1] == {"R2"}
+    assert graph.neighbors("R1") == {"10.1.0.0/24"}
+
+    graph.replace_device("R2", [])
+    assert "10.0.0.0/24" not in graph and graph.subnet_of("10.0.0.7") is None
+
+
+def test_remove_device_keeps_it_while_others_link_to_it():
+    graph = TopologyGraph()
+    graph.replace_device("R1", [Link("R1", "SW1", "neighbor", "Gi0/0")])
+    graph.replace_device("SW1", [Link("SW1", "AP1", "neighbor", "Gi0/0")])
+    version = graph.version
+
+    graph.remove_device("SW1")
+    assert graph.kind("SW1") == "neighbor"
+    assert "AP1" not in graph
+    assert graph.version > version
+
+    graph.remove_device("R1")
+    assert len(graph) == 0
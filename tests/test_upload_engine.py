@@ -0,0 +1,37 @@
+from conftest import read_sample
+from upload_engine import ingest_upload
+from utils.parser import parse_config
+
+SINGLE = """hostname R9
+interface Gi0/0
+ ip address 10.0.0.1 255.255.255.0
+interface Gi0/1
+ description uplink
+ ip address 10.0.1.1 255.255.255.0
+end
+"""
+
+
+def test_bundle_upload_keeps_every_device(db):
+    content = read_sample("sample 1.txt")
+    upload, devices, changed = ingest_upload(1, 1, "sample 1.txt", content)
+
+    assert [d.hostname for d in devices] == [d.hostname for d in parse_config(content)]
+    assert len(devices) == 6
+    assert upload.hostname is None
+    assert upload.stanza_hashes is None and upload.parsed_json is None
+    assert changed
+
+    _, again, changed = ingest_upload(1, 1, "sample 1.txt", content)
+    assert [d.hostname for d in again] == [d.hostname for d in devices]
+    assert changed == []
+
+
+def test_reupload_is_matched_by_the_stored_hostname(db):
+    upload, _, _ = ingest_upload(1, 1, "r9.cfg", SINGLE)
+    assert upload.hostname == "R9"
+
+    edited = SINGLE.replace("description uplink", "description uplink to core")
+    _, devices, changed = ingest_upload(1, 1, "r9-new.cfg", edited)
+    assert changed == ["interface Gi0/1"]
+    assert [i.description for i in devices[0].interfaces] == [None, "uplink to core"]
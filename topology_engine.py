@@ -2,11 +2,20 @@
 #  NetDoc AI — Topology Generator
 # ===============================================================
 
+from utils.ir import ParsedConfig
+
+
 def generate_topology_mermaid(parsed):
     if isinstance(parsed, str):
         return "graph TD;\nA[Device] --> B[Neighbor];"
 
-    neighbors = parsed.get("cdp_neighbors", {})
+    if isinstance(parsed, ParsedConfig):
+        neighbors = {
+            dev.hostname: [n for intf in dev.interfaces for n in intf.neighbors]
+            for dev in parsed.devices
+        }
+    else:
+        neighbors = parsed.get("cdp_neighbors", {})
 
     mermaid = "graph TD;\n"
 
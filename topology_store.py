@@ -0,0 +1,196 @@
+# ===============================================================
+#  NetDoc AI — Topology Store (org-wide graph, updated per upload)
+# ===============================================================
+
+import datetime
+import threading
+
+from sqlalchemy import func
+
+from database import SessionLocal, TopologyEdge, TopologyNode, Upload
+from utils.neighbors import DiscoveryNeighbors, FleetHostnames, description_neighbors
+from utils.parser import parse_config
+from utils.topology_graph import Link, TopologyGraph, device_links
+
+# org_id -> (marker, TopologyGraph): graphs loaded in this process.
+# The marker (latest node change, node count) tells whether another
+# process has changed the org since.
+_GRAPHS = {}
+_LOCK = threading.Lock()
+
+
+def _marker(db, org_id):
+    return tuple(
+        db.query(func.max(TopologyNode.updated_at), func.count(TopologyNode.id))
+        .filter(TopologyNode.org_id == org_id)
+        .one()
+    )
+
+
+def _sources(known, content=None):
+    sources = [description_neighbors, FleetHostnames(known)]
+    if content and ("Device ID:" in content or "System Name:" in content):
+        sources.append(DiscoveryNeighbors.from_text(content))
+    return sources
+
+
+# ---------------------------------------------------------------
+# UPDATE (one upload)
+# ---------------------------------------------------------------
+def update_device_topology(db, org_id, upload, devices, content=None, known=None):
+    """
+    Replace the links of the uploaded device(s) in the org's graph;
+    every other device keeps its stored links. `content` is the raw
+    config, for CDP/LLDP output pasted alongside it.
+
+    Descriptions are matched against `known` hostnames (default: the
+    devices the org already has), so a link to a device uploaded later
+    appears once the describing device is uploaded again (or
+    rebuild_org_topology runs).
+    """
+    if known is None:
+        known = {name for (name,) in db.query(TopologyNode.name).filter(TopologyNode.org_id == org_id)}
+    known = set(known)
+    known.update(d.hostname for d in devices)
+    before = _marker(db, org_id)
+    sources = _sources(known, content)
+    subnets = None
+    if any(i.ip and i.prefixlen is None for d in devices for i in d.interfaces):
+        subnets = org_topology(org_id).subnets  # addresses without a mask
+
+    now = datetime.datetime.utcnow()
+    changed = []
+    added = 0
+    for device in devices:
+        links = list(device_links(device, sources, subnets))
+        db.query(TopologyEdge).filter(
+            TopologyEdge.org_id == org_id, TopologyEdge.source == device.hostname
+        ).delete(synchronize_session=False)
+        db.add_all(
+            TopologyEdge(org_id=org_id, source=l.source, target=l.target, kind=l.kind, interface=l.interface)
+            for l in links
+        )
+
+        node = (
+            db.query(TopologyNode)
+            .filter(TopologyNode.org_id == org_id, TopologyNode.name == device.hostname)
+            .first()
+        )
+        if node is None:
+            node = TopologyNode(org_id=org_id, name=device.hostname)
+            db.add(node)
+            added += 1
+        node.vendor = device.vendor
+        node.upload_id = upload.id if upload is not None else None
+        node.updated_at = now
+        changed.append((device.hostname, links, node.vendor, node.upload_id))
+    db.commit()
+
+    # keep this process's copy in step instead of reloading the org, but
+    # only if nobody else changed the org: neither since it was loaded
+    # nor while this write ran (the marker must have moved by exactly it)
+    expected = (max(before[0], now) if before[0] is not None else now, before[1] + added)
+    with _LOCK:
+        entry = _GRAPHS.get(org_id)
+        if entry is not None:
+            if entry[0] != before or _marker(db, org_id) != expected:
+                del _GRAPHS[org_id]  # reloaded on the next read
+            else:
+                graph = entry[1]
+                for hostname, links, vendor, upload_id in changed:
+                    graph.replace_device(hostname, links, vendor=vendor, upload_id=upload_id)
+                _GRAPHS[org_id] = (expected, graph)
+
+
+def rebuild_org_topology(org_id):
+    """
+    Rebuild an org's graph from the latest upload of every device (for
+    orgs with uploads from before the graph existed, or after a parser
+    change). Uses the devices stored with each upload; only uploads
+    stored by an older parser version are parsed again.
+    """
+    from upload_engine import load_upload_devices
+
+    db = SessionLocal()
+    latest = {}
+    for upload_id, hostname, filename in (
+        db.query(Upload.id, Upload.hostname, Upload.filename)
+        .filter(Upload.org_id == org_id)
+        .order_by(Upload.id.desc())
+    ):
+        # bundles (and configs without a hostname) are stored without one
+        latest.setdefault(hostname or ("file", filename), upload_id)
+
+    uploads = []
+    for upload_id in latest.values():
+        upload = db.get(Upload, upload_id)
+        uploads.append((upload, load_upload_devices(upload) or parse_config(upload.content)))
+        db.expunge(upload)
+
+    known = set()
+    for upload, devices in uploads:
+        known.update(d.hostname for d in devices)
+    for upload, devices in uploads:
+        update_device_topology(db, org_id, upload, devices, upload.content, known)
+    db.close()
+
+    with _LOCK:
+        _GRAPHS.pop(org_id, None)
+    return org_topology(org_id)
+
+
+# ---------------------------------------------------------------
+# READ
+# ---------------------------------------------------------------
+def _load_graph(db, org_id):
+    graph = TopologyGraph()
+    links = {}
+    for source, target, kind, interface in (
+        db.query(TopologyEdge.source, TopologyEdge.target, TopologyEdge.kind, TopologyEdge.interface)
+        .filter(TopologyEdge.org_id == org_id)
+        .order_by(TopologyEdge.id)
+    ):
+        links.setdefault(source, []).append(Link(source, target, kind, interface))
+
+    for name, vendor, upload_id in (
+        db.query(TopologyNode.name, TopologyNode.vendor, TopologyNode.upload_id)
+        .filter(TopologyNode.org_id == org_id)
+        .order_by(TopologyNode.name)
+    ):
+        graph.replace_device(name, links.get(name, ()), vendor=vendor, upload_id=upload_id)
+    return graph
+
+
+def org_topology(org_id):
+    """
+    The org's TopologyGraph: loaded from the node/edge tables once per
+    process, then kept current by update_device_topology. One small
+    query per call checks for changes made by other processes.
+    """
+    db = SessionLocal()
+    try:
+        marker = _marker(db, org_id)
+        with _LOCK:
+            entry = _GRAPHS.get(org_id)
+            if entry is not None and entry[0] == marker:
+                return entry[1]
+        graph = _load_graph(db, org_id)
+    finally:
+        db.close()
+
+    with _LOCK:
+        _GRAPHS[org_id] = (marker, graph)
+    return graph
+
+
+def org_topology_render(org_id, fmt="mermaid"):
+    """
+    The org graph as "mermaid", "json" or "graphml" with its ETag,
+    serialized once per graph version (any upload that changes the
+    graph bumps the version).
+    """
+    return org_topology(org_id).render(fmt)
+
+
+def org_topology_mermaid(org_id):
+    return org_topology_render(org_id).body
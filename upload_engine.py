@@ -0,0 +1,133 @@
+# ===============================================================
+#  NetDoc AI — Upload Engine (store + incremental re-parse)
+# ===============================================================
+
+from database import SessionLocal, Upload
+from topology_store import update_device_topology
+from utils.incremental import ParseSnapshot, iter_keyed_stanzas, parse_incremental, sniff_hostname
+from utils.parse_cache import config_digest
+from utils.parser import parse_config, split_device_chunks
+
+
+# ---------------------------------------------------------------
+# PREVIOUS UPLOAD OF THE SAME DEVICE
+# ---------------------------------------------------------------
+def find_previous_upload(db, org_id, hostname, filename):
+    """
+    Latest upload of the same device in this org, matched by hostname
+    (or by filename when the config has no hostname).
+    """
+    q = db.query(Upload).filter(Upload.org_id == org_id)
+    if hostname:
+        q = q.filter(Upload.hostname == hostname)
+    else:
+        q = q.filter(Upload.filename == filename)
+    return q.order_by(Upload.id.desc()).first()
+
+
+# ---------------------------------------------------------------
+# INGEST UPLOAD
+# ---------------------------------------------------------------
+def ingest_upload(org_id, user_id, filename, content):
+    """
+    Store an uploaded config and parse it incrementally against the
+    previous upload of the same device: only stanzas whose hash changed
+    are re-parsed, the rest of the previous Device is reused, and an
+    identical re-upload is not parsed at all.
+
+    Multi-device bundles are parsed in full and stored without a
+    hostname or stanza snapshot; later uploads of the same file are
+    matched by filename.
+
+    The device's links in the org topology graph are replaced as well.
+
+    Returns (upload, devices, changed_stanza_keys).
+    """
+    db = SessionLocal()
+
+    digest = config_digest(content)
+    if len(split_device_chunks(content)) > 1:
+        return _ingest_bundle(db, org_id, user_id, filename, content, digest)
+
+    hostname = sniff_hostname(content)
+    previous = find_previous_upload(db, org_id, hostname, filename)
+
+    if previous is not None and previous.content_sha256 == digest:
+        snapshot = ParseSnapshot.from_json(previous.stanza_hashes, previous.parsed_json)
+        if snapshot is not None:
+            upload = Upload(
+                org_id=org_id,
+                user_id=user_id,
+                filename=filename,
+                content=content,
+                hostname=previous.hostname,
+                content_sha256=digest,
+                stanza_hashes=previous.stanza_hashes,
+                parsed_json=previous.parsed_json,
+            )
+            db.add(upload)
+            db.commit()
+            update_device_topology(db, org_id, upload, [snapshot.device], content)
+            db.refresh(upload)  # the topology commit expired it
+            db.close()
+            return upload, [snapshot.device], []
+
+    snapshot = None
+    if previous is not None:
+        snapshot = ParseSnapshot.from_json(previous.stanza_hashes, previous.parsed_json)
+
+    result = parse_incremental(content, snapshot)
+
+    upload = Upload(
+        org_id=org_id,
+        user_id=user_id,
+        filename=filename,
+        content=content,
+        hostname=hostname,  # the key find_previous_upload looks up
+        content_sha256=digest,
+        stanza_hashes=result.snapshot.hashes_json(),
+        parsed_json=result.snapshot.parsed_json(),
+    )
+    db.add(upload)
+    db.commit()
+    update_device_topology(db, org_id, upload, result.devices, content)
+    db.refresh(upload)  # the topology commit expired it
+    db.close()
+
+    return upload, result.devices, result.changed + result.removed
+
+
+def _ingest_bundle(db, org_id, user_id, filename, content, digest):
+    """A multi-device upload: full parse, no per-stanza snapshot."""
+    previous = find_previous_upload(db, org_id, None, filename)
+    unchanged = previous is not None and previous.content_sha256 == digest
+    devices = parse_config(content)
+
+    upload = Upload(
+        org_id=org_id,
+        user_id=user_id,
+        filename=filename,
+        content=content,
+        hostname=None,
+        content_sha256=digest,
+    )
+    db.add(upload)
+    db.commit()
+    update_device_topology(db, org_id, upload, devices, content)
+    db.refresh(upload)  # the topology commit expired it
+    db.close()
+
+    if unchanged:
+        return upload, devices, []
+    return upload, devices, [key for key, _ in iter_keyed_stanzas(content)]
+
+
+# ---------------------------------------------------------------
+# LOAD STORED DEVICE
+# ---------------------------------------------------------------
+def load_upload_devices(upload):
+    """Devices stored with an upload, without re-parsing its content."""
+    snapshot = ParseSnapshot.from_json(upload.stanza_hashes, upload.parsed_json)
+    if snapshot is not None:
+        return [snapshot.device]
+    return []
@@ -1,5 +1,5 @@
 import streamlit as st
-from utils.parser import parse_config
+from utils.parser import parse_config_stream, summarize_devices
 
 st.set_page_config(page_title="NetDoc AI", layout="wide")
 
@@ -13,13 +13,12 @@ uploaded_files = st.file_uploader(
 )
 
 if uploaded_files and st.button("Generate Report"):
-    combined = ""
-    for f in uploaded_files:
-        combined += f"\n\n# FILE: {f.name}\n"
-        combined += f.read().decode("utf-8")
+    devices = []
 
     with st.spinner("Processing your configs..."):
-        result = parse_config(combined)
+        # stream each upload instead of concatenating everything in memory
+        for f in uploaded_files:
+            devices.extend(parse_config_stream(f))
 
     st.success("Report generated successfully!")
-    st.json(result)
+    st.json(summarize_devices(devices))
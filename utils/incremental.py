@@ -0,0 +1,177 @@
+# ============================================================
+#  NetDoc AI — Incremental Re-Parse (per-stanza hashes)
+# ============================================================
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import re
+
+from utils.config_tree import Stanza, iter_stanzas
+from utils.parser import (
+    PARSER_VERSION,
+    Device,
+    Interface,
+    _DeviceState,
+    detect_vendor,
+    device_from_dict,
+    device_to_dict,
+)
+
+HOSTNAME_SNIFF_RE = re.compile(r'^(?:hostname[ \t]+|[ \t]+set hostname[ \t]+"?)([^\s"]+)', re.MULTILINE)
+
+
+def stanza_hash(stanza: Stanza) -> str:
+    """Content hash of one top-level stanza (header + raw body)."""
+    h = hashlib.blake2b(stanza.text.encode("utf-8", errors="surrogatepass"), digest_size=12)
+    if stanza.body:
+        h.update(stanza.body.encode("utf-8", errors="surrogatepass"))
+    return h.hexdigest()
+
+
+def iter_keyed_stanzas(config_text: str):
+    """
+    Yield (key, stanza) for every top-level stanza. The key is the
+    header line ("interface Gi1/0/1", "router ospf 10"); repeated headers
+    get a "#n" suffix so every key is unique within one config.
+    """
+    seen: Dict[str, int] = {}
+    for stanza in iter_stanzas(config_text):
+        key = stanza.text
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        yield (f"{key}#{n + 1}" if n else key), stanza
+
+
+def sniff_hostname(config_text: str) -> Optional[str]:
+    """Cheap hostname lookup (Cisco `hostname` / FortiOS `set hostname`)."""
+    m = HOSTNAME_SNIFF_RE.search(config_text)
+    return m.group(1) if m else None
+
+
+class ParseSnapshot:
+    """
+    What we remember about one parsed upload: the hash of every stanza
+    and the interfaces each stanza produced, so the next upload of the
+    same device can reuse them.
+    """
+
+    __slots__ = ("hashes", "interfaces", "device")
+
+    def __init__(
+        self,
+        hashes: Dict[str, str],
+        interfaces: Dict[str, List[Interface]],
+        device: Device,
+    ) -> None:
+        self.hashes = hashes
+        self.interfaces = interfaces
+        self.device = device
+
+    def hashes_json(self) -> str:
+        return json.dumps({"parser_version": PARSER_VERSION, "stanzas": self.hashes})
+
+    def parsed_json(self) -> str:
+        index_of = {id(i): n for n, i in enumerate(self.device.interfaces)}
+        return json.dumps({
+            "parser_version": PARSER_VERSION,
+            "device": device_to_dict(self.device),
+            # stanza key -> indexes into device.interfaces
+            "stanza_interfaces": {
+                key: [index_of[id(i)] for i in intfs]
+                for key, intfs in self.interfaces.items()
+            },
+        })
+
+    @classmethod
+    def from_json(cls, hashes_json: Optional[str], parsed_json: Optional[str]) -> Optional["ParseSnapshot"]:
+        """
+        Rebuild a snapshot stored on an Upload row. Returns None when it
+        is missing or was written by a different parser version.
+        """
+        if not hashes_json or not parsed_json:
+            return None
+        try:
+            hashes = json.loads(hashes_json)
+            parsed = json.loads(parsed_json)
+        except ValueError:
+            return None
+        if hashes.get("parser_version") != PARSER_VERSION or parsed.get("parser_version") != PARSER_VERSION:
+            return None
+
+        device = device_from_dict(parsed["device"])
+        interfaces = {
+            key: [device.interfaces[n] for n in idx]
+            for key, idx in parsed.get("stanza_interfaces", {}).items()
+        }
+        return cls(hashes["stanzas"], interfaces, device)
+
+
+class IncrementalResult:
+    __slots__ = ("devices", "snapshot", "changed", "removed", "reused")
+
+    def __init__(self, devices: List[Device], snapshot: ParseSnapshot,
+                 changed: List[str], removed: List[str], reused: int) -> None:
+        self.devices = devices
+        self.snapshot = snapshot
+        self.changed = changed      # stanza keys that are new or whose hash moved
+        self.removed = removed      # stanza keys gone since the previous upload
+        self.reused = reused        # stanzas taken from the previous snapshot
+
+
+def parse_incremental(config_text: str, previous: Optional[ParseSnapshot] = None) -> IncrementalResult:
+    """
+    Parse a single-device config, re-parsing only the stanzas whose hash
+    differs from `previous` and reusing the interfaces of the rest.
+    Without a previous snapshot this is a full parse that also records
+    the hashes for next time.
+    """
+    fortinet = detect_vendor(config_text) == "fortinet"
+    state = _DeviceState()
+    hashes: Dict[str, str] = {}
+    contributed: Dict[str, List[Interface]] = {}
+    changed: List[str] = []
+    reused = 0
+
+    old_hashes = previous.hashes if previous else {}
+    old_interfaces = previous.interfaces if previous else {}
+
+    for key, stanza in iter_keyed_stanzas(config_text):
+        h = stanza_hash(stanza)
+        hashes[key] = h
+
+        if old_hashes.get(key) == h:
+            reused += 1
+            prev = old_interfaces.get(key)
+            if prev is not None:
+                state.interfaces.extend(prev)
+                contributed[key] = prev
+                if fortinet:
+                    state.fortinet = True
+                continue
+            # stanzas that produced no interfaces are cheap to re-feed
+        else:
+            changed.append(key)
+
+        before = len(state.interfaces)
+        if fortinet:
+            state.feed_fortinet(stanza)
+        else:
+            state.feed_cisco(stanza)
+        if len(state.interfaces) > before:
+            contributed[key] = state.interfaces[before:]
+
+    device = state.build("fortinet" if fortinet else "cisco")
+    removed = [k for k in old_hashes if k not in hashes]
+    snapshot = ParseSnapshot(hashes, contributed, device)
+    return IncrementalResult([device], snapshot, changed, removed, reused)
+
+
+def diff_hashes(old: Dict[str, str], new: Dict[str, str]) -> Tuple[List[str], List[str], List[str]]:
+    """(added_or_changed, removed, unchanged) stanza keys between two uploads."""
+    changed = [k for k, h in new.items() if old.get(k) != h]
+    removed = [k for k in old if k not in new]
+    unchanged = [k for k, h in new.items() if old.get(k) == h]
+    return changed, removed, unchanged
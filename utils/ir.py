@@ -0,0 +1,166 @@
+# ============================================================
+#  NetDoc AI — Parsed Config (shared intermediate representation)
+# ============================================================
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Union
+
+from utils.config_tree import Stanza, StanzaIndex, build_tree
+from utils.parse_cache import cached_parse_config, config_digest
+from utils.parser import Device, detect_vendor
+from utils.spool import MappedConfig
+
+
+class ParsedConfig:
+    """
+    One uploaded config, parsed once and shared by audit, topology and
+    export. Every view (lines, line index, stanza tree, devices) is built
+    on first use and then kept, so passing the same object to several
+    engines never re-scans or re-parses the text.
+    """
+
+    __slots__ = (
+        "raw", "filename", "devices_given",
+        "_lower", "_lines", "_line_starts", "_tree", "_stanza_index", "_devices", "_vendor",
+        "_digest",
+    )
+
+    def __init__(
+        self,
+        raw: str,
+        filename: Optional[str] = None,
+        devices: Optional[List[Device]] = None,
+    ) -> None:
+        self.raw = raw
+        self.filename = filename
+        self._lower: Optional[str] = None
+        self._lines: Optional[List[str]] = None
+        self._line_starts: Optional[List[int]] = None
+        self._tree: Optional[Stanza] = None
+        self._stanza_index: Optional[StanzaIndex] = None
+        self._devices = devices
+        # devices handed in (e.g. by an incremental ingest) rather than
+        # parsed from `raw`: content-keyed caches must not store results
+        self.devices_given = devices is not None
+        self._vendor: Optional[str] = None
+        self._digest: Optional[str] = None
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, filename: Optional[str] = None, encoding: str = "utf-8"
+    ) -> "ParsedConfig":
+        return cls(data.decode(encoding, errors="ignore"), filename=filename)
+
+    # ----------------------------------------------------------
+    # text views
+    # ----------------------------------------------------------
+    @property
+    def lower(self) -> str:
+        """Lower-cased text, for case-insensitive substring checks."""
+        if self._lower is None:
+            self._lower = self.raw.lower()
+        return self._lower
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self.raw.splitlines()
+        return self._lines
+
+    @property
+    def line_count(self) -> int:
+        return len(self.lines)
+
+    def iter_lines(self) -> Iterator[str]:
+        return iter(self.lines)
+
+    def text_blocks(self) -> Iterator[str]:
+        """
+        The text in line-aligned blocks: one block here, many for a
+        MappedConfig. Audits that scan every block work on both.
+        """
+        yield self.raw
+
+    def lower_blocks(self) -> Iterator[str]:
+        yield self.lower
+
+    def contains(self, needle: str) -> bool:
+        return needle in self.raw
+
+    @property
+    def line_starts(self) -> List[int]:
+        """Character offset at which every line starts."""
+        if self._line_starts is None:
+            starts = [0]
+            find = self.raw.find
+            pos = find("\n")
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = find("\n", pos + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def lineno(self, offset: int) -> int:
+        """1-based line number of a character offset (e.g. a regex match)."""
+        return bisect_right(self.line_starts, offset)
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = config_digest(self.raw)
+        return self._digest
+
+    # ----------------------------------------------------------
+    # parsed views
+    # ----------------------------------------------------------
+    @property
+    def tree(self) -> Stanza:
+        if self._tree is None:
+            self._tree = build_tree(self.raw)
+        return self._tree
+
+    @property
+    def stanza_index(self) -> StanzaIndex:
+        """Top-level stanzas by keyword (scoped audit rules)."""
+        if self._stanza_index is None:
+            self._stanza_index = StanzaIndex(self.tree.children)
+        return self._stanza_index
+
+    def iter_stanzas(self) -> Iterator[Stanza]:
+        return iter(self.tree.children)
+
+    @property
+    def devices(self) -> List[Device]:
+        """Parsed devices (shared with the parse cache: read-only)."""
+        if self._devices is None:
+            self._devices = cached_parse_config(self.raw)
+        return self._devices
+
+    @property
+    def vendor(self) -> str:
+        if self._vendor is None:
+            self._vendor = detect_vendor(self.raw)
+        return self._vendor
+
+    def __repr__(self) -> str:
+        return f"ParsedConfig(filename={self.filename!r}, chars={len(self.raw)})"
+
+
+ConfigInput = Union[str, ParsedConfig, MappedConfig, Dict[str, object]]
+
+
+def as_parsed(config: ConfigInput) -> Union[ParsedConfig, MappedConfig]:
+    """
+    Accept raw text, a ParsedConfig, or a legacy {"raw": ...} dict.
+    A MappedConfig is passed through as is: it offers the streaming
+    views (devices, line_count, text_blocks, lower_blocks, contains,
+    iter_lines, iter_stanzas)
+    but deliberately has no `raw`.
+    """
+    if isinstance(config, (ParsedConfig, MappedConfig)):
+        return config
+    if isinstance(config, str):
+        return ParsedConfig(config)
+    return ParsedConfig(str(config.get("raw", "")))
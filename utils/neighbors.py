@@ -0,0 +1,182 @@
+# ============================================================
+#  NetDoc AI — Neighbor Inference (post-parse, pluggable)
+# ============================================================
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence, Set
+import re
+
+if TYPE_CHECKING:
+    from utils.parser import Device, Interface
+
+# A source looks at one interface of one device and names its neighbors.
+NeighborSource = Callable[["Device", "Interface"], Iterable[str]]
+
+# punctuation commonly glued to hostnames in descriptions: "to:SW1,"
+_DESC_SPLIT_RE = re.compile(r"[\s,;:()\[\]\"'<>|]+")
+
+# "R1#show cdp neighbors detail" / "R1>show lldp neighbors detail"
+DISCOVERY_PROMPT_RE = re.compile(r"^(\S+?)[#>]\s*sh(?:ow)?\s+(?:cdp|lldp)\s+nei", re.IGNORECASE)
+CDP_DEVICE_RE = re.compile(r"^\s*Device ID:\s*(\S+)", re.IGNORECASE)
+CDP_LOCAL_RE = re.compile(r"^\s*Interface:\s*([^,\s]+)", re.IGNORECASE)
+LLDP_LOCAL_RE = re.compile(r"^\s*Local Intf:\s*(\S+)", re.IGNORECASE)
+LLDP_SYSTEM_RE = re.compile(r"^\s*System Name:\s*(\S+)", re.IGNORECASE)
+
+_IFNAME_RE = re.compile(r"^([A-Za-z]+)[ \t]*([\d/.:]+)$")
+
+
+def normalize_ifname(name: str) -> str:
+    """
+    Comparable interface name: "GigabitEthernet1/0/1" and "Gi1/0/1"
+    both become "gi1/0/1".
+    """
+    m = _IFNAME_RE.match(name.strip())
+    if not m:
+        return name.strip().lower()
+    return m.group(1)[:2].lower() + m.group(2)
+
+
+def _strip_domain(name: str) -> str:
+    # CDP reports "SW1.corp.example.com" or "SW1(FOC1234)"
+    return name.split("(", 1)[0].split(".", 1)[0]
+
+
+# ------------------------------------------------------------
+# SOURCES
+# ------------------------------------------------------------
+def description_neighbors(device: "Device", intf: "Interface") -> List[str]:
+    """
+    Crude neighbor hint from the interface description.
+    e.g. "to SW1 Gi1/0/1" -> ["SW1"]
+    """
+    if not intf.description:
+        return []
+    return [
+        w for w in intf.description.split()
+        if w.isupper() and len(w) <= 10 and w != device.hostname
+    ]
+
+
+class FleetHostnames:
+    """
+    Matches description words against hostnames known from the rest of
+    the fleet, so "uplink to core-sw-01" links even though the name is
+    lower-case or longer than the description heuristic accepts.
+    """
+
+    def __init__(self, hostnames: Iterable[str]) -> None:
+        self.known: Dict[str, str] = {h.upper(): h for h in hostnames if h}
+
+    @classmethod
+    def from_devices(cls, devices: Iterable["Device"]) -> "FleetHostnames":
+        return cls(d.hostname for d in devices)
+
+    def __call__(self, device: "Device", intf: "Interface") -> List[str]:
+        if not intf.description or not self.known:
+            return []
+        own = device.hostname.upper()
+        found: List[str] = []
+        for word in _DESC_SPLIT_RE.split(intf.description):
+            key = word.upper()
+            if key and key != own and key in self.known:
+                found.append(self.known[key])
+        return found
+
+
+class DiscoveryNeighbors:
+    """
+    Neighbors taken from `show cdp neighbors detail` / `show lldp
+    neighbors detail` output, keyed by local hostname and interface.
+    """
+
+    def __init__(self) -> None:
+        self.table: Dict[str, Dict[str, Set[str]]] = {}
+
+    def add(self, hostname: str, local_intf: str, neighbor: str) -> None:
+        ports = self.table.setdefault(hostname.upper(), {})
+        ports.setdefault(normalize_ifname(local_intf), set()).add(_strip_domain(neighbor))
+
+    @classmethod
+    def from_text(cls, text: str, hostname: Optional[str] = None) -> "DiscoveryNeighbors":
+        return cls.from_lines(text.splitlines(), hostname)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], hostname: Optional[str] = None) -> "DiscoveryNeighbors":
+        """
+        Parse CDP/LLDP detail output. The local device comes from the CLI
+        prompt ("R1#show cdp neighbors detail") or, failing that, from
+        `hostname`; entries for an unknown local device are dropped.
+        """
+        table = cls()
+        local = hostname
+        neighbor: Optional[str] = None
+        port: Optional[str] = None
+
+        for line in lines:
+            m = DISCOVERY_PROMPT_RE.match(line)
+            if m:
+                local, neighbor, port = m.group(1), None, None
+                continue
+
+            m = CDP_DEVICE_RE.match(line) or LLDP_SYSTEM_RE.match(line)
+            if m:
+                neighbor = m.group(1)
+            else:
+                m = CDP_LOCAL_RE.match(line) or LLDP_LOCAL_RE.match(line)
+                if not m:
+                    continue
+                port = m.group(1)
+
+            # CDP lists Device ID first, LLDP lists Local Intf first
+            if neighbor and port:
+                if local:
+                    table.add(local, port, neighbor)
+                neighbor = port = None
+
+        return table
+
+    def __call__(self, device: "Device", intf: "Interface") -> Iterable[str]:
+        ports = self.table.get(device.hostname.upper())
+        if not ports:
+            return ()
+        return sorted(ports.get(normalize_ifname(intf.name), ()))
+
+
+DEFAULT_SOURCES: Sequence[NeighborSource] = (description_neighbors,)
+
+
+# ------------------------------------------------------------
+# STAGE
+# ------------------------------------------------------------
+def resolve_neighbors(
+    device: "Device",
+    intf: "Interface",
+    sources: Sequence[NeighborSource] = DEFAULT_SOURCES,
+) -> List[str]:
+    """
+    Neighbors of one interface from every source, first-seen order,
+    without duplicates or the device itself.
+    """
+    seen: Set[str] = {device.hostname}
+    names: List[str] = []
+    for source in sources:
+        for name in source(device, intf):
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+    return names
+
+
+def infer_neighbors(
+    devices: Iterable["Device"],
+    sources: Sequence[NeighborSource] = DEFAULT_SOURCES,
+) -> None:
+    """
+    Post-parse stage: set `neighbors` on every interface, once per
+    interface. Mutates the devices, so don't run it on cached parses
+    (use resolve_neighbors there).
+    """
+    for device in devices:
+        for intf in device.interfaces:
+            intf.neighbors = resolve_neighbors(device, intf, sources)
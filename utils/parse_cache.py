@@ -0,0 +1,154 @@
+# ============================================================
+#  NetDoc AI — Parse Cache (content-addressed, LRU + disk)
+# ============================================================
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+from utils.parser import PARSER_VERSION, Device, parse_config
+
+
+def config_digest(config_text: str) -> str:
+    """SHA-256 of the config bytes (UTF-8)."""
+    return hashlib.sha256(config_text.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+class ParseCache:
+    """
+    Cache of parse_config results keyed by SHA-256 of the config plus
+    PARSER_VERSION, so a parser upgrade never serves stale devices.
+
+    The in-memory tier is a bounded LRU; the optional disk tier pickles
+    Device lists into `cache_dir` and survives restarts. Cached devices
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None) -> None:
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, List[Device]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(config_text: str) -> str:
+        return f"{PARSER_VERSION}-{config_digest(config_text)}"
+
+    # ----------------------------------------------------------
+    # disk tier
+    # ----------------------------------------------------------
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _load(self, key: str) -> Optional[List[Device]]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def _store(self, key: str, devices: List[Device]) -> None:
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(devices, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            pass  # the disk tier is best-effort
+
+    # ----------------------------------------------------------
+    # memory tier
+    # ----------------------------------------------------------
+    def _remember(self, key: str, devices: List[Device]) -> None:
+        with self._lock:
+            self._entries[key] = devices
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[List[Device]]:
+        with self._lock:
+            devices = self._entries.get(key)
+            if devices is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(devices)
+
+        if self.cache_dir:
+            devices = self._load(key)
+            if devices is not None:
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                self._remember(key, devices)
+                return list(devices)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def get(self, config_text: str) -> Optional[List[Device]]:
+        return self._lookup(self.key(config_text))
+
+    def get_or_parse(
+        self,
+        config_text: str,
+        parse: Callable[[str], List[Device]] = parse_config,
+    ) -> List[Device]:
+        key = self.key(config_text)
+        devices = self._lookup(key)
+        if devices is not None:
+            return devices
+
+        devices = parse(config_text)
+        self._remember(key, devices)
+        if self.cache_dir:
+            self._store(key, devices)
+        return list(devices)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+
+# ------------------------------------------------------------
+# PROCESS-WIDE CACHE
+# ------------------------------------------------------------
+PARSE_CACHE = ParseCache(
+    max_entries=int(os.getenv("NETDOC_PARSE_CACHE_SIZE", "128")),
+    cache_dir=os.getenv("NETDOC_PARSE_CACHE_DIR") or None,
+)
+
+
+def cached_parse_config(config_text: str) -> List[Device]:
+    """
+    parse_config with the process-wide cache in front of it.
+    """
+    return PARSE_CACHE.get_or_parse(config_text)
+
+
+def parse_cache_stats() -> Dict[str, int]:
+    return PARSE_CACHE.stats()
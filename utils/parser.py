@@ -4,149 +4,558 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import functools
+import io
+import ipaddress
+import itertools
+import os
 import re
+import sys
+
+from utils.config_tree import Stanza, iter_stanzas
+from utils.neighbors import infer_neighbors
+
+# Bump whenever parser output changes so cached parses are invalidated.
+PARSER_VERSION = "6"
+
+
+_NO_NEIGHBORS: Tuple[str, ...] = ()
 
 
-@dataclass
 class Interface:
-    name: str
-    ip: Optional[str] = None
-    description: Optional[str] = None
-    neighbors: List[str] = field(default_factory=list)
+    """
+    One interface. Slotted (no per-instance __dict__) because fleet-wide
+    topology keeps millions of these alive. Names are interned, so
+    "GigabitEthernet1/0/1" is stored once across the whole fleet, and the
+    neighbor list is only allocated when a neighbor is actually found.
+    """
+
+    __slots__ = ("name", "ip", "prefixlen", "description", "_neighbors")
+
+    def __init__(
+        self,
+        name: str,
+        ip: Optional[str] = None,
+        description: Optional[str] = None,
+        neighbors: Optional[List[str]] = None,
+        prefixlen: Optional[int] = None,
+    ) -> None:
+        self.name = sys.intern(name)
+        self.ip = ip
+        self.prefixlen = prefixlen  # from the mask; None when not given
+        self.description = description
+        self._neighbors: Optional[List[str]] = None
+        if neighbors:
+            self.neighbors = neighbors
+
+    @property
+    def neighbors(self) -> Sequence[str]:
+        return self._neighbors if self._neighbors is not None else _NO_NEIGHBORS
+
+    @neighbors.setter
+    def neighbors(self, value: Iterable[str]) -> None:
+        names = [sys.intern(n) for n in value]
+        self._neighbors = names or None
+
+    def add_neighbor(self, name: str) -> None:
+        if self._neighbors is None:
+            self._neighbors = []
+        if name not in self._neighbors:
+            self._neighbors.append(sys.intern(name))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Interface):
+            return NotImplemented
+        return (self.name, self.ip, self.prefixlen, self.description, list(self.neighbors)) == (
+            other.name, other.ip, other.prefixlen, other.description, list(other.neighbors)
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Interface(name={self.name!r}, ip={self.ip!r}, prefixlen={self.prefixlen!r}, "
+            f"description={self.description!r}, neighbors={list(self.neighbors)!r})"
+        )
 
 
-@dataclass
 class Device:
-    hostname: str
-    vendor: str = "generic"
-    interfaces: List[Interface] = field(default_factory=list)
+    """
+    One parsed device. Hostname and vendor are interned; vendor names
+    in particular repeat across every device in the fleet.
+    """
+
+    __slots__ = ("hostname", "vendor", "interfaces")
+
+    def __init__(
+        self,
+        hostname: str,
+        vendor: str = "generic",
+        interfaces: Optional[List[Interface]] = None,
+    ) -> None:
+        self.hostname = sys.intern(hostname)
+        self.vendor = sys.intern(vendor)
+        self.interfaces: List[Interface] = interfaces if interfaces is not None else []
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Device):
+            return NotImplemented
+        return (self.hostname, self.vendor, self.interfaces) == (
+            other.hostname, other.vendor, other.interfaces
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Device(hostname={self.hostname!r}, vendor={self.vendor!r}, "
+            f"interfaces={self.interfaces!r})"
+        )
 
 
-HOSTNAME_RE = re.compile(r"^hostname\s+(\S+)", re.IGNORECASE)
-INT_RE = re.compile(r"^interface\s+(.+)", re.IGNORECASE)
 IP_RE = re.compile(r"ip address\s+(\d+\.\d+\.\d+\.\d+)", re.IGNORECASE)
-DESC_RE = re.compile(r"description\s+(.+)", re.IGNORECASE)
+
+# "10.0.0.1 255.255.255.252" or "10.0.0.1/30"
+_ADDR_MASK = r"(\d+\.\d+\.\d+\.\d+)(?:[ \t]+(\d+\.\d+\.\d+\.\d+)|/(\d{1,2}))?"
+
+# description / primary IP lines inside a Cisco interface block
+CISCO_INT_FIELDS_RE = re.compile(
+    r"\n[ \t]+(?:description[ \t]+(.*)|ip address[ \t]+" + _ADDR_MASK + ")",
+    re.IGNORECASE,
+)
 
 # Fortinet-style
 FGT_EDIT_IF_RE = re.compile(r'^edit\s+"([^"]+)"')
-FGT_SET_IP_RE = re.compile(r"set ip\s+(\d+\.\d+\.\d+\.\d+)")
+FGT_SET_IP_RE = re.compile(r"set ip\s+" + _ADDR_MASK)
 FGT_SET_DESC_RE = re.compile(r"set alias\s+\"?(.+?)\"?$", re.IGNORECASE)
 
+# Multi-device bundles: non-indented lines that can start or end a device
+# ("==== R1 ====" / "# FILE: x" banners, FortiGate file headers, Cisco
+# hostname / end, FortiOS config blocks).
+BANNER_RE = re.compile(r"[=*]{3,}|-{5,}|#{3,}|# ?FILE:|#config-version=")
+DEVICE_BOUNDARY_RE = re.compile(
+    # the lookahead lets the scanner skip most lines on their first byte
+    r"\n(?=[hecb=*#-])"
+    r"(?:(?P<hostname>hostname)[ \t]"
+    r"|(?P<motd>banner)[ \t]+\S+[ \t]+(?P<delim>\^C|\S)"
+    r"|(?P<end>end)[ \t\r]*$"
+    r"|(?P<config>config)[ \t]+(?P<glob>system global)?"
+    r"|(?P<banner>" + BANNER_RE.pattern + r"))",
+    re.MULTILINE,
+)
+
+# `banner motd ^C ... ^C`: everything up to the closing delimiter is
+# banner text, even lines that look like "*****" / "=====" separators
+BANNER_START_RE = re.compile(r"banner[ \t]+\S+[ \t]+(\^C|\S)", re.IGNORECASE)
+
+# a chunk only counts as a device if it has at least one config line
+DEVICE_CONTENT_RE = re.compile(r"^(?![=*]{3}|-{5})[^\s!#]", re.MULTILINE)
+
+# Vendor sniffing: (vendor, marker, weight). A marker is a regex or a
+# tuple of literal substrings (plain str.find is much faster than an
+# alternation). Weights add up per vendor.
+VENDOR_MARKERS = (
+    ("fortinet", ("#config-version=FG",), 1.0),
+    ("fortinet", ("config system global", "config system interface"), 0.9),
+    ("fortinet", re.compile(r"^[ \t]*edit [^\n]*\n[ \t]*set ", re.MULTILINE), 0.4),
+    ("fortinet", re.compile(r"^[ \t]*next[ \t\r]*$", re.MULTILINE), 0.2),
+    ("fortinet", ("FortiGate", "fortigate", "FORTIGATE", "FortiOS"), 0.3),
+    ("cisco", ("Cisco IOS", "cisco ios", "IOS Software", "IOS-XE", "NX-OS"), 0.8),
+    ("cisco", re.compile(r"^version \d+\.\d+", re.MULTILINE), 0.5),
+    ("cisco", re.compile(r"^hostname \S+", re.MULTILINE), 0.4),
+    ("cisco", re.compile(r"^interface \S+", re.MULTILINE), 0.4),
+    ("cisco", re.compile(r"^[ \t]+ip address \d", re.MULTILINE), 0.3),
+    ("cisco", re.compile(r"^![ \t\r]*$", re.MULTILINE), 0.2),
+)
+SNIFF_PREFIX_CHARS = 64 * 1024
+SNIFF_MIN_CONFIDENCE = 0.6    # below this the full text is scanned
+SNIFF_GENERIC_BELOW = 0.3     # below this detect_vendor says "generic"
+
+# Bundles at least this large are parsed on a process pool.
+PARALLEL_MIN_DEVICES = 32
+PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=256)  # a fleet uses a handful of masks
+def prefix_length(mask: str, length: str = "") -> Optional[int]:
+    """
+    Prefix length from a dotted netmask ("255.255.255.252" -> 30) or a
+    "/30" suffix; None for a missing or non-contiguous mask.
+    """
+    if length:
+        n = int(length)
+        return n if n <= 32 else None
+    if not mask:
+        return None
+    try:
+        return ipaddress.IPv4Network(f"0.0.0.0/{mask}").prefixlen
+    except ValueError:
+        return None
+
+
+def _cisco_interface(stanza: Stanza) -> Interface:
+    intf = Interface(name=stanza.args)
+
+    # one regex pass over the raw block instead of tokenizing every line
+    for desc, ip, mask, length in CISCO_INT_FIELDS_RE.findall(stanza.body):
+        if ip:
+            if not intf.ip:
+                intf.ip = ip
+                intf.prefixlen = prefix_length(mask, length)
+        else:
+            intf.description = desc.strip()
+
+    return intf
+
+
+def _fortinet_interface(stanza: Stanza) -> Interface:
+    m = FGT_EDIT_IF_RE.match(stanza.text)
+    intf = Interface(name=m.group(1) if m else stanza.args.strip('"'))
+
+    for child in stanza.iter_children("set"):
+        if not intf.ip:
+            m = FGT_SET_IP_RE.match(child.text)
+            if m:
+                intf.ip = m.group(1)
+                intf.prefixlen = prefix_length(m.group(2) or "", m.group(3) or "")
+                continue
+
+        m = FGT_SET_DESC_RE.match(child.text)
+        if m:
+            intf.description = m.group(1).strip()
 
-def _parse_cisco_device(lines: List[str]) -> Device:
-    hostname = "DEVICE"
-    interfaces: List[Interface] = []
-    current_int: Optional[Interface] = None
+    return intf
 
-    for raw in lines:
-        line = raw.rstrip()
 
-        m = HOSTNAME_RE.match(line.strip())
-        if m:
-            hostname = m.group(1)
-            continue
+# Top-level keywords the device parsers act on; every other top-level
+# stanza can be skipped before it is even decoded (see utils.spool).
+STREAM_KEYWORDS = frozenset({"hostname", "interface", "config", "end"})
 
-        m = INT_RE.match(line.strip())
-        if m:
-            # start new interface
-            current_int = Interface(name=m.group(1))
-            interfaces.append(current_int)
-            continue
 
-        if current_int:
-            m = DESC_RE.search(line)
-            if m:
-                current_int.description = m.group(1).strip()
-                continue
+class _DeviceState:
+    """
+    Accumulates one device while its stanzas stream past. Only the
+    extracted fields are kept, never the stanzas themselves.
+    """
 
-            m = IP_RE.search(line)
-            if m and not current_int.ip:
-                current_int.ip = m.group(1).strip()
-                continue
+    __slots__ = ("hostname", "interfaces", "fortinet")
+
+    def __init__(self) -> None:
+        self.hostname: Optional[str] = None
+        self.interfaces: List[Interface] = []
+        self.fortinet = False
+
+    def feed_cisco(self, stanza: Stanza) -> None:
+        kw = stanza.keyword
+        if kw == "interface":
+            self.interfaces.append(_cisco_interface(stanza))
+        elif kw == "hostname":
+            args = stanza.args.split()
+            if args:
+                self.hostname = args[0]
+
+    def feed_fortinet(self, stanza: Stanza) -> None:
+        if stanza.keyword != "config":
+            return
+
+        self.fortinet = True
+        section = stanza.args.lower()
+        if section == "system global":
+            for child in stanza.iter_children("set"):
+                parts = child.text.split()
+                if len(parts) >= 3 and parts[1].lower() == "hostname":
+                    self.hostname = parts[2].strip('"')
+        elif section == "system interface":
+            for edit in stanza.iter_children("edit"):
+                self.interfaces.append(_fortinet_interface(edit))
+
+    def build(self, vendor: str) -> Device:
+        if vendor == "fortinet":
+            return Device(hostname=self.hostname or "FGT", vendor=vendor, interfaces=self.interfaces)
+
+        device = Device(hostname=self.hostname or "DEVICE", vendor=vendor, interfaces=self.interfaces)
+        # neighbor hints need the final hostname, so they run as a post-pass
+        infer_neighbors([device])
+        return device
+
+
+def _parse_cisco_device(lines: Union[str, Iterable[str]]) -> Device:
+    state = _DeviceState()
+    for stanza in iter_stanzas(lines):
+        state.feed_cisco(stanza)
+    return state.build("cisco")
+
+
+def _parse_fortinet_device(lines: Union[str, Iterable[str]]) -> Device:
+    state = _DeviceState()
+    for stanza in iter_stanzas(lines):
+        state.feed_fortinet(stanza)
+    return state.build("fortinet")
+
+
+def _vendor_scores(text: str, start: int = 0, end: Optional[int] = None) -> Dict[str, float]:
+    end = len(text) if end is None else end
+    scores = {"fortinet": 0.0, "cisco": 0.0}
+    for vendor, marker, weight in VENDOR_MARKERS:
+        if isinstance(marker, tuple):
+            found = any(text.find(needle, start, end) >= 0 for needle in marker)
+        else:
+            found = marker.search(text, start, end) is not None
+        if found:
+            scores[vendor] += weight
+    return scores
+
+
+def sniff_vendor(config_text: str, prefix: int = SNIFF_PREFIX_CHARS) -> Tuple[str, float]:
+    """
+    Guess the vendor from structural markers (FortiOS `config system`
+    blocks and `#config-version` headers, Cisco `version` banners,
+    `!` comments, indented `ip address` lines, ...) in the first
+    `prefix` characters. Returns (vendor, confidence 0..1).
+
+    The whole text is only scanned when the prefix is ambiguous, and it
+    is never lower-cased or copied.
+    """
+    end = min(len(config_text), prefix)
+    scores = _vendor_scores(config_text, 0, end)
+
+    best = max(scores, key=scores.get)
+    other = sum(scores.values()) - scores[best]
+    confidence = _confidence(scores[best], other)
 
-            # crude CDP/LLDP neighbor extraction if present in description
-            # e.g. "to SW1 Gi1/0/1"
-            if current_int.description:
-                words = current_int.description.split()
-                for w in words:
-                    if w.isupper() and len(w) <= 10 and w != hostname:
-                        if w not in current_int.neighbors:
-                            current_int.neighbors.append(w)
+    if confidence < SNIFF_MIN_CONFIDENCE and end < len(config_text):
+        scores = _vendor_scores(config_text)
+        best = max(scores, key=scores.get)
+        other = sum(scores.values()) - scores[best]
+        confidence = _confidence(scores[best], other)
 
-    return Device(hostname=hostname, vendor="cisco", interfaces=interfaces)
+    if scores[best] == 0:
+        return "generic", 0.0
+    return best, confidence
+
+
+def _confidence(best: float, other: float) -> float:
+    if best <= 0:
+        return 0.0
+    return round(min(1.0, best) * best / (best + other), 2)
+
+
+def detect_vendor(config_text: str) -> str:
+    vendor, confidence = sniff_vendor(config_text)
+    if confidence < SNIFF_GENERIC_BELOW:
+        return "generic"
+    return vendor
 
 
-def _parse_fortinet_device(lines: List[str]) -> Device:
-    hostname = "FGT"
-    interfaces: List[Interface] = []
-    current_int: Optional[Interface] = None
-    in_sys_global = False
+# Anything parse_config_stream can read lines from.
+ConfigSource = Union[str, bytes, IO, Iterable[str], Iterable[bytes]]
 
-    for raw in lines:
-        line = raw.strip()
 
-        if line.lower().startswith("config system global"):
-            in_sys_global = True
+def iter_config_lines(source: ConfigSource, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Yield config lines one at a time from text, bytes, a text or binary
+    file object (open(), Streamlit UploadedFile, FastAPI UploadFile) or
+    any iterable of lines. Binary lines are decoded as they are read.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    elif isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    else:
+        # FastAPI / Starlette UploadFile wraps the real file object
+        source = getattr(source, "file", source)
+
+    for line in source:
+        if isinstance(line, (bytes, bytearray)):
+            line = line.decode(encoding, errors="ignore")
+        yield line
+
+
+def banner_delimiter(line: str) -> Optional[str]:
+    """
+    Closing delimiter of a `banner <type> <delim>` line whose text goes
+    on below it; None for other lines and one-line banners.
+    """
+    m = BANNER_START_RE.match(line)
+    if m is None or m.group(1) in line[m.end():]:
+        return None
+    return m.group(1)
+
+
+def _without_banner_text(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Drop the text of multi-line `banner <type> <delim>` blocks (the
+    `banner` line itself is kept), so "*****" lines in a MOTD never
+    look like device separators.
+    """
+    close: Optional[str] = None
+    for line in lines:
+        if close is not None:
+            if close in line:
+                close = None
             continue
+        if line[:1] in ("b", "B"):
+            close = banner_delimiter(line)
+        yield line
+
 
-        if in_sys_global and line.lower().startswith("set hostname"):
-            parts = line.split()
-            if len(parts) >= 3:
-                hostname = parts[2].strip('"')
+def parse_config_stream(source: ConfigSource, encoding: str = "utf-8") -> Iterator[Device]:
+    """
+    Streaming version of parse_config for large uploads.
+
+    Lines are pulled from `source` lazily and only the stanza currently
+    being read is held in memory. A Device is yielded as soon as its
+    config ends (Cisco `end`, a second `hostname` or
+    `config system global`, or a banner line) or the input runs out.
+    """
+    state = _DeviceState()
+    pending = False
+
+    lines = _without_banner_text(iter_config_lines(source, encoding))
+    for stanza in iter_stanzas(lines):
+        kw = stanza.keyword
+        if kw == "end":
+            if pending:
+                yield state.build("fortinet" if state.fortinet else "cisco")
+            state = _DeviceState()
+            pending = False
             continue
 
-        if line.lower().startswith("config system interface"):
-            # interface section coming up
+        starts_device = BANNER_RE.match(stanza.text) is not None or (
+            state.hostname is not None
+            and (kw == "hostname" or (kw == "config" and stanza.args.lower() == "system global"))
+        )
+        if starts_device and pending:
+            yield state.build("fortinet" if state.fortinet else "cisco")
+            state = _DeviceState()
+
+        if kw == "config":
+            state.feed_fortinet(stanza)
+        else:
+            state.feed_cisco(stanza)
+        pending = True
+
+    if pending:
+        yield state.build("fortinet" if state.fortinet else "cisco")
+
+
+def split_device_chunks(config_text: str) -> List[str]:
+    """
+    Split a concatenated multi-device export into one text chunk per
+    device. Boundaries are banner lines, a second `hostname` or
+    `config system global`, and Cisco `end` (FortiOS `config ... end`
+    blocks are tracked so their `end` never splits a device, and the
+    text of `banner motd ^C ... ^C` blocks is never a boundary).
+    Chunks without any configuration are dropped.
+    """
+    chunks: List[str] = []
+    start = 0
+    depth = 0
+    seen_hostname = False
+    seen_global = False
+
+    def cut(pos: int) -> None:
+        nonlocal start, seen_hostname, seen_global
+        chunk = config_text[start:pos]
+        if DEVICE_CONTENT_RE.search(chunk):
+            chunks.append(chunk)
+        start = pos
+        seen_hostname = seen_global = False
+
+    # the pattern anchors on the preceding newline, so prepend one for line 1
+    first = DEVICE_BOUNDARY_RE.match("\n" + config_text[:64])
+    matches = DEVICE_BOUNDARY_RE.finditer(config_text)
+    if first is not None:
+        matches = itertools.chain([None], matches)
+
+    banner_end = 0  # end of the last banner block's text
+
+    for m in matches:
+        if m is None:
+            m, line_start = first, 0
+            offset = -1
+        else:
+            line_start = m.start() + 1
+            offset = 0
+        if line_start < banner_end:
+            continue
+        kind = m.lastgroup
+        if kind == "glob":
+            kind = "config"
+        elif kind == "delim":
+            if not depth:
+                delim = m.group("delim")
+                close = config_text.find(delim, m.end() + offset)
+                if close >= 0:
+                    banner_end = close + len(delim)
             continue
 
-        m = FGT_EDIT_IF_RE.match(line)
-        if m:
-            current_int = Interface(name=m.group(1))
-            interfaces.append(current_int)
+        if kind == "config":
+            if m.group("glob") and not depth:
+                if seen_global:
+                    cut(line_start)
+                seen_global = True
+            depth += 1
+        elif kind == "end":
+            if depth:
+                depth -= 1
+            else:
+                eol = config_text.find("\n", m.end() + offset)
+                cut(len(config_text) if eol < 0 else eol + 1)
+        elif depth:
             continue
+        elif kind == "hostname":
+            if seen_hostname:
+                cut(line_start)
+            seen_hostname = True
+        else:  # banner
+            cut(line_start)
 
-        if current_int:
-            m = FGT_SET_IP_RE.search(line)
-            if m and not current_int.ip:
-                current_int.ip = m.group(1)
-                continue
+    cut(len(config_text))
+    return chunks
 
-            m = FGT_SET_DESC_RE.search(line)
-            if m:
-                current_int.description = m.group(1).strip()
-                continue
 
-    return Device(hostname=hostname, vendor="fortinet", interfaces=interfaces)
+def _parse_device_text(config_text: str) -> Device:
+    if detect_vendor(config_text) == "fortinet":
+        return _parse_fortinet_device(config_text)
+    return _parse_cisco_device(config_text)
 
 
-def detect_vendor(config_text: str) -> str:
-    text = config_text.lower()
-    if "config system interface" in text or "fortigate" in text:
-        return "fortinet"
-    if "version" in text and "cisco ios" in text:
-        return "cisco"
-    if "hostname" in text and "interface" in text:
-        return "cisco"
-    return "generic"
+def parse_config_parallel(chunks: List[str], workers: Optional[int] = None) -> List[Device]:
+    """
+    Parse device chunks on a process pool (all cores by default),
+    returning the devices in input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(chunks) <= 1:
+        return [_parse_device_text(c) for c in chunks]
 
+    chunksize = max(1, len(chunks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_parse_device_text, chunks, chunksize=chunksize))
 
-def parse_config(config_text: str) -> List[Device]:
+
+def parse_config(config_text: ConfigSource, workers: Optional[int] = None) -> List[Device]:
     """
-    Parse raw configuration text into a list of Device objects.
-    For now we treat the whole file as a single device, but we
-    keep the list type to support multi-device files later.
+    Parse raw configuration text into a list of Device objects,
+    one per device found in the file.
+
+    File objects and line iterators are read through
+    parse_config_stream instead of being loaded into one string.
+
+    Multi-device bundles are split with split_device_chunks; large
+    bundles are parsed across all cores (`workers=1` forces serial).
     """
-    lines = config_text.splitlines()
-    vendor = detect_vendor(config_text)
+    if not isinstance(config_text, str):
+        return list(parse_config_stream(config_text))
 
-    if vendor == "fortinet":
-        dev = _parse_fortinet_device(lines)
-    else:
-        dev = _parse_cisco_device(lines)
+    chunks = split_device_chunks(config_text)
+    if len(chunks) <= 1:
+        return [_parse_device_text(config_text)]
 
-    return [dev]
+    if workers is None and (
+        len(chunks) < PARALLEL_MIN_DEVICES or len(config_text) < PARALLEL_MIN_BYTES
+    ):
+        workers = 1
+    return parse_config_parallel(chunks, workers)
 
 
 def summarize_devices(devices: List[Device]) -> List[Dict[str, object]]:
@@ -163,3 +572,40 @@ def summarize_devices(devices: List[Device]) -> List[Dict[str, object]]:
             }
         )
     return out
+
+
+def device_to_dict(device: Device) -> Dict[str, object]:
+    """
+    JSON-safe form of a Device (inverse of device_from_dict).
+    """
+    return {
+        "hostname": device.hostname,
+        "vendor": device.vendor,
+        "interfaces": [
+            {
+                "name": i.name,
+                "ip": i.ip,
+                "prefixlen": i.prefixlen,
+                "description": i.description,
+                "neighbors": list(i.neighbors),
+            }
+            for i in device.interfaces
+        ],
+    }
+
+
+def device_from_dict(data: Dict[str, object]) -> Device:
+    return Device(
+        hostname=data["hostname"],
+        vendor=data.get("vendor", "generic"),
+        interfaces=[
+            Interface(
+                name=i["name"],
+                ip=i.get("ip"),
+                description=i.get("description"),
+                neighbors=i.get("neighbors"),
+                prefixlen=i.get("prefixlen"),
+            )
+            for i in data.get("interfaces", [])
+        ],
+    )
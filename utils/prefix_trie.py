@@ -0,0 +1,168 @@
+# ============================================================
+#  NetDoc AI — Prefix Trie (path-compressed radix trie for IPs)
+# ============================================================
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import ipaddress
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+PrefixLike = Union[str, Network, ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+_WIDTH = {4: 32, 6: 128}
+
+
+class _Node:
+    __slots__ = ("bits", "length", "value", "has_value", "children")
+
+    def __init__(self, bits: int, length: int) -> None:
+        self.bits = bits            # prefix bits, left-aligned in the address width
+        self.length = length        # prefix length
+        self.value: Any = None
+        self.has_value = False
+        self.children: List[Optional[_Node]] = [None, None]
+
+
+def _key(prefix: PrefixLike) -> Tuple[int, int, int]:
+    """(version, network bits, prefix length); addresses are full-length prefixes."""
+    if isinstance(prefix, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+        return prefix.version, int(prefix), prefix.max_prefixlen
+    net = prefix if isinstance(prefix, (ipaddress.IPv4Network, ipaddress.IPv6Network)) \
+        else ipaddress.ip_network(prefix, strict=False)
+    return net.version, int(net.network_address), net.prefixlen
+
+
+def _network(version: int, bits: int, length: int) -> Network:
+    if version == 4:
+        return ipaddress.IPv4Network((bits, length))
+    return ipaddress.IPv6Network((bits, length))
+
+
+class PrefixTrie:
+    """
+    Map from IPv4/IPv6 networks to values with longest-prefix match.
+    A node only exists where prefixes branch, so insert and lookup cost
+    O(address width), independent of how many prefixes are stored.
+    Addresses (or "10.0.0.1") are looked up as full-length prefixes.
+    """
+
+    def __init__(self) -> None:
+        self._roots: Dict[int, _Node] = {4: _Node(0, 0), 6: _Node(0, 0)}
+        self._len = 0
+
+    # -----------------------------------------------------------
+    # internals
+    # -----------------------------------------------------------
+    def _find(self, version: int, bits: int, length: int, create: bool) -> Optional[_Node]:
+        width = _WIDTH[version]
+        node = self._roots[version]
+        while True:
+            if node.length == length:
+                return node
+            b = (bits >> (width - 1 - node.length)) & 1
+            child = node.children[b]
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[b] = _Node(bits, length)
+                return child
+
+            x = bits ^ child.bits
+            if child.length <= length and not x >> (width - child.length):
+                node = child  # child's prefix covers ours: descend
+                continue
+            if not create:
+                return None
+
+            # split: new branching node at the common prefix
+            common = min(child.length, length, width - x.bit_length())
+            mask = ((1 << common) - 1) << (width - common)
+            mid = _Node(bits & mask, common)
+            mid.children[(child.bits >> (width - 1 - common)) & 1] = child
+            node.children[b] = mid
+            if common == length:
+                return mid
+            leaf = mid.children[(bits >> (width - 1 - common)) & 1] = _Node(bits, length)
+            return leaf
+
+    def _walk(self, node: _Node, version: int) -> Iterator[Tuple[Network, Any]]:
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if n.has_value:
+                yield _network(version, n.bits, n.length), n.value
+            for child in reversed(n.children):
+                if child is not None:
+                    stack.append(child)
+
+    # -----------------------------------------------------------
+    # mapping
+    # -----------------------------------------------------------
+    def insert(self, prefix: PrefixLike, value: Any) -> None:
+        node = self._find(*_key(prefix), create=True)
+        if not node.has_value:
+            self._len += 1
+        node.value, node.has_value = value, True
+
+    def setdefault(self, prefix: PrefixLike, default: Any) -> Any:
+        node = self._find(*_key(prefix), create=True)
+        if not node.has_value:
+            self._len += 1
+            node.value, node.has_value = default, True
+        return node.value
+
+    def get(self, prefix: PrefixLike, default: Any = None) -> Any:
+        node = self._find(*_key(prefix), create=False)
+        return node.value if node is not None and node.has_value else default
+
+    def remove(self, prefix: PrefixLike) -> bool:
+        """Drop a prefix's value (branching nodes stay; they are cheap)."""
+        node = self._find(*_key(prefix), create=False)
+        if node is None or not node.has_value:
+            return False
+        node.value, node.has_value = None, False
+        self._len -= 1
+        return True
+
+    # -----------------------------------------------------------
+    # lookups
+    # -----------------------------------------------------------
+    def covering(self, prefix: PrefixLike) -> List[Tuple[Network, Any]]:
+        """Every stored prefix containing `prefix`, least specific first."""
+        version, bits, length = _key(prefix)
+        width = _WIDTH[version]
+        found: List[Tuple[Network, Any]] = []
+        node: Optional[_Node] = self._roots[version]
+        while node is not None and node.length <= length:
+            if node.length and (bits ^ node.bits) >> (width - node.length):
+                break
+            if node.has_value:
+                found.append((_network(version, node.bits, node.length), node.value))
+            if node.length == width:
+                break
+            node = node.children[(bits >> (width - 1 - node.length)) & 1]
+        return found
+
+    def longest_match(self, prefix: PrefixLike) -> Optional[Tuple[Network, Any]]:
+        """The most specific stored prefix containing `prefix`, or None."""
+        found = self.covering(prefix)
+        return found[-1] if found else None
+
+    def __iter__(self) -> Iterator[Tuple[Network, Any]]:
+        """(network, value) pairs in address order, IPv4 first."""
+        for version in (4, 6):
+            yield from self._walk(self._roots[version], version)
+
+    def __contains__(self, prefix: object) -> bool:
+        try:
+            node = self._find(*_key(prefix), create=False)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return False
+        return node is not None and node.has_value
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"PrefixTrie({self._len} prefixes)"
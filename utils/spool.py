@@ -0,0 +1,233 @@
+# ============================================================
+#  NetDoc AI — Spooled, memory-mapped configs (large uploads)
+# ============================================================
+
+from __future__ import annotations
+
+from typing import IO, Iterator, List, Optional
+import mmap
+import os
+import shutil
+import tempfile
+
+from utils.config_tree import Stanza, iter_stanzas
+from utils.parser import BANNER_RE, STREAM_KEYWORDS, Device, banner_delimiter, parse_config
+
+# Uploads larger than this are spooled to disk and mapped instead of
+# being decoded into one string.
+SPOOL_THRESHOLD = int(os.getenv("NETDOC_SPOOL_THRESHOLD", str(32 * 1024 * 1024)))
+SPOOL_DIR = os.getenv("NETDOC_SPOOL_DIR") or None
+
+# audits scan the file in decoded blocks of about this many bytes
+BLOCK_BYTES = 4 * 1024 * 1024
+
+_COMMENT_START = (ord("!"), ord("#"))
+_BANNER_START = (ord("="), ord("*"), ord("-"))
+_INDENT = (ord(" "), ord("\t"))
+
+
+def spool_upload(fileobj: IO[bytes], spool_dir: Optional[str] = SPOOL_DIR) -> str:
+    """
+    Copy an upload to a temporary file in fixed-size chunks and return
+    its path. The caller owns the file (MappedConfig(delete=True) removes it).
+    """
+    fileobj = getattr(fileobj, "file", fileobj)  # FastAPI UploadFile
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+    fd, path = tempfile.mkstemp(prefix="netdoc-", suffix=".cfg", dir=spool_dir)
+    with os.fdopen(fd, "wb") as out:
+        shutil.copyfileobj(fileobj, out, 1024 * 1024)
+    return path
+
+
+def _keyword(head: bytes) -> str:
+    parts = head.split(None, 1)
+    return parts[0].lower().decode("ascii", errors="ignore") if parts else ""
+
+
+class MappedConfig:
+    """
+    A config file read through mmap instead of into memory.
+
+    Line boundaries are found with mmap.find on the mapped bytes, and
+    only the lines the parser acts on are decoded (see iter_lines), so
+    parsing a multi-GB show-tech keeps resident memory roughly flat:
+    mapped pages are backed by the file and can be dropped by the OS.
+
+    Offers the same streaming views as ParsedConfig (devices, line_count,
+    text_blocks, lower_blocks, contains, iter_lines, iter_stanzas), so the audit and
+    topology engines accept either. Use as a context manager.
+    """
+
+    def __init__(self, path: str, encoding: str = "utf-8", delete: bool = False) -> None:
+        self.path = path
+        self.filename: Optional[str] = None
+        self.encoding = encoding
+        self.delete = delete
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._mm: Optional[mmap.mmap] = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        )
+        self._devices: Optional[List[Device]] = None
+        self._line_count: Optional[int] = None
+
+    @classmethod
+    def from_upload(
+        cls, fileobj: IO[bytes], filename: Optional[str] = None, spool_dir: Optional[str] = SPOOL_DIR
+    ) -> "MappedConfig":
+        mapped = cls(spool_upload(fileobj, spool_dir), delete=True)
+        mapped.filename = filename
+        return mapped
+
+    # ----------------------------------------------------------
+    # raw line scanning
+    # ----------------------------------------------------------
+    def _iter_spans(self) -> Iterator[tuple]:
+        mm = self._mm
+        if mm is None:
+            return
+        pos, size = 0, self.size
+        find = mm.find
+        while pos < size:
+            nl = find(b"\n", pos)
+            end = size if nl == -1 else nl
+            yield pos, end
+            pos = end + 1
+
+    def iter_lines(self, relevant_only: bool = False) -> Iterator[str]:
+        """
+        Decoded lines. With `relevant_only` (what iterating the object
+        feeds the parser), blank lines, column-0
+        comments and top-level stanzas the parser ignores (show output,
+        `ip route`, `logging`, banner text, ...) are skipped without being
+        decoded; FortiOS `config ... end` blocks are always kept whole.
+        """
+        mm = self._mm
+        encoding = self.encoding
+        keep = True   # whether the current top-level stanza is kept
+        depth = 0     # open FortiOS "config" blocks at column 0
+        banner = None  # closing delimiter of an open banner block
+
+        for start, end in self._iter_spans():
+            if start == end or (end - start == 1 and mm[start] == 13):
+                continue
+            first = mm[start]
+
+            if relevant_only:
+                if banner is not None:
+                    if mm.find(banner, start, end) != -1:
+                        banner = None
+                    continue
+                if first in _INDENT:
+                    if not keep:
+                        continue
+                elif depth:
+                    kw = _keyword(mm[start:min(end, start + 32)])
+                    if kw == "end":
+                        depth -= 1
+                    elif kw == "config":
+                        depth += 1
+                elif first in _COMMENT_START:
+                    continue
+                else:
+                    kw = _keyword(mm[start:min(end, start + 32)])
+                    keep = kw in STREAM_KEYWORDS
+                    if kw == "config":
+                        depth = 1
+                    elif kw == "banner":
+                        delim = banner_delimiter(mm[start:end].decode(encoding, errors="ignore"))
+                        if delim is not None:
+                            banner = delim.encode(encoding)
+                    elif not keep and first in _BANNER_START:
+                        keep = BANNER_RE.match(mm[start:end].decode(encoding, errors="ignore")) is not None
+                    if not keep:
+                        continue
+
+            yield mm[start:end].decode(encoding, errors="ignore")
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_lines(relevant_only=True)
+
+    def text_blocks(self, block_bytes: int = BLOCK_BYTES) -> Iterator[str]:
+        """
+        The whole file as decoded text blocks of roughly `block_bytes`,
+        always cut after a newline so no line spans two blocks.
+        """
+        mm = self._mm
+        if mm is None:
+            return
+        pos, size = 0, self.size
+        while pos < size:
+            end = min(pos + block_bytes, size)
+            if end < size:
+                nl = mm.find(b"\n", end)
+                end = size if nl == -1 else nl + 1
+            yield mm[pos:end].decode(self.encoding, errors="ignore")
+            pos = end
+
+    # ----------------------------------------------------------
+    # views shared with ParsedConfig
+    # ----------------------------------------------------------
+    def lower_blocks(self) -> Iterator[str]:
+        for block in self.text_blocks():
+            yield block.lower()
+
+    @property
+    def line_count(self) -> int:
+        if self._line_count is None:
+            mm, n = self._mm, 0
+            if mm is not None:
+                for pos in range(0, self.size, BLOCK_BYTES):
+                    n += mm[pos:pos + BLOCK_BYTES].count(b"\n")
+                if mm[self.size - 1] != 10:
+                    n += 1  # last line has no newline
+            self._line_count = n
+        return self._line_count
+
+    def iter_stanzas(self) -> Iterator[Stanza]:
+        """Top-level stanzas, streamed from the mapped lines (file line numbers)."""
+        mm, encoding = self._mm, self.encoding
+        return iter_stanzas(mm[s:e].decode(encoding, errors="ignore") for s, e in self._iter_spans())
+
+    def contains(self, needle: str) -> bool:
+        return self._mm is not None and self._mm.find(needle.encode(self.encoding)) != -1
+
+    @property
+    def devices(self) -> List[Device]:
+        """Streaming parse over the mapped lines (not cached)."""
+        if self._devices is None:
+            self._devices = parse_config(self)
+        return self._devices
+
+    # ----------------------------------------------------------
+    # lifetime
+    # ----------------------------------------------------------
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if not self._file.closed:
+            self._file.close()
+        if self.delete:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self.delete = False
+
+    def __enter__(self) -> "MappedConfig":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __repr__(self) -> str:
+        return f"MappedConfig(path={self.path!r}, bytes={self.size})"
@@ -0,0 +1,193 @@
+# ============================================================
+#  NetDoc AI — Topology Aggregation (summary graphs for big fleets)
+# ============================================================
+#
+#  A 10k-device graph is unreadable (and unrenderable) as flat
+#  Mermaid. These views collapse it into one summary node per site,
+#  subnet block, vendor or connected component, with the number of
+#  links between groups on the edges. TopologyGraph.neighborhood /
+#  subgraph then drill down into the part that matters.
+# ============================================================
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Callable, Dict, List, Mapping, Optional
+import ipaddress
+import json
+import re
+
+from utils.topology_graph import MEDIA_TYPES, Rendered, TopologyGraph, etag_of, to_mermaid
+from utils.topology_query import connected_components
+
+GROUP_BY = ("component", "site", "vendor", "subnet")
+
+# flat graphs above this many nodes are shown aggregated by default
+FLAT_RENDER_LIMIT = 300
+
+# "nyc-core-01" / "nyc_sw3" / "nyc.edge1" -> "nyc"
+_SITE_RE = re.compile(r"^([^-_.]+)[-_.]")
+
+NO_GROUP = "(none)"
+
+
+def site_of(hostname: str) -> str:
+    """Site from the hostname's first token ("nyc-core-01" -> "nyc")."""
+    m = _SITE_RE.match(hostname)
+    return m.group(1).lower() if m else NO_GROUP
+
+
+class AggregateGraph:
+    """
+    One node per group: its device / node count and the links inside
+    it; one edge per pair of groups with the number of links between
+    them. `members` lists every node of a group, for drill-down.
+    """
+
+    def __init__(self, by: str, group_of: Dict[str, str], graph: TopologyGraph) -> None:
+        self.by = by
+        self.group_of = group_of
+        self.members: Dict[str, List[str]] = {}
+        self.groups: Dict[str, Dict[str, int]] = {}
+        self.edges: Counter = Counter()
+
+        for name, group in group_of.items():
+            self.members.setdefault(group, []).append(name)
+            info = self.groups.setdefault(group, {"devices": 0, "nodes": 0, "internal_links": 0})
+            info["nodes"] += 1
+            if name in graph.devices:
+                info["devices"] += 1
+
+        for a, b in graph.edges():
+            ga, gb = group_of[a], group_of[b]
+            if ga == gb:
+                self.groups[ga]["internal_links"] += 1
+            else:
+                self.edges[(ga, gb) if ga < gb else (gb, ga)] += 1
+
+    def subgraph(self, graph: TopologyGraph, group: str) -> TopologyGraph:
+        """Drill-down: the full graph of one group."""
+        return graph.subgraph(self.members.get(group, ()))
+
+    def to_mermaid(self) -> str:
+        ids = {group: f"G{n}" for n, group in enumerate(self.groups)}
+        labels = {
+            ids[g]: f"{g}<br/>{info['devices']} devices, {info['nodes']} nodes"
+            for g, info in self.groups.items()
+        }
+        lines = to_mermaid(labels, ()).split("\n")
+        for (a, b), count in self.edges.items():
+            lines.append(f"    {ids[a]} ---|{count}| {ids[b]};")
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "by": self.by,
+            "groups": [{"id": g, **info} for g, info in self.groups.items()],
+            "edges": [[a, b, count] for (a, b), count in self.edges.items()],
+        })
+
+    def __repr__(self) -> str:
+        return f"AggregateGraph(by={self.by!r}, groups={len(self.groups)}, edges={len(self.edges)})"
+
+
+# ------------------------------------------------------------
+# GROUPING
+# ------------------------------------------------------------
+def _supernet(name: str, prefixlen: int) -> Optional[str]:
+    try:
+        net = ipaddress.ip_network(name, strict=False)
+    except ValueError:
+        return None
+    if net.prefixlen <= prefixlen:
+        return str(net)
+    return str(net.supernet(new_prefix=prefixlen))
+
+
+def _majority(graph: TopologyGraph, name: str, group_of: Mapping[str, str]) -> str:
+    votes = Counter(group_of[d] for d in graph.neighbors(name) if d in group_of)
+    if not votes:
+        return NO_GROUP
+    best = max(votes.values())
+    return min(g for g, n in votes.items() if n == best)
+
+
+def group_nodes(
+    graph: TopologyGraph,
+    by: str = "component",
+    sites: Optional[Mapping[str, str]] = None,
+    prefixlen: int = 16,
+) -> Dict[str, str]:
+    """
+    {node: group}. Devices are grouped by `by`; subnets and neighbors
+    that were never uploaded join the group most of their devices are
+    in. "site" uses `sites` ({hostname: site}) where given, else the
+    hostname's first token; "subnet" puts subnets in their /`prefixlen`
+    block and each device in the block most of its subnets are in.
+    """
+    with graph.lock:
+        if by == "component":
+            group_of: Dict[str, str] = {}
+            for n, comp in enumerate(connected_components(graph), 1):
+                label = f"component {n}"
+                for name in comp:
+                    group_of[name] = label
+            return group_of
+
+        key: Callable[[str], str]
+        if by == "site":
+            sites = sites or {}
+            key = lambda h: sites.get(h) or site_of(h)
+        elif by == "vendor":
+            key = lambda h: str(graph.devices[h].get("vendor") or NO_GROUP)
+        elif by == "subnet":
+            blocks = {
+                name: _supernet(name, prefixlen) or NO_GROUP
+                for name, kind in graph.targets.items() if kind == "network"
+            }
+
+            def key(h: str) -> str:
+                votes = Counter(blocks[t] for t in graph.out.get(h, ()) if t in blocks)
+                return min(votes, key=lambda b: (-votes[b], b)) if votes else NO_GROUP
+        else:
+            raise ValueError(f"unknown grouping {by!r} (expected one of {GROUP_BY})")
+
+        group_of = {h: key(h) for h in graph.devices}
+        if by == "subnet":
+            group_of.update(blocks)
+        for name in graph.targets:
+            if name not in group_of:
+                group_of[name] = _majority(graph, name, group_of)
+        return group_of
+
+
+def aggregate(
+    graph: TopologyGraph,
+    by: str = "component",
+    sites: Optional[Mapping[str, str]] = None,
+    prefixlen: int = 16,
+) -> AggregateGraph:
+    """
+    Summary graph of `graph` grouped `by` (see group_nodes). Without
+    explicit `sites`, it is computed once per graph version.
+    """
+    def build() -> AggregateGraph:
+        with graph.lock:
+            return AggregateGraph(by, group_nodes(graph, by, sites, prefixlen), graph)
+
+    if sites:
+        return build()
+    return graph.cached(f"aggregate:{by}:{prefixlen}", build)
+
+
+
+def render_aggregate(graph: TopologyGraph, by: str = "component", fmt: str = "mermaid", prefixlen: int = 16) -> Rendered:
+    """The summary graph as "mermaid" or "json", once per graph version."""
+    def build() -> Rendered:
+        agg = aggregate(graph, by, prefixlen=prefixlen)
+        body = agg.to_mermaid() if fmt == "mermaid" else agg.to_json()
+        return Rendered(body, etag_of(body), MEDIA_TYPES[fmt])
+
+    if fmt not in ("mermaid", "json"):
+        raise ValueError(f"unknown aggregate format {fmt!r}")
+    return graph.cached(f"aggregate:{by}:{prefixlen}:{fmt}", build)
@@ -0,0 +1,447 @@
+# ============================================================
+#  NetDoc AI — Topology Graph (links + in-memory adjacency)
+# ============================================================
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+from xml.sax.saxutils import escape, quoteattr
+import hashlib
+import ipaddress
+import json
+import re
+import threading
+
+from utils.neighbors import NeighborSource, resolve_neighbors
+from utils.parser import Device, Interface
+from utils.prefix_trie import Network, PrefixTrie
+
+
+class Link(NamedTuple):
+    """One edge, owned by the device whose config produced it."""
+
+    source: str     # hostname of that device
+    target: str     # connected subnet ("10.0.0.0/30") or neighbor hostname
+    kind: str       # "network" | "neighbor"
+    interface: str  # local interface on `source`
+
+
+_NON_WORD_RE = re.compile(r"\W")
+
+
+def connected_network(intf: Interface) -> Optional[Network]:
+    """The interface's connected subnet (address + mask), if both are known."""
+    if not intf.ip or intf.prefixlen is None:
+        return None
+    try:
+        return ipaddress.ip_network(f"{intf.ip}/{intf.prefixlen}", strict=False)
+    except ValueError:
+        return None
+
+
+def subnet_node(intf: Interface, subnets: Optional[PrefixTrie] = None) -> Optional[str]:
+    """
+    Network node of an interface: its connected subnet ("10.0.0.0/30"),
+    so two ends of a point-to-point link meet on the same node and
+    unrelated links never do. An address without a mask joins the most
+    specific subnet in `subnets` that contains it. Host routes (/32
+    loopbacks) and unresolved addresses connect nothing: None.
+    """
+    net = connected_network(intf)
+    if net is None:
+        if not intf.ip or subnets is None:
+            return None
+        try:
+            match = subnets.longest_match(intf.ip)
+        except ValueError:
+            return None
+        return str(match[0]) if match is not None else None
+    if net.prefixlen == net.max_prefixlen:
+        return None
+    return str(net)
+
+
+def node_id(name: str) -> str:
+    """Mermaid-safe node id for a hostname or subnet node."""
+    if "/" in name:
+        return "NET_" + _NON_WORD_RE.sub("_", name)
+    return name.replace("-", "_")
+
+
+def device_links(
+    device: Device,
+    sources: Sequence[NeighborSource],
+    subnets: Optional[PrefixTrie] = None,
+) -> Iterator[Link]:
+    """
+    Links of one device, interface by interface: its connected subnet
+    first (see subnet_node), then every neighbor named by `sources`
+    (see utils.neighbors).
+    """
+    for intf in device.interfaces:
+        net = subnet_node(intf, subnets)
+        if net is not None:
+            yield Link(device.hostname, net, "network", intf.name)
+        for name in resolve_neighbors(device, intf, sources):
+            yield Link(device.hostname, name, "neighbor", intf.name)
+
+
+def subnet_index(devices: Iterable[Device]) -> PrefixTrie:
+    """
+    Connected subnet -> [(hostname, interface)] for every masked,
+    non-host interface address, built in one pass (O(n × address width),
+    no pairwise comparison of interfaces).
+    """
+    trie = PrefixTrie()
+    for device in devices:
+        for intf in device.interfaces:
+            net = connected_network(intf)
+            if net is not None and net.prefixlen < net.max_prefixlen:
+                trie.setdefault(net, []).append((device.hostname, intf.name))
+    return trie
+
+
+def subnet_peers(devices: Iterable[Device]) -> Iterator[Tuple[Network, List[Tuple[str, str]]]]:
+    """
+    (subnet, members) for every subnet shared by two or more devices,
+    in address order; a point-to-point /30 or /31 yields its two ends.
+    """
+    for net, members in subnet_index(devices):
+        if len({hostname for hostname, _ in members}) > 1:
+            yield net, members
+
+
+def to_mermaid(labels: Mapping[str, str], edges: Iterable[Tuple[str, str]]) -> str:
+    """Mermaid graph from {node id: label} and (id, id) edges."""
+    lines: List[str] = ["graph TD;"]
+    for nid, label in labels.items():
+        lines.append(f'    {nid}["{label}"];')
+    for a, b in edges:
+        lines.append(f"    {a} --> {b};")
+    return "\n".join(lines)
+
+
+# ------------------------------------------------------------
+# SERIALIZED RENDERS (cached per graph version)
+# ------------------------------------------------------------
+MEDIA_TYPES = {
+    "mermaid": "text/plain; charset=utf-8",
+    "json": "application/json",
+    "graphml": "application/graphml+xml",
+}
+
+
+class Rendered(NamedTuple):
+    body: str
+    etag: str        # quoted, for ETag / If-None-Match
+    media_type: str
+
+
+def etag_of(body: str) -> str:
+    return '"' + hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+class RenderCache:
+    """
+    Bounded LRU of Rendered topologies by key (e.g. parser version +
+    config digest), for per-config renders that have no graph version.
+    """
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Rendered]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: str, render: Callable[[], str], fmt: str = "mermaid") -> Rendered:
+        key = f"{fmt}:{key}"
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        body = render()
+        rendered = Rendered(body, etag_of(body), MEDIA_TYPES[fmt])
+        with self._lock:
+            self._entries[key] = rendered
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rendered
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class TopologyGraph:
+    """
+    Topology of a whole fleet. Links are grouped by the device that owns
+    them, so re-uploading one device replaces only its own links;
+    `out` (node -> targets) and `inn` (node -> sources) are kept in step
+    for neighbor lookups, and `subnets` maps every subnet node to the
+    devices attached to it. Nodes that are not devices (subnets,
+    neighbors never uploaded) exist only while some link points at them.
+
+    Mutations take `lock`; readers that walk the indexes while uploads
+    may be applied should hold it too. `version` grows on every change.
+    """
+
+    def __init__(self) -> None:
+        self.devices: Dict[str, Dict[str, object]] = {}  # hostname -> info
+        self.links: Dict[str, List[Link]] = {}
+        self.out: Dict[str, Set[str]] = {}
+        self.inn: Dict[str, Set[str]] = {}
+        self.targets: Dict[str, str] = {}  # non-device node -> link kind
+        self.subnets = PrefixTrie()        # subnet -> attached hostnames
+        self.version = 0
+        self.lock = threading.RLock()
+        self._derived: Dict[str, Tuple[int, object]] = {}  # key -> (version, value)
+
+    # -----------------------------------------------------------
+    # updates
+    # -----------------------------------------------------------
+    def replace_device(self, hostname: str, links: Iterable[Link], **info: object) -> None:
+        """Set a device's info and replace all of its links."""
+        with self.lock:
+            self._drop_links(hostname)
+            self.devices[hostname] = info
+            self.targets.pop(hostname, None)
+            self._add_links(hostname, links)
+            self.version += 1
+
+    def remove_device(self, hostname: str) -> None:
+        with self.lock:
+            if hostname not in self.devices:
+                return
+            self._drop_links(hostname)
+            del self.devices[hostname]
+            if self.inn.get(hostname):
+                # still named by other devices' links
+                self.targets[hostname] = "neighbor"
+            else:
+                self._forget(hostname)
+            self.version += 1
+
+    def _add_links(self, hostname: str, links: Iterable[Link]) -> None:
+        owned = self.links[hostname] = list(links)
+        out = self.out.setdefault(hostname, set())
+        for link in owned:
+            out.add(link.target)
+            self.inn.setdefault(link.target, set()).add(hostname)
+            if link.target not in self.devices:
+                self.targets.setdefault(link.target, link.kind)
+            if link.kind == "network":
+                self.subnets.setdefault(link.target, set()).add(hostname)
+
+    def _drop_links(self, hostname: str) -> None:
+        for link in self.links.get(hostname, ()):
+            if link.kind == "network":
+                attached = self.subnets.get(link.target)
+                if attached is not None:
+                    attached.discard(hostname)
+                    if not attached:
+                        self.subnets.remove(link.target)
+        for target in self.out.pop(hostname, ()):
+            sources = self.inn.get(target)
+            if sources is not None:
+                sources.discard(hostname)
+                if not sources and target not in self.devices:
+                    self._forget(target)
+        self.links.pop(hostname, None)
+
+    def _forget(self, name: str) -> None:
+        self.inn.pop(name, None)
+        if not self.out.get(name):
+            self.out.pop(name, None)
+        self.targets.pop(name, None)
+
+    # -----------------------------------------------------------
+    # reads
+    # -----------------------------------------------------------
+    def kind(self, name: str) -> Optional[str]:
+        """"device", "network", "neighbor", or None for unknown names."""
+        if name in self.devices:
+            return "device"
+        return self.targets.get(name)
+
+    def nodes(self) -> Dict[str, str]:
+        """Every node with its kind; devices first."""
+        out = dict.fromkeys(self.devices, "device")
+        out.update(self.targets)
+        return out
+
+    def neighbors(self, name: str) -> Set[str]:
+        """Nodes linked to `name` in either direction."""
+        return self.out.get(name, set()) | self.inn.get(name, set())
+
+    def subnet_of(self, address: str) -> Optional[Tuple[Network, Set[str]]]:
+        """The most specific subnet node containing `address`, with its devices."""
+        with self.lock:
+            match = self.subnets.longest_match(address)
+            return (match[0], set(match[1])) if match is not None else None
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        """(source, target) pairs, once each, in link order."""
+        for source, links in self.links.items():
+            seen: Set[str] = set()
+            for link in links:
+                if link.target not in seen:
+                    seen.add(link.target)
+                    yield source, link.target
+
+    def to_mermaid(self) -> str:
+        with self.lock:
+            labels = {node_id(n): n for n in self.nodes()}
+            edges = [(node_id(a), node_id(b)) for a, b in self.edges()]
+        if not labels:
+            return "graph TD;\n    A[\"No topology information detected\"];"
+        return to_mermaid(labels, edges)
+
+    def to_json(self) -> str:
+        """Nodes with their kind and the adjacency (owner -> [target, kind, interface])."""
+        with self.lock:
+            return json.dumps({
+                "nodes": [{"id": n, "kind": k} for n, k in self.nodes().items()],
+                "adjacency": {
+                    src: [[l.target, l.kind, l.interface] for l in links]
+                    for src, links in self.links.items()
+                },
+            })
+
+    def to_graphml(self) -> str:
+        with self.lock:
+            lines = [
+                '<?xml version="1.0" encoding="UTF-8"?>',
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">',
+                '  <key id="kind" for="node" attr.name="kind" attr.type="string"/>',
+                '  <key id="link" for="edge" attr.name="kind" attr.type="string"/>',
+                '  <key id="interface" for="edge" attr.name="interface" attr.type="string"/>',
+                '  <graph id="topology" edgedefault="directed">',
+            ]
+            for n, k in self.nodes().items():
+                lines.append(f'    <node id={quoteattr(n)}><data key="kind">{k}</data></node>')
+            for links in self.links.values():
+                for l in links:
+                    lines.append(
+                        f"    <edge source={quoteattr(l.source)} target={quoteattr(l.target)}>"
+                        f'<data key="link">{l.kind}</data>'
+                        f'<data key="interface">{escape(l.interface or "")}</data></edge>'
+                    )
+            lines += ["  </graph>", "</graphml>"]
+        return "\n".join(lines)
+
+    def render(self, fmt: str = "mermaid") -> Rendered:
+        """
+        The graph serialized as "mermaid", "json" or "graphml", built once
+        per graph version: polling an unchanged graph costs a dict lookup.
+        """
+        if fmt not in MEDIA_TYPES:
+            raise ValueError(f"unknown topology format {fmt!r}")
+
+        def build() -> Rendered:
+            body = getattr(self, f"to_{fmt}")()
+            return Rendered(body, etag_of(body), MEDIA_TYPES[fmt])
+
+        return self.cached(f"render:{fmt}", build)
+
+    def cached(self, key: str, build: Callable[[], object]):
+        """`build()`, computed once per graph version and key."""
+        with self.lock:
+            hit = self._derived.get(key)
+            if hit is not None and hit[0] == self.version:
+                return hit[1]
+            value = build()
+            self._derived[key] = (self.version, value)
+            return value
+
+    # -----------------------------------------------------------
+    # drill-down and paging
+    # -----------------------------------------------------------
+    def neighborhood(self, center: str, depth: int = 1, limit: Optional[int] = None) -> List[str]:
+        """
+        Nodes within `depth` hops of `center` (links in either direction),
+        nearest first; at most `limit` nodes.
+        """
+        with self.lock:
+            if center not in self:
+                return []
+            seen = {center}
+            order = [center]
+            frontier = [center]
+            for _ in range(depth):
+                nxt: List[str] = []
+                for name in frontier:
+                    for other in sorted(self.neighbors(name)):
+                        if other not in seen:
+                            seen.add(other)
+                            order.append(other)
+                            nxt.append(other)
+                            if limit is not None and len(order) >= limit:
+                                return order
+                frontier = nxt
+                if not frontier:
+                    break
+            return order
+
+    def subgraph(self, names: Iterable[str]) -> "TopologyGraph":
+        """
+        The graph restricted to `names`: their devices, and only the links
+        whose both ends are in `names`.
+        """
+        keep = set(names)
+        sub = TopologyGraph()
+        with self.lock:
+            for hostname in self.devices:
+                if hostname in keep:
+                    links = [l for l in self.links.get(hostname, ()) if l.target in keep]
+                    sub.replace_device(hostname, links, **self.devices[hostname])
+            for name in keep:
+                if name in self.targets and name not in sub:
+                    sub.targets[name] = self.targets[name]
+        return sub
+
+    def page(self, page: int, size: int = 500) -> "TopologyGraph":
+        """
+        Devices `page * size` .. `(page + 1) * size` (by hostname) with all
+        of their links, for exporting a large graph in parts. Devices of
+        other pages appear only as link targets.
+        """
+        def build() -> TopologyGraph:
+            sub = TopologyGraph()
+            with self.lock:
+                for hostname in sorted(self.devices)[page * size:(page + 1) * size]:
+                    sub.replace_device(hostname, self.links.get(hostname, ()), **self.devices[hostname])
+            return sub
+
+        return self.cached(f"page:{page}:{size}", build)
+
+    def page_count(self, size: int = 500) -> int:
+        return max(1, -(-len(self.devices) // size))
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "devices": len(self.devices),
+                "nodes": len(self.devices) + len(self.targets),
+                "edges": sum(len(t) for t in self.out.values()),
+                "version": self.version,
+            }
+
+    def __len__(self) -> int:
+        return len(self.devices) + len(self.targets)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.devices or name in self.targets
+
+    def __repr__(self) -> str:
+        return f"TopologyGraph(devices={len(self.devices)}, nodes={len(self)}, version={self.version})"